@@ -10,14 +10,15 @@ setup(
     version=VERSION,
     packages=[PACKAGE_NAME],
     description="Quick solar_angles angle calculation package",
-    package_data={},
+    package_data={PACKAGE_NAME: ['data/*.npz']},
     include_package_data=False,
     long_description=readme_contents,
     long_description_content_type='text/markdown',
     author='Edwin Lee',
     url='https://github.com/Myoldmopar/SolarCalculations',
     license='ModifiedBSD',
-    install_requires=['matplotlib'],
+    install_requires=['matplotlib', 'numpy'],
+    extras_require={'pandas': ['pandas'], 'numba': ['numba']},
     entry_points={
         'gui_scripts': [],
         'console_scripts': []},
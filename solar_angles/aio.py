@@ -0,0 +1,115 @@
+import asyncio
+from collections import deque
+from functools import partial
+
+import numpy as np
+
+from solar_angles import batch
+
+# Asyncio adapters for the batch calculations.
+# A large batch computed inline blocks the event loop for as long as it runs, so here the work is handed to an
+# executor and awaited.  By default that is the event loop's default thread pool; NumPy releases the GIL inside its
+# array loops, so the loop stays responsive.  A concurrent.futures.ProcessPoolExecutor can be passed instead to keep
+# the work off the interpreter entirely; the batch functions and their arguments can be pickled.
+# stream_position_series splits a long series into chunks and yields the result of each chunk, in order, as soon as
+# it is ready.  The chunks in flight are held in a bounded queue of at most max_pending futures: a new chunk is only
+# submitted (or pulled from an asynchronous source) once the consumer has taken an earlier result, so a slow consumer
+# holds back the producer rather than piling up results in memory.
+# Closing the stream, or cancelling the task consuming it, cancels the queued chunks which have not started yet;
+# a chunk already running in a worker finishes there, and its result is discarded.
+
+DEFAULT_CHUNK_SIZE = 8760
+DEFAULT_MAX_PENDING = 4
+
+
+async def run_batch(function, *args, executor=None, **kwargs):
+    """
+    Runs any of the batch calculations in an executor, and waits for its result without blocking the event loop.
+
+    >>> positions = await run_batch(batch.solar_position_series, stamps, False, 105.2, 105, 39.75)
+
+    :param function: The function to run, such as :func:`solar_angles.batch.solar_position_series` or
+                     :func:`solar_angles.exposure.exposure_matrix`
+    :param args: The positional arguments of the function
+    :param executor: A concurrent.futures executor, or None for the default executor of the event loop
+    :param kwargs: The keyword arguments of the function
+    :returns: The return value of the function
+    """
+    return await asyncio.get_running_loop().run_in_executor(executor, partial(function, *args, **kwargs))
+
+
+async def solar_position_series(time_stamps, daylight_savings_on, longitude, standard_meridian, latitude,
+                                dtype=np.float64, executor=None) -> batch.SolarPositionSeries:
+    """
+    Calculates the sun position for a series of time stamps in an executor.
+    This is the asynchronous counterpart of :func:`solar_angles.batch.solar_position_series`, which documents the
+    arguments.
+
+    :param executor: A concurrent.futures executor, or None for the default executor of the event loop
+    :returns: [SolarPositionSeries] The sun position arrays
+    """
+    return await run_batch(batch.solar_position_series, time_stamps, daylight_savings_on, longitude,
+                           standard_meridian, latitude, dtype, executor=executor)
+
+
+async def _chunks(time_stamps, daylight_savings_on, chunk_size: int):
+    # (time stamps, flags) pairs from either a sliceable sequence or an asynchronous iterable of sequences
+    if hasattr(time_stamps, '__aiter__'):
+        if np.ndim(daylight_savings_on):
+            raise ValueError("An asynchronous source of time stamps needs a single daylight savings flag")
+        async for chunk in time_stamps:
+            yield chunk, daylight_savings_on
+        return
+    flags_per_stamp = np.ndim(daylight_savings_on) > 0
+    for start in range(0, len(time_stamps), chunk_size):
+        stop = start + chunk_size
+        yield time_stamps[start:stop], daylight_savings_on[start:stop] if flags_per_stamp else daylight_savings_on
+
+
+async def stream_position_series(time_stamps, daylight_savings_on, longitude, standard_meridian, latitude,
+                                 chunk_size: int = DEFAULT_CHUNK_SIZE, max_pending: int = DEFAULT_MAX_PENDING,
+                                 dtype=np.float64, executor=None):
+    """
+    Calculates the sun position for a long series of time stamps in chunks, in an executor, and streams the results.
+
+    >>> async for positions in stream_position_series(stamps, False, 105.2, 105, 39.75):
+    ...     await store(positions)
+
+    :param time_stamps: A sequence of datetime.datetime instances, or an array of datetime64 values, in local clock
+                        time, which is split into chunks; or an asynchronous iterable of such sequences, one per chunk
+    :param daylight_savings_on: A flag, or an array of flags matching the time stamps, if the clock time is a daylight
+                                savings number.  If True, the hour is decremented.  An asynchronous source of time
+                                stamps takes a single flag.
+    :param longitude: [west] The longitude west of the prime meridian, as an Angular or in degrees
+    :param standard_meridian: [west] The local standard meridian west of the prime meridian, as an Angular or in degrees
+    :param latitude: [north] The local latitude north of the equator, as an Angular or in degrees
+    :param chunk_size: The number of time stamps per chunk, when a sequence is split
+    :param max_pending: The largest number of chunks submitted to the executor but not yet taken by the consumer
+    :param dtype: The floating point type of the stored arrays, as for :func:`solar_angles.batch.solar_position_series`
+    :param executor: A concurrent.futures executor, or None for the default executor of the event loop
+
+    :returns: An asynchronous iterator of SolarPositionSeries, one per chunk, in the order of the time stamps
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if max_pending < 1:
+        raise ValueError("max_pending must be at least 1")
+    loop = asyncio.get_running_loop()
+    pending = deque()
+    chunks = _chunks(time_stamps, daylight_savings_on, chunk_size)
+    try:
+        while True:
+            # hand over the oldest result before pulling the next chunk, so a full queue holds back the source too
+            if len(pending) >= max_pending:
+                yield await pending.popleft()
+            try:
+                stamps, flags = await chunks.__anext__()
+            except StopAsyncIteration:
+                break
+            pending.append(loop.run_in_executor(executor, partial(
+                batch.solar_position_series, stamps, flags, longitude, standard_meridian, latitude, dtype)))
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,361 @@
+import numpy as np
+
+from solar_angles.solar import Angular, SolarPosition
+
+# These are vectorized versions of the calculations in solar.py, built on NumPy arrays.
+# The formulas are the same as the scalar functions, so the two paths agree to floating point round-off, but a whole
+# time series is evaluated in one pass: declination and equation of time are computed once per time stamp, and no
+# Angular instances are created for the intermediate values.
+# Angles are carried in radians internally.  Values that the scalar functions report as an unvalued Angular (sun
+# down, or sun behind a surface) are reported here as NaN.
+# Site angles may be given as Angular instances, like the scalar functions, or as plain numbers / arrays in degrees.
+# The sun position series can be stored as float32 to halve memory and storage for long runs.  The calculations are
+# always carried out in float64 and only the stored results are rounded, because evaluating the chain itself in
+# float32 loses around 0.001 degrees of azimuth, and up to 0.006 degrees of altitude near the zenith, where the arcsine
+# in the altitude formula is ill-conditioned.
+# The rounding error of the float32 results against the float64 results is bounded by the constants below, in degrees.
+# Surface calculations on a float32 series are also carried out in float64, and returned as float32.
+
+FLOAT32_MAX_ERROR_DEGREES = {'altitude': 2e-5, 'azimuth': 1e-4, 'incidence': 5e-5}
+
+
+def to_degrees(value, name: str) -> np.ndarray:
+    """
+    Converts an Angular, a sequence of Angular, or a number / array in degrees into a float array of degrees.
+
+    :param value: The angle(s) to convert
+    :param name: The argument name, used in the error message
+    :returns: A float64 array of degrees
+    """
+    if isinstance(value, Angular):
+        if not value.valued:
+            raise ValueError(f"Invalid argument {name}, must be a valid Angular object")
+        return np.asarray(value.degrees, dtype=np.float64)
+    if isinstance(value, (list, tuple)) and any(isinstance(x, Angular) for x in value):
+        return np.array([to_degrees(x, name) for x in value], dtype=np.float64)
+    return np.asarray(value, dtype=np.float64)
+
+
+def to_datetime64(time_stamps) -> np.ndarray:
+    """
+    Converts time stamps into a NumPy datetime64 array with one second resolution.
+    The time stamps are local clock times, exactly as they would be passed to the scalar functions.
+
+    :param time_stamps: A sequence of datetime.datetime instances, or an array of datetime64 values
+    :returns: A datetime64[s] array with the same shape as the input
+    """
+    return np.asarray(time_stamps, dtype='datetime64[s]')
+
+
+def day_of_year(time_stamps) -> np.ndarray:
+    """
+    Calculates the day of year (1-366) for each time stamp.
+
+    :param time_stamps: A sequence of datetime.datetime instances, or an array of datetime64 values
+    :returns: [dimensionless] An integer array of days of year
+    """
+    stamps = to_datetime64(time_stamps)
+    return (stamps.astype('datetime64[D]') - stamps.astype('datetime64[Y]')).astype(np.int64) + 1
+
+
+def clock_hours(time_stamps) -> np.ndarray:
+    """
+    Calculates the hour of the day, including the fractional minutes and seconds, for each time stamp.
+
+    :param time_stamps: A sequence of datetime.datetime instances, or an array of datetime64 values
+    :returns: [hours] A float array of clock hours, from 0 up to 24
+    """
+    stamps = to_datetime64(time_stamps)
+    return (stamps - stamps.astype('datetime64[D]')).astype(np.int64) / 3600.0
+
+
+def equation_of_time(days: np.ndarray) -> np.ndarray:
+    """
+    Calculates the Equation of Time, using the same formulation as :func:`solar_angles.solar.equation_of_time`.
+    Integer days of year are looked up in a precomputed table.
+
+    :param days: An array of days of year
+    :returns: [minutes] An array of equation of time values
+    """
+    days = np.asarray(days)
+    if days.dtype.kind in 'iu':
+        return _EQUATION_OF_TIME_MINUTES[days]
+    return _equation_of_time_minutes(days)
+
+
+def _equation_of_time_minutes(days: np.ndarray) -> np.ndarray:
+    radians = np.radians((days - 81.0) * (360.0 / 365.0))
+    return 9.87 * np.sin(2 * radians) - 7.53 * np.cos(radians) - 1.5 * np.sin(radians)
+
+
+def declination_angle(days: np.ndarray) -> np.ndarray:
+    """
+    Calculates the Solar Declination Angle, using the same series as :func:`solar_angles.solar.declination_angle`.
+    Integer days of year are looked up in a precomputed table.
+
+    :param days: An array of days of year
+    :returns: [radians] An array of declination angles
+    """
+    days = np.asarray(days)
+    if days.dtype.kind in 'iu':
+        return _DECLINATION_RADIANS[days]
+    return _declination_radians(days)
+
+
+def _declination_radians(days: np.ndarray) -> np.ndarray:
+    radians = np.radians((days - 1.0) * (360.0 / 365.0))
+    dec_angle_deg = 0.3963723 - 22.9132745 * np.cos(radians) + 4.0254304 * np.sin(radians) - 0.387205 * np.cos(
+        2.0 * radians) + 0.05196728 * np.sin(2.0 * radians) - 0.1545267 * np.cos(
+        3.0 * radians) + 0.08479777 * np.sin(3.0 * radians)
+    return np.radians(dec_angle_deg)
+
+
+# As in solar.py, both series only depend on the day of year, so integer days are looked up in tables indexed by the
+# day of year (index 0 unused) instead of evaluating the trigonometric series for every time stamp.
+_EQUATION_OF_TIME_MINUTES = _equation_of_time_minutes(np.arange(367, dtype=np.float64))
+_DECLINATION_RADIANS = _declination_radians(np.arange(367, dtype=np.float64))
+
+
+def hour_angle(hours: np.ndarray, daylight_savings_on, equation_of_time_minutes: np.ndarray,
+               longitude_degrees, standard_meridian_degrees) -> np.ndarray:
+    """
+    Calculates the hour angle from clock hours, following :func:`solar_angles.solar.hour_angle`.
+    All arguments broadcast against each other.
+
+    :param hours: [hours] The clock hours, as returned from :func:`clock_hours`
+    :param daylight_savings_on: A flag, or array of flags, if the clock time is a daylight savings number.
+    :param equation_of_time_minutes: [minutes] The equation of time, as returned from :func:`equation_of_time`
+    :param longitude_degrees: [degrees west] The longitude(s) west of the prime meridian
+    :param standard_meridian_degrees: [degrees west] The local standard meridian(s) west of the prime meridian
+    :returns: [radians] An array of hour angles
+    """
+    civil_hours = hours - np.asarray(daylight_savings_on, dtype=np.float64)
+    local_solar_time_hours = civil_hours - 4 * (longitude_degrees - standard_meridian_degrees) / 60.0
+    local_solar_time_hours = local_solar_time_hours + equation_of_time_minutes / 60.0
+    return np.radians(15.0 * (local_solar_time_hours - 12))
+
+
+def altitude_angle(hour_radians: np.ndarray, declination_radians: np.ndarray, latitude_radians) -> np.ndarray:
+    """
+    Calculates the solar altitude angle, following :func:`solar_angles.solar.altitude_angle`.
+    All arguments broadcast against each other.
+
+    :returns: [radians] An array of altitude angles
+    """
+    return np.arcsin(
+        np.cos(latitude_radians) * np.cos(declination_radians) * np.cos(hour_radians) + np.sin(
+            latitude_radians) * np.sin(declination_radians))
+
+
+def azimuth_angle(hour_radians: np.ndarray, declination_radians: np.ndarray, latitude_radians,
+                  altitude_radians: np.ndarray) -> np.ndarray:
+    """
+    Calculates the solar azimuth angle, clockwise from north, following :func:`solar_angles.solar.azimuth_angle`.
+    The same branch-free atan2 form is used, so there are no domain errors at the zenith or the poles.
+    All arguments broadcast against each other.
+
+    :returns: [radians] An array of azimuth angles, NaN where the sun is down
+    """
+    cos_declination = np.cos(declination_radians)
+    east = -np.sin(hour_radians) * cos_declination
+    north = np.sin(declination_radians) * np.cos(latitude_radians) - cos_declination * np.sin(
+        latitude_radians) * np.cos(hour_radians)
+    azimuth = np.arctan2(east, north) % (2 * np.pi)
+    return np.where(altitude_radians < 0, np.nan, azimuth)
+
+
+class SolarPositionSeries:
+    """
+    This class holds the sun position for a series of time stamps as contiguous float64 arrays, one per quantity.
+
+    This is the batch counterpart of :class:`solar_angles.solar.SolarPosition`.  The arrays are stored in radians
+    and the degree versions are available through the matching ``*_degrees`` properties.  Keeping one array per
+    quantity means each column can be handed to pandas or Arrow without copying.
+    Indexing the series with an integer returns a single SolarPosition record.
+
+    If the sun is down, the azimuth values are NaN.
+    The equation of time is in minutes.
+    """
+
+    __slots__ = ('time_stamps', 'hour_angle', 'altitude', 'azimuth', 'declination', 'equation_of_time')
+
+    def __init__(self, time_stamps: np.ndarray, hour_angle_radians: np.ndarray, altitude_radians: np.ndarray,
+                 azimuth_radians: np.ndarray, declination_radians: np.ndarray, equation_of_time_minutes: np.ndarray):
+        self.time_stamps = time_stamps
+        self.hour_angle = hour_angle_radians
+        self.altitude = altitude_radians
+        self.azimuth = azimuth_radians
+        self.declination = declination_radians
+        self.equation_of_time = equation_of_time_minutes
+
+    def __len__(self) -> int:
+        return len(self.altitude)
+
+    def __getitem__(self, index: int) -> SolarPosition:
+        azimuth = self.azimuth[index]
+        return SolarPosition(
+            float(self.hour_angle[index]), float(self.altitude[index]), None if np.isnan(azimuth) else float(azimuth),
+            float(self.declination[index]), float(self.equation_of_time[index])
+        )
+
+    @property
+    def hour_angle_degrees(self) -> np.ndarray:
+        return np.degrees(self.hour_angle)
+
+    @property
+    def altitude_degrees(self) -> np.ndarray:
+        return np.degrees(self.altitude)
+
+    @property
+    def azimuth_degrees(self) -> np.ndarray:
+        return np.degrees(self.azimuth)
+
+    @property
+    def declination_degrees(self) -> np.ndarray:
+        return np.degrees(self.declination)
+
+    @property
+    def sun_is_up(self) -> np.ndarray:
+        return self.altitude >= 0
+
+    def as_dict(self, degrees: bool = True) -> dict:
+        """
+        Exports the series as a dictionary of column arrays, suitable for pandas.DataFrame or pyarrow.table.
+
+        :param degrees: If True, the angles are exported in degrees, otherwise the stored radian arrays are returned
+                        directly, without copying.
+        :returns: A dictionary keyed by quantity name
+        """
+        if degrees:
+            return {
+                'time_stamp': self.time_stamps,
+                'hour_angle': self.hour_angle_degrees,
+                'altitude': self.altitude_degrees,
+                'azimuth': self.azimuth_degrees,
+                'declination': self.declination_degrees,
+                'equation_of_time': self.equation_of_time,
+            }
+        return {
+            'time_stamp': self.time_stamps,
+            'hour_angle': self.hour_angle,
+            'altitude': self.altitude,
+            'azimuth': self.azimuth,
+            'declination': self.declination,
+            'equation_of_time': self.equation_of_time,
+        }
+
+
+def solar_position_series(time_stamps, daylight_savings_on, longitude, standard_meridian, latitude,
+                          dtype=np.float64) -> SolarPositionSeries:
+    """
+    Calculates the sun position for a whole series of time stamps at one location in a single vectorized pass.
+    This is the batch counterpart of :func:`solar_angles.solar.solar_position`.
+
+    :param time_stamps: A sequence of datetime.datetime instances, or an array of datetime64 values, in local clock time
+    :param daylight_savings_on: A flag, or an array of flags matching the time stamps, if the clock time is a daylight
+                                savings number.  If True, the hour is decremented.
+    :param longitude: [west] The current longitude west of the prime meridian, as an Angular or in degrees.
+                      For Golden, CO, the variable should be = 105.2 degrees.
+    :param standard_meridian: [west] The local standard meridian for the location, west of the prime meridian,
+                              as an Angular or in degrees.  For Golden, CO, the variable should be = 105 degrees.
+    :param latitude: [north] The local latitude for the location, north of the equator, as an Angular or in degrees.
+                     For Golden, CO, the variable should be = 39.75 degrees.
+    :param dtype: The floating point type of the stored arrays, float64 or float32.  With float32 the results differ
+                  from float64 by at most :data:`FLOAT32_MAX_ERROR_DEGREES`.
+
+    :returns: [SolarPositionSeries] The sun position arrays
+    """
+    longitude_degrees = to_degrees(longitude, 'longitude')
+    standard_meridian_degrees = to_degrees(standard_meridian, 'standard_meridian')
+    latitude_radians = np.radians(to_degrees(latitude, 'latitude'))
+    stamps = to_datetime64(time_stamps)
+    days = day_of_year(stamps)
+    eot_minutes = equation_of_time(days)
+    declination_radians = declination_angle(days)
+    hour_radians = hour_angle(clock_hours(stamps), daylight_savings_on, eot_minutes, longitude_degrees,
+                              standard_meridian_degrees)
+    altitude_radians = altitude_angle(hour_radians, declination_radians, latitude_radians)
+    azimuth_radians = azimuth_angle(hour_radians, declination_radians, latitude_radians, altitude_radians)
+    dtype = series_dtype(dtype)
+    return SolarPositionSeries(stamps, *(array.astype(dtype, copy=False) for array in (
+        hour_radians, altitude_radians, azimuth_radians, declination_radians, eot_minutes)))
+
+
+def series_dtype(dtype) -> np.dtype:
+    """
+    Validates the floating point type requested for a sun position series.
+
+    :param dtype: The requested type, float64 or float32
+    :returns: The type as a numpy.dtype
+    """
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float64, np.float32):
+        raise ValueError(f"Invalid dtype {dtype}, must be float64 or float32")
+    return dtype
+
+
+def wall_azimuth_angle(positions: SolarPositionSeries, surface_azimuths) -> np.ndarray:
+    """
+    Calculates the wall azimuth angle for every time stamp in the series and every surface,
+    following :func:`solar_angles.solar.wall_azimuth_angle`.
+
+    :param positions: The sun positions, as returned from :func:`solar_position_series`
+    :param surface_azimuths: [CW from North] A single surface azimuth, or a sequence of them, as Angular instances or
+                             in degrees.
+    :returns: [radians] An array shaped (time stamps,) for a single surface, or (time stamps, surfaces) for a sequence,
+              NaN where the sun is down or behind the surface.
+    """
+    return _wall_azimuth_radians(positions, surface_azimuths).astype(positions.azimuth.dtype, copy=False)
+
+
+def _wall_azimuth_radians(positions: SolarPositionSeries, surface_azimuths) -> np.ndarray:
+    surface_degrees = to_degrees(surface_azimuths, 'surface_azimuths') % 360
+    wall_azimuth_degrees = np.degrees(positions.azimuth.astype(np.float64))[..., np.newaxis] - surface_degrees
+    if surface_degrees.ndim == 0:
+        wall_azimuth_degrees = wall_azimuth_degrees[..., 0]
+    with np.errstate(invalid='ignore'):
+        behind = (wall_azimuth_degrees > 90) | (wall_azimuth_degrees < -90)
+    return np.where(behind, np.nan, np.radians(wall_azimuth_degrees))
+
+
+def solar_angle_of_incidence(positions: SolarPositionSeries, surface_azimuths) -> np.ndarray:
+    """
+    Calculates the solar angle of incidence for every time stamp in the series and every surface,
+    following :func:`solar_angles.solar.solar_angle_of_incidence`.
+
+    :param positions: The sun positions, as returned from :func:`solar_position_series`
+    :param surface_azimuths: [CW from North] A single surface azimuth, or a sequence of them, as Angular instances or
+                             in degrees.
+    :returns: [radians] An array shaped (time stamps,) for a single surface, or (time stamps, surfaces) for a sequence,
+              NaN where the sun is down or behind the surface.
+    """
+    wall_azimuth_radians = _wall_azimuth_radians(positions, surface_azimuths)
+    altitude_radians = positions.altitude.astype(np.float64)
+    if wall_azimuth_radians.ndim == 2:
+        altitude_radians = altitude_radians[:, np.newaxis]
+    incidence = np.arccos(np.cos(altitude_radians) * np.cos(wall_azimuth_radians))
+    return incidence.astype(positions.altitude.dtype, copy=False)
+
+
+def direct_radiation_on_surface(positions: SolarPositionSeries, surface_azimuths,
+                                horizontal_direct_irradiation) -> np.ndarray:
+    """
+    Calculates the direct solar radiation incident on each surface for every time stamp in the series,
+    following :func:`solar_angles.solar.direct_radiation_on_surface`.
+
+    Unlike the scalar function, which cannot evaluate the cosine of an unvalued incidence angle, time stamps where the
+    sun is down or behind the surface simply receive zero direct radiation.
+
+    :param positions: The sun positions, as returned from :func:`solar_position_series`
+    :param surface_azimuths: [CW from North] A single surface azimuth, or a sequence of them, as Angular instances or
+                             in degrees.
+    :param horizontal_direct_irradiation: The global horizontal direct irradiation, as a single value or an array
+                                          matching the time stamps, in any units
+    :returns: An array shaped (time stamps,) for a single surface, or (time stamps, surfaces) for a sequence.
+              The units match the units of the parameter :horizontal_direct_irradiation:
+    """
+    cos_theta = np.cos(solar_angle_of_incidence(positions, surface_azimuths))
+    irradiation = np.asarray(horizontal_direct_irradiation, dtype=np.float64)
+    if cos_theta.ndim == 2 and irradiation.ndim == 1:
+        irradiation = irradiation[:, np.newaxis]
+    return np.nan_to_num(irradiation * cos_theta, nan=0.0)
@@ -0,0 +1,215 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from solar_angles import instrumentation, solar
+from solar_angles.solar import Site, SolarPosition
+
+# A cache in front of solar.solar_position for online services, where many requests ask for the sun position of the
+# same site within the same minute.  Time stamps are rounded to the nearest multiple of a configurable resolution
+# (counted from midnight), and the position is calculated once for the rounded time stamp, so every request within the
+# same step of the same site shares one SolarPosition record.  The rounding is the price of the cache: with the default
+# one minute resolution the sun moves at most about a quarter of a degree between the requested and the cached time.
+# Sites are registered up front under an id of the caller's choosing, and entries are keyed by
+#   (site id, rounded time stamp, daylight savings flag)
+# Entries are evicted least recently used first once the size limit is reached, and optionally expire a fixed time
+# after they were calculated.  On a miss, the next few steps of the same site can be calculated straight away, since
+# dashboards and controllers tend to walk forward in time.
+# One lock guards the entries and the statistics, but the sun position itself is calculated outside of it, so a slow
+# calculation never blocks lookups from other threads.  Two threads missing the same key at once both calculate it,
+# which is harmless since they get identical records.
+# Hits and misses are counted here and also reported to the instrumentation counters under the cache name.
+
+DEFAULT_RESOLUTION_SECONDS = 60.0
+DEFAULT_MAX_SIZE = 4096
+
+
+class PositionCache:
+    """
+    This class is a thread-safe cache of SolarPosition records, keyed by site id and time stamp rounded to a fixed
+    resolution.
+
+    >>> cache = PositionCache(resolution_seconds=60, prefetch_steps=5)
+    >>> cache.add_site('golden', Site(Angular(degrees=39.75), Angular(degrees=105.2), Angular(degrees=105)))
+    >>> position = cache.solar_position('golden', datetime(2001, 7, 21, 10, 0, 20), daylight_savings_on=True)
+    """
+
+    def __init__(self, resolution_seconds: float = DEFAULT_RESOLUTION_SECONDS, max_size: int = DEFAULT_MAX_SIZE,
+                 ttl_seconds: float = None, prefetch_steps: int = 0, name: str = 'solar_position',
+                 clock=time.monotonic):
+        """
+        Constructor for the class.
+
+        :param resolution_seconds: [seconds] The time stamp rounding step; time stamps within the same step share an
+                                   entry
+        :param max_size: The largest number of entries kept before the least recently used ones are evicted
+        :param ttl_seconds: [seconds] If given, entries expire this long after they were calculated
+        :param prefetch_steps: The number of following steps of the same site calculated along with each miss
+        :param name: The cache name used when reporting to the instrumentation counters
+        :param clock: A function returning the current time in seconds, used for expiry
+        """
+        if resolution_seconds <= 0:
+            raise ValueError("resolution_seconds must be greater than 0")
+        if prefetch_steps < 0:
+            raise ValueError("prefetch_steps must not be negative")
+        if max_size <= prefetch_steps:
+            raise ValueError("max_size must be greater than prefetch_steps")
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be greater than 0")
+        self.resolution_seconds = resolution_seconds
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.prefetch_steps = prefetch_steps
+        self.name = name
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sites = {}
+        self._entries = OrderedDict()  # key -> (SolarPosition, expiry time or None)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.prefetched = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def add_site(self, site_id, site: Site) -> None:
+        """
+        Registers a site under an id.  Registering an id again replaces the site and drops its cached entries.
+
+        :param site_id: Any hashable id, such as a name or a database key
+        :param site: The site location
+        """
+        with self._lock:
+            if site_id in self._sites:
+                self._drop_site(site_id)
+            self._sites[site_id] = site
+
+    def remove_site(self, site_id) -> None:
+        """
+        Unregisters a site and drops its cached entries.
+
+        :param site_id: The id the site was registered under
+        """
+        with self._lock:
+            self._site(site_id)
+            self._drop_site(site_id)
+            del self._sites[site_id]
+
+    def clear(self) -> None:
+        """
+        Drops every cached entry, keeping the registered sites and the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def rounded_time_stamp(self, time_stamp: datetime) -> datetime:
+        """
+        Rounds a time stamp to the nearest step of the cache resolution, counted from midnight.
+
+        :param time_stamp: The time stamp to round
+        :returns: The rounded time stamp, which is what the cached position is calculated for
+        """
+        midnight = time_stamp.replace(hour=0, minute=0, second=0, microsecond=0)
+        seconds = (time_stamp - midnight).total_seconds()
+        return midnight + timedelta(seconds=round(seconds / self.resolution_seconds) * self.resolution_seconds)
+
+    def solar_position(self, site_id, time_stamp: datetime, daylight_savings_on: bool = False) -> SolarPosition:
+        """
+        Looks up the sun position of a registered site, calculating it on a miss.
+
+        :param site_id: The id the site was registered under
+        :param time_stamp: The current date and time, which is rounded to the cache resolution
+        :param daylight_savings_on: A flag if the current time is a daylight savings number.
+                                    If True, the hour is decremented.
+        :returns: [SolarPosition] The sun position at the rounded time stamp
+        """
+        rounded = self.rounded_time_stamp(time_stamp)
+        key = (site_id, rounded, bool(daylight_savings_on))
+        with self._lock:
+            site = self._site(site_id)
+            position = self._lookup(key)
+            if position is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        instrumentation.record_cache_access(self.name, position is not None)
+        if position is not None:
+            return position
+
+        step = timedelta(seconds=self.resolution_seconds)
+        computed = [(key, self._calculate(site, rounded, daylight_savings_on))]
+        for index in range(1, self.prefetch_steps + 1):
+            following = (site_id, rounded + index * step, key[2])
+            with self._lock:
+                entry = self._entries.get(following)
+                cached = entry is not None and not self._expired(entry[1])
+            if not cached:
+                computed.append((following, self._calculate(site, following[1], daylight_savings_on)))
+        with self._lock:
+            if self._sites.get(site_id) is site:  # the site was not replaced while calculating
+                # the requested entry goes in last, so it is the most recently used one
+                for entry_key, entry_position in reversed(computed):
+                    self._store(entry_key, entry_position)
+                self.prefetched += len(computed) - 1
+        return computed[0][1]
+
+    def statistics(self) -> dict:
+        """
+        Reports the cache counters.
+
+        :returns: A dictionary with the 'size', 'hits', 'misses', 'hit_rate', 'evictions', 'expirations' and
+                  'prefetched' counts, where the hit rate is None if the cache has not been accessed
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else None,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'prefetched': self.prefetched,
+            }
+
+    def _site(self, site_id) -> Site:
+        try:
+            return self._sites[site_id]
+        except KeyError:
+            raise KeyError(f"Site {site_id!r} is not registered with this cache") from None
+
+    def _drop_site(self, site_id) -> None:
+        for key in [key for key in self._entries if key[0] == site_id]:
+            del self._entries[key]
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        position, expires = entry
+        if self._expired(expires):
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return position
+
+    def _expired(self, expires) -> bool:
+        return expires is not None and self._clock() >= expires
+
+    def _store(self, key, position: SolarPosition) -> None:
+        expires = None if self.ttl_seconds is None else self._clock() + self.ttl_seconds
+        self._entries[key] = (position, expires)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    @staticmethod
+    def _calculate(site: Site, time_stamp: datetime, daylight_savings_on: bool) -> SolarPosition:
+        return solar.solar_position(time_stamp, daylight_savings_on, site.longitude, site.standard_meridian,
+                                    site.latitude)
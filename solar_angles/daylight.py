@@ -0,0 +1,112 @@
+import numpy as np
+
+from solar_angles import batch
+
+# Daylight-only evaluation of a sun position series.
+# Roughly half of the time stamps in an annual run are at night, where the altitude is only computed to find out that
+# the azimuth and surface angles are unvalued.  Here the sunset hour angle is solved once per day instead, from
+#   cos(sunset hour angle) = -tan(latitude) tan(declination)
+# and each time stamp is classified by comparing its hour angle (which is cheap, and needed anyway) against it.
+# Only the daylight time stamps then go through the altitude, azimuth, wall azimuth and incidence calculations.
+# The results come back compressed: the daylight values plus their positions in the full series, which can be
+# expanded to dense arrays with a fill value for the night time stamps.
+# Time stamps right at sunrise or sunset are classified with a small margin and then checked against the computed
+# altitude, so the daylight set is exactly the set where batch.solar_position_series reports a valued azimuth.
+
+SUNSET_MARGIN_RADIANS = 1e-6
+
+
+class DaylightSeries:
+    """
+    This class holds the results of :func:`daylight_position_series` in compressed form.
+
+    The positions member is a SolarPositionSeries holding only the daylight time stamps, and the index member holds
+    the position of each of them in the full input series.  If surfaces were given, the wall azimuth and incidence
+    members are shaped (daylight time stamps, surfaces), otherwise they are None.  Angles are in radians.
+    """
+
+    __slots__ = ('index', 'length', 'positions', 'wall_azimuth', 'incidence')
+
+    def __init__(self, index: np.ndarray, length: int, positions: batch.SolarPositionSeries,
+                 wall_azimuth: np.ndarray = None, incidence: np.ndarray = None):
+        self.index = index
+        self.length = length
+        self.positions = positions
+        self.wall_azimuth = wall_azimuth
+        self.incidence = incidence
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def daylight_mask(self) -> np.ndarray:
+        mask = np.zeros(self.length, dtype=bool)
+        mask[self.index] = True
+        return mask
+
+    def dense(self, values: np.ndarray, fill_value=np.nan) -> np.ndarray:
+        """
+        Expands a compressed array back out to the full series.
+
+        :param values: An array whose first axis matches the daylight time stamps, such as positions.azimuth or
+                       incidence
+        :param fill_value: The value written for the night time stamps
+        :returns: An array whose first axis matches the full input series
+        """
+        values = np.asarray(values)
+        result = np.full((self.length,) + values.shape[1:], fill_value, dtype=np.result_type(values, fill_value))
+        result[self.index] = values
+        return result
+
+
+def daylight_position_series(time_stamps, daylight_savings_on, longitude, standard_meridian, latitude,
+                             surface_azimuths=None, dtype=np.float64) -> DaylightSeries:
+    """
+    Calculates the sun position, and optionally the wall azimuth and incidence angles on a set of surfaces, for only
+    the daylight time stamps of a series.  The values match :func:`solar_angles.batch.solar_position_series` and the
+    batch surface functions wherever the sun is up.
+
+    :param time_stamps: A sequence of datetime.datetime instances, or an array of datetime64 values, in local clock time
+    :param daylight_savings_on: A flag, or an array of flags matching the time stamps, if the clock time is a daylight
+                                savings number.  If True, the hour is decremented.
+    :param longitude: [west] The longitude west of the prime meridian, as an Angular or in degrees
+    :param standard_meridian: [west] The local standard meridian west of the prime meridian, as an Angular or in degrees
+    :param latitude: [north] The local latitude north of the equator, as an Angular or in degrees
+    :param surface_azimuths: [CW from North] If given, a single surface azimuth or a sequence of them, as Angular
+                             instances or in degrees
+    :param dtype: The floating point type of the stored arrays, as for :func:`solar_angles.batch.solar_position_series`
+
+    :returns: [DaylightSeries] The compressed daylight results
+    """
+    dtype = batch.series_dtype(dtype)
+    longitude_degrees = batch.to_degrees(longitude, 'longitude')
+    standard_meridian_degrees = batch.to_degrees(standard_meridian, 'standard_meridian')
+    latitude_radians = np.radians(batch.to_degrees(latitude, 'latitude'))
+    stamps = np.atleast_1d(batch.to_datetime64(time_stamps))
+    days = batch.day_of_year(stamps)
+
+    # the sunset hour angle only depends on the day, so it is solved for each distinct day and spread out from there
+    unique_days, day_inverse = np.unique(days, return_inverse=True)
+    cos_sunset = -np.tan(latitude_radians) * np.tan(batch.declination_angle(unique_days))
+    sunset_hour_radians = np.arccos(np.clip(cos_sunset, -1.0, 1.0))[day_inverse]
+    eot_minutes = batch.equation_of_time(days)
+    hour_radians = batch.hour_angle(batch.clock_hours(stamps), daylight_savings_on, eot_minutes, longitude_degrees,
+                                    standard_meridian_degrees)
+    # hour angles just past +/-180 degrees (around local midnight) are measured the other way round
+    wrapped_hour_radians = np.abs((hour_radians + np.pi) % (2 * np.pi) - np.pi)
+    candidates = np.nonzero(wrapped_hour_radians <= sunset_hour_radians + SUNSET_MARGIN_RADIANS)[0]
+
+    declination_radians = batch.declination_angle(days[candidates])
+    altitude_radians = batch.altitude_angle(hour_radians[candidates], declination_radians, latitude_radians)
+    up = altitude_radians >= 0
+    index = candidates[up]
+    declination_radians = declination_radians[up]
+    altitude_radians = altitude_radians[up]
+    hour_radians = hour_radians[index]
+    azimuth_radians = batch.azimuth_angle(hour_radians, declination_radians, latitude_radians, altitude_radians)
+    positions = batch.SolarPositionSeries(stamps[index], *(array.astype(dtype, copy=False) for array in (
+        hour_radians, altitude_radians, azimuth_radians, declination_radians, eot_minutes[index])))
+    if surface_azimuths is None:
+        return DaylightSeries(index, len(stamps), positions)
+    return DaylightSeries(index, len(stamps), positions, batch.wall_azimuth_angle(positions, surface_azimuths),
+                          batch.solar_angle_of_incidence(positions, surface_azimuths))
@@ -1,12 +1,14 @@
 from datetime import datetime
 import csv
 
-from solar_angles.solar import hour_angle, altitude_angle, azimuth_angle, solar_angle_of_incidence
+from solar_angles.solar import solar_angle_of_incidence, solar_position, Angular
 
 # Golden, CO
-longitude = 104.85
-standard_meridian = 105
-latitude = 39.57
+longitude = Angular(degrees=104.85)
+standard_meridian = Angular(degrees=105)
+latitude = Angular(degrees=39.57)
+east_wall = Angular(degrees=90)
+west_wall = Angular(degrees=270)
 
 with open('/tmp/compare_winter_angles_library.csv', 'w') as csvfile:
     my_writer = csv.writer(csvfile)
@@ -14,10 +16,8 @@ with open('/tmp/compare_winter_angles_library.csv', 'w') as csvfile:
     for hour in range(0, 24):  # gives zero-based hours as expected in the datetime constructor
         x = hour
         dt = datetime(2001, 12, 21, hour, 30, 00)
-        t_hour = hour_angle(dt, False, longitude, standard_meridian).degrees
-        altitude = altitude_angle(dt, False, longitude, standard_meridian, latitude).degrees
-        azimuth = azimuth_angle(dt, False, longitude, standard_meridian, latitude).degrees
-        my_writer.writerow([x, -t_hour, altitude, azimuth])
+        position = solar_position(dt, False, longitude, standard_meridian, latitude)
+        my_writer.writerow([x, -position.hour_angle_degrees, position.altitude_degrees, position.azimuth_degrees])
 
 with open('/tmp/compare_summer_angles_library.csv', 'w') as csvfile:
     my_writer = csv.writer(csvfile)
@@ -25,10 +25,8 @@ with open('/tmp/compare_summer_angles_library.csv', 'w') as csvfile:
     for hour in range(0, 24):  # gives zero-based hours as expected in the datetime constructor
         x = hour
         dt = datetime(2001, 7, 21, hour, 30, 00)
-        t_hour = hour_angle(dt, False, longitude, standard_meridian).degrees
-        altitude = altitude_angle(dt, False, longitude, standard_meridian, latitude).degrees
-        azimuth = azimuth_angle(dt, False, longitude, standard_meridian, latitude).degrees
-        my_writer.writerow([x, -t_hour, altitude, azimuth])
+        position = solar_position(dt, False, longitude, standard_meridian, latitude)
+        my_writer.writerow([x, -position.hour_angle_degrees, position.altitude_degrees, position.azimuth_degrees])
 
 with open('/tmp/compare_summer_incidence_library.csv', 'w') as csvfile:
     my_writer = csv.writer(csvfile)
@@ -37,7 +35,7 @@ with open('/tmp/compare_summer_incidence_library.csv', 'w') as csvfile:
         x = hour
         dt = datetime(2001, 7, 21, hour, 30, 00)
         theta_west = solar_angle_of_incidence(
-            dt, False, longitude, standard_meridian, latitude, 270).degrees
+            dt, False, longitude, standard_meridian, latitude, west_wall).degrees
         theta_east = solar_angle_of_incidence(
-            dt, False, longitude, standard_meridian, latitude, 90).degrees
+            dt, False, longitude, standard_meridian, latitude, east_wall).degrees
         my_writer.writerow([x, theta_east, theta_west])
@@ -0,0 +1,300 @@
+import numpy as np
+
+from solar_angles import batch
+from solar_angles.solar import Site
+
+# Reverse queries: find the instants when the sun reaches a given altitude or azimuth, for every day in a date range.
+# Within one day the declination and equation of time are constant (they only depend on the day of year), so the
+# altitude is a simple function of the hour angle, and an altitude crossing can be solved in closed form from
+#   sin(altitude) = sin(latitude) sin(declination) + cos(latitude) cos(declination) cos(hour angle)
+# The azimuth does not invert as cleanly, so azimuth crossings are found by bracketing: a handful of samples between
+# sunrise and sunset locate the sign changes, and a vectorized bisection refines every bracket of every day together.
+# The azimuth is compared with the target around the circle, so a target of 0 or 360 degrees is found when the sun
+# passes north, as it does around midnight during the polar day.
+# All the results are datetime64[s] arrays of local clock time, with NaT where the event does not happen that day.
+
+DEFAULT_SAMPLES_PER_DAY = 25
+DEFAULT_TOLERANCE_SECONDS = 1.0
+
+
+class DayParameters:
+    """
+    This class holds the per-day quantities shared by every evaluation within a day of the date range.
+    """
+
+    __slots__ = ('dates', 'declination', 'equation_of_time')
+
+    def __init__(self, start_date, end_date):
+        self.dates = np.arange(np.datetime64(start_date, 'D'), np.datetime64(end_date, 'D') + 1)
+        if len(self.dates) == 0:
+            raise ValueError("end_date must not be before start_date")
+        days = batch.day_of_year(self.dates)
+        self.declination = batch.declination_angle(days)
+        self.equation_of_time = batch.equation_of_time(days)
+
+
+def _clock_offset_hours(site: Site, daylight_savings_on: bool, equation_of_time: np.ndarray) -> np.ndarray:
+    # clock hours = local solar time + this offset, inverting the chain in batch.hour_angle
+    return 4 * (site.longitude.degrees - site.standard_meridian.degrees) / 60.0 - equation_of_time / 60.0 + float(
+        daylight_savings_on)
+
+
+def _to_time_stamps(dates: np.ndarray, hours: np.ndarray) -> np.ndarray:
+    seconds = np.round(hours * 3600.0)
+    stamps = dates.astype('datetime64[s]') + np.nan_to_num(seconds).astype(np.int64).astype('timedelta64[s]')
+    return np.where(np.isnan(hours), np.datetime64('NaT'), stamps)
+
+
+def _altitude_crossing_hours(site: Site, daylight_savings_on: bool, parameters: DayParameters,
+                             altitude_degrees: float) -> tuple:
+    latitude_radians = site.latitude.radians
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cos_hour_angle = (np.sin(np.radians(altitude_degrees)) - np.sin(latitude_radians) * np.sin(
+            parameters.declination)) / (np.cos(latitude_radians) * np.cos(parameters.declination))
+        half_day_hours = np.degrees(np.arccos(cos_hour_angle)) / 15.0
+    offset = _clock_offset_hours(site, daylight_savings_on, parameters.equation_of_time)
+    return 12.0 - half_day_hours + offset, 12.0 + half_day_hours + offset, cos_hour_angle
+
+
+def altitude_crossings(site: Site, start_date, end_date, altitude_degrees: float = 0.0,
+                       daylight_savings_on: bool = False) -> tuple:
+    """
+    Finds, for every day in a date range, the morning and evening instants when the solar altitude crosses a threshold.
+    With the default threshold of zero these are sunrise and sunset, using the same sun-down test as
+    :func:`solar_angles.solar.azimuth_angle`.  Civil twilight is a threshold of -6 degrees.
+
+    :param site: The location to calculate for
+    :param start_date: The first day of the range, as a date, datetime or datetime64
+    :param end_date: The last day of the range, inclusive
+    :param altitude_degrees: [degrees] The altitude threshold
+    :param daylight_savings_on: A flag if the clock times should be daylight savings numbers.
+                                If True, the returned times are one hour later.
+
+    :returns: A tuple of (dates, rising, setting) arrays.  Rising and setting are local clock times, NaT on days when
+              the sun stays entirely above or below the threshold.
+    """
+    parameters = DayParameters(start_date, end_date)
+    rising, setting, _ = _altitude_crossing_hours(site, daylight_savings_on, parameters, altitude_degrees)
+    return parameters.dates, _to_time_stamps(parameters.dates, rising), _to_time_stamps(parameters.dates, setting)
+
+
+def _daylight_bounds(site: Site, daylight_savings_on: bool, parameters: DayParameters) -> tuple:
+    # sunrise and sunset clock hours, with the whole day for polar day, and NaN for polar night
+    rising, setting, cos_hour_angle = _altitude_crossing_hours(site, daylight_savings_on, parameters, 0.0)
+    polar_day = cos_hour_angle < -1
+    rising = np.where(polar_day, 0.0, rising)
+    setting = np.where(polar_day, 24.0, setting)
+    return rising, setting
+
+
+def _azimuth_degrees(site: Site, daylight_savings_on: bool, hours: np.ndarray, declination: np.ndarray,
+                     equation_of_time: np.ndarray) -> np.ndarray:
+    latitude_radians = site.latitude.radians
+    hour_radians = batch.hour_angle(hours, daylight_savings_on, equation_of_time, site.longitude.degrees,
+                                    site.standard_meridian.degrees)
+    altitude = batch.altitude_angle(hour_radians, declination, latitude_radians)
+    return np.degrees(batch.azimuth_angle(hour_radians, declination, latitude_radians, altitude))
+
+
+def _wrapped_difference(azimuth_degrees: np.ndarray, target_degrees) -> np.ndarray:
+    # the azimuth relative to the target in [-180, 180), so the sun passing north is continuous for any target
+    return (azimuth_degrees - target_degrees + 180.0) % 360.0 - 180.0
+
+
+def _azimuth_crossing_hours(site: Site, daylight_savings_on: bool, parameters: DayParameters, targets: np.ndarray,
+                            samples_per_day: int, tolerance_seconds: float) -> tuple:
+    """
+    Finds the crossings of several target azimuths at once.  The bracketing samples are shared by every target, and
+    the bisection refines the brackets of every target and every day together.
+
+    :returns: A tuple of (target index, day index, clock hours, direction) arrays, one entry per crossing
+    """
+    if samples_per_day < 2:
+        raise ValueError("samples_per_day must be at least 2")
+    sunrise, sunset = _daylight_bounds(site, daylight_savings_on, parameters)
+    # sample strictly inside the daylight window, so every sample is valued
+    fractions = np.linspace(0.0, 1.0, samples_per_day)
+    margin = 1e-6
+    hours = (sunrise + margin)[:, np.newaxis] + (sunset - sunrise - 2 * margin)[:, np.newaxis] * fractions
+    azimuth = _azimuth_degrees(site, daylight_savings_on, hours, parameters.declination[:, np.newaxis],
+                               parameters.equation_of_time[:, np.newaxis])
+    difference = _wrapped_difference(azimuth[np.newaxis, :, :], targets[:, np.newaxis, np.newaxis])
+
+    before, after = difference[:, :, :-1], difference[:, :, 1:]
+    with np.errstate(invalid='ignore'):
+        # a jump of more than half a turn is the sun passing opposite the target, not a crossing of the target
+        bracketed = ((before < 0) != (after < 0)) & (np.abs(after - before) < 180)
+    target_index, day_index, sample_index = np.nonzero(bracketed)
+    low = hours[day_index, sample_index]
+    high = hours[day_index, sample_index + 1]
+    low_sign = difference[target_index, day_index, sample_index] < 0
+    target = targets[target_index]
+    declination = parameters.declination[day_index]
+    equation_of_time = parameters.equation_of_time[day_index]
+    tolerance_hours = tolerance_seconds / 3600.0
+    while len(low) and np.max(high - low) > tolerance_hours:
+        middle = (low + high) / 2
+        middle_sign = _wrapped_difference(
+            _azimuth_degrees(site, daylight_savings_on, middle, declination, equation_of_time), target) < 0
+        move_low = middle_sign == low_sign
+        low = np.where(move_low, middle, low)
+        high = np.where(move_low, high, middle)
+    return target_index, day_index, (low + high) / 2, np.where(low_sign, 1, -1)
+
+
+def azimuth_crossings(site: Site, start_date, end_date, azimuth_degrees: float, daylight_savings_on: bool = False,
+                      samples_per_day: int = DEFAULT_SAMPLES_PER_DAY,
+                      tolerance_seconds: float = DEFAULT_TOLERANCE_SECONDS) -> tuple:
+    """
+    Finds every instant in a date range when the sun is up and its azimuth passes through a target value.
+    The target is compared with the solar azimuth around the circle, so 0 and 360 degrees both find the sun passing
+    north.  Passing a surface azimuth +/- 90 degrees finds the moments when the sun passes the plane of that wall;
+    for a wall facing near north, :func:`solar_angles.solar.wall_azimuth_angle` also cuts the sun off when it passes
+    north, since it works from the raw difference of the solar and surface azimuth.
+
+    :param site: The location to calculate for
+    :param start_date: The first day of the range, as a date, datetime or datetime64
+    :param end_date: The last day of the range, inclusive
+    :param azimuth_degrees: [CW from North] The target azimuth, in degrees
+    :param daylight_savings_on: A flag if the clock times should be daylight savings numbers.
+    :param samples_per_day: The number of samples between sunrise and sunset used to bracket the crossings
+    :param tolerance_seconds: The bisection stops once every bracket is narrower than this
+
+    :returns: A tuple of (times, directions) arrays, sorted by time.  The directions are +1 where the azimuth is
+              increasing (turning clockwise) through the target and -1 where it is decreasing.
+    """
+    parameters = DayParameters(start_date, end_date)
+    _, day_index, hours, directions = _azimuth_crossing_hours(
+        site, daylight_savings_on, parameters, np.array([float(azimuth_degrees)]), samples_per_day, tolerance_seconds
+    )
+    times = _to_time_stamps(parameters.dates[day_index], hours)
+    order = np.argsort(times, kind='stable')
+    return times[order], directions[order]
+
+
+class SurfaceWindows:
+    """
+    This class holds the daily sun windows of a set of surfaces as flat, parallel arrays, one entry per window.
+
+    A window is an interval during which the sun is up and in front of the surface, which is exactly when
+    :func:`solar_angles.solar.solar_angle_of_incidence` returns a valued angle.  The entries are sorted by surface,
+    then by start time.  Start and end are datetime64[s] local clock times.
+    """
+
+    __slots__ = ('surface_index', 'date', 'start', 'end')
+
+    def __init__(self, surface_index: np.ndarray, date: np.ndarray, start: np.ndarray, end: np.ndarray):
+        self.surface_index = surface_index
+        self.date = date
+        self.start = start
+        self.end = end
+
+    def __len__(self) -> int:
+        return len(self.surface_index)
+
+    def for_surface(self, surface_index: int) -> list:
+        """
+        Collects the windows of one surface.
+
+        :param surface_index: The position of the surface in the sequence passed to :func:`surface_sun_windows`
+        :returns: A list of (start, end) datetime64 tuples, in time order
+        """
+        mask = self.surface_index == surface_index
+        return list(zip(self.start[mask], self.end[mask]))
+
+
+def surface_sun_windows(site: Site, start_date, end_date, surface_azimuths, daylight_savings_on: bool = False,
+                        samples_per_day: int = DEFAULT_SAMPLES_PER_DAY,
+                        tolerance_seconds: float = DEFAULT_TOLERANCE_SECONDS) -> SurfaceWindows:
+    """
+    Finds, for every surface and every day in a date range, the intervals when the sun is above the horizon and in
+    front of the surface.  The interval ends are solved for, not sampled: sunrise and sunset come from the closed form
+    altitude crossing, and the moments the sun passes the surface azimuth +/- 90 degrees, or passes north (where the
+    scalar wall azimuth cut-off jumps), from the azimuth root finder.
+    Surfaces which share an azimuth share all of the work.
+
+    :param site: The location to calculate for
+    :param start_date: The first day of the range, as a date, datetime or datetime64
+    :param end_date: The last day of the range, inclusive
+    :param surface_azimuths: [CW from North] A sequence of surface azimuths, as Angular instances or in degrees
+    :param daylight_savings_on: A flag if the clock times should be daylight savings numbers.
+    :param samples_per_day: The number of samples between sunrise and sunset used to bracket the azimuth crossings
+    :param tolerance_seconds: The accuracy of the azimuth crossing times
+
+    :returns: [SurfaceWindows] The windows of all the surfaces
+    """
+    parameters = DayParameters(start_date, end_date)
+    surface_degrees = np.atleast_1d(batch.to_degrees(list(surface_azimuths), 'surface_azimuths')) % 360
+    unique_degrees, surface_to_unique = np.unique(surface_degrees, return_inverse=True)
+    sunrise, sunset = _daylight_bounds(site, daylight_savings_on, parameters)
+
+    # the candidate window ends for each (unique surface, day): sunrise, sunset, both azimuth limit crossings, and
+    # the sun passing north, where the raw difference of the solar and surface azimuth jumps by a full turn
+    unique_count = len(unique_degrees)
+    limits = np.concatenate([unique_degrees - 90, unique_degrees + 90, [0.0]])
+    target_index, day_index, hours, _ = _azimuth_crossing_hours(
+        site, daylight_savings_on, parameters, limits, samples_per_day, tolerance_seconds
+    )
+    north = target_index == 2 * unique_count
+    north_count = np.count_nonzero(north)
+    has_daylight = ~np.isnan(sunrise)
+    daylight_days = np.nonzero(has_daylight)[0]
+    group_surface = np.concatenate([
+        np.repeat(np.arange(unique_count), len(daylight_days)),
+        np.repeat(np.arange(unique_count), len(daylight_days)),
+        target_index[~north] % unique_count,
+        np.repeat(np.arange(unique_count), north_count),
+    ])
+    group_day = np.concatenate([
+        np.tile(daylight_days, unique_count), np.tile(daylight_days, unique_count), day_index[~north],
+        np.tile(day_index[north], unique_count),
+    ])
+    boundary = np.concatenate([
+        np.tile(sunrise[daylight_days], unique_count), np.tile(sunset[daylight_days], unique_count), hours[~north],
+        np.tile(hours[north], unique_count),
+    ])
+    order = np.lexsort((boundary, group_day, group_surface))
+    group_surface, group_day, boundary = group_surface[order], group_day[order], boundary[order]
+
+    # every pair of consecutive boundaries in the same group is a segment which is either entirely lit or unlit
+    same_group = (group_surface[1:] == group_surface[:-1]) & (group_day[1:] == group_day[:-1])
+    segment_surface = group_surface[:-1][same_group]
+    segment_day = group_day[:-1][same_group]
+    segment_start = boundary[:-1][same_group]
+    segment_end = boundary[1:][same_group]
+    middle = (segment_start + segment_end) / 2
+    azimuth = _azimuth_degrees(site, daylight_savings_on, middle, parameters.declination[segment_day],
+                               parameters.equation_of_time[segment_day])
+    in_front = np.abs(azimuth - unique_degrees[segment_surface]) <= 90
+    lit = in_front & (middle > sunrise[segment_day]) & (middle < sunset[segment_day]) & (segment_end > segment_start)
+    segment_surface, segment_day = segment_surface[lit], segment_day[lit]
+    segment_start, segment_end = segment_start[lit], segment_end[lit]
+
+    # join lit segments which touch, which happens when a limit is grazed without the sun leaving the front
+    continues = np.zeros(len(segment_start), dtype=bool)
+    continues[1:] = (segment_surface[1:] == segment_surface[:-1]) & (segment_day[1:] == segment_day[:-1]) & (
+        segment_start[1:] == segment_end[:-1])
+    first = np.nonzero(~continues)[0]
+    last = np.append(first[1:] - 1, len(segment_start) - 1).astype(np.int64) if len(first) else first
+    window_end = segment_end[last]
+    window_surface = segment_surface[first]
+    window_day = segment_day[first]
+    window_start = segment_start[first]
+
+    # expand from unique azimuths back out to every requested surface
+    surface_index = []
+    window_index = []
+    for unique_index in range(unique_count):
+        windows = np.nonzero(window_surface == unique_index)[0]
+        for surface in np.nonzero(surface_to_unique == unique_index)[0]:
+            surface_index.append(np.full(len(windows), surface))
+            window_index.append(windows)
+    surface_index = np.concatenate(surface_index) if surface_index else np.empty(0, dtype=np.int64)
+    window_index = np.concatenate(window_index) if window_index else np.empty(0, dtype=np.int64)
+    order = np.lexsort((window_start[window_index] + 24.0 * window_day[window_index], surface_index))
+    surface_index, window_index = surface_index[order], window_index[order]
+    dates = parameters.dates[window_day[window_index]]
+    return SurfaceWindows(
+        surface_index, dates, _to_time_stamps(dates, window_start[window_index]),
+        _to_time_stamps(dates, window_end[window_index])
+    )
@@ -0,0 +1,139 @@
+import numpy as np
+
+from solar_angles import batch, irradiance
+from solar_angles.solar import Angular, Site
+
+# Zone exposure matrices for building load engines.
+# A building is described as a flat list of surfaces, each belonging to a zone, with an azimuth, an optional tilt and
+# an area.  The sun position is calculated once per time stamp for the whole building, the incident direct radiation
+# is evaluated for every surface at once as a (time stamps, surfaces) array, and the surfaces are summed into their
+# zones with a single matrix product against an area-weighted (surfaces, zones) membership matrix.
+# Every surface goes through irradiance.surface_cos_incidence, and a surface without a tilt is a vertical wall, the
+# same as a tilt of 90 degrees.  Vertical walls follow solar.direct_radiation_on_surface, including its cut-off from
+# the raw difference of the solar and surface azimuth, and other tilts use the full tilted surface geometry.
+# As in batch.direct_radiation_on_surface, time stamps where the sun is down or behind a surface contribute zero.
+
+
+class Surface:
+    """
+    This class describes one exterior surface of a building.
+
+    >>> south_window = Surface('south window', 'office', Angular(degrees=180), area=4.5)
+    >>> skylight = Surface('skylight', 'atrium', 180, tilt=10, area=12)
+    """
+
+    __slots__ = ('name', 'zone', 'azimuth', 'tilt', 'area')
+
+    def __init__(self, name: str, zone: str, azimuth, tilt=None, area: float = 1.0):
+        """
+        Constructor for the class.
+
+        :param name: A name for the surface
+        :param zone: The name of the zone the surface belongs to
+        :param azimuth: [CW from North] The direction of the outward facing normal, as an Angular or in degrees
+        :param tilt: [from horizontal] The tilt of the surface, as an Angular or in degrees, or None for a vertical
+                     wall, which is the same as a tilt of 90 degrees
+        :param area: The surface area, in any units; the zone results are area-weighted sums
+        """
+        if isinstance(azimuth, Angular) and not azimuth.valued:
+            raise ValueError("Invalid azimuth for Surface, must be a valid Angular object")
+        if area < 0:
+            raise ValueError("Surface area must not be negative")
+        self.name = name
+        self.zone = zone
+        self.azimuth = azimuth
+        self.tilt = tilt
+        self.area = area
+
+
+class ExposureMatrix:
+    """
+    This class holds the incident direct radiation of every zone of a building for a series of time stamps.
+
+    The values member is shaped (zones, time stamps), in the irradiation units times the area units, and the zones
+    member lists the zone names in row order, in the order they first appear in the surface list.
+    If requested, the surface_values member holds the per-surface irradiation (before the area weighting), shaped
+    (time stamps, surfaces); otherwise it is None.
+    """
+
+    __slots__ = ('zones', 'time_stamps', 'values', 'surface_values')
+
+    def __init__(self, zones: list, time_stamps: np.ndarray, values: np.ndarray, surface_values: np.ndarray = None):
+        self.zones = zones
+        self.time_stamps = time_stamps
+        self.values = values
+        self.surface_values = surface_values
+
+    def for_zone(self, zone: str) -> np.ndarray:
+        """
+        Looks up the row of one zone.
+
+        :param zone: The zone name
+        :returns: The incident direct radiation of the zone for every time stamp
+        """
+        return self.values[self.zones.index(zone)]
+
+
+def zone_membership(surfaces) -> tuple:
+    """
+    Builds the area-weighted matrix which sums surface values into zone values.
+
+    :param surfaces: A sequence of Surface instances
+    :returns: A tuple of the zone names, and a (surfaces, zones) matrix holding each surface area in the column of its
+              zone
+    """
+    zones = list(dict.fromkeys(surface.zone for surface in surfaces))
+    membership = np.zeros((len(surfaces), len(zones)))
+    columns = {zone: column for column, zone in enumerate(zones)}
+    for row, surface in enumerate(surfaces):
+        membership[row, columns[surface.zone]] = surface.area
+    return zones, membership
+
+
+def surface_irradiation(positions: batch.SolarPositionSeries, surfaces, direct_irradiation) -> np.ndarray:
+    """
+    Calculates the incident direct radiation on every surface for every time stamp of a sun position series.
+
+    :param positions: The sun positions, as returned from :func:`solar_angles.batch.solar_position_series`
+    :param surfaces: A sequence of Surface instances
+    :param direct_irradiation: The direct irradiation, as a single value or an array matching the time stamps, in any
+                               units; like the horizontal_direct_irradiation of
+                               :func:`solar_angles.batch.direct_radiation_on_surface`, it is multiplied by the cosine of
+                               the angle of incidence
+    :returns: An array shaped (time stamps, surfaces), in the units of the irradiation
+    """
+    irradiation = np.broadcast_to(np.asarray(direct_irradiation, dtype=np.float64), (len(positions),))
+    if not surfaces:
+        return np.zeros((len(positions), 0))
+    cos_theta = irradiance.surface_cos_incidence(
+        positions, [surface.azimuth for surface in surfaces],
+        [90.0 if surface.tilt is None else surface.tilt for surface in surfaces])
+    return cos_theta * irradiation[:, np.newaxis]
+
+
+def exposure_matrix(site: Site, surfaces, time_stamps, direct_irradiation, daylight_savings_on=False,
+                    keep_surface_values: bool = False) -> ExposureMatrix:
+    """
+    Calculates the zone by time stamp matrix of incident direct radiation for a building.
+    This is the bulk equivalent of calling :func:`solar_angles.solar.direct_radiation_on_surface` for every surface
+    and every time stamp, and summing the area-weighted results by zone.
+
+    :param site: The location of the building
+    :param surfaces: A sequence of Surface instances
+    :param time_stamps: A sequence of datetime.datetime instances, or an array of datetime64 values, in local clock time
+    :param direct_irradiation: The direct irradiation, as a single value or an array matching the time stamps
+    :param daylight_savings_on: A flag, or an array of flags matching the time stamps, if the clock time is a daylight
+                                savings number.  If True, the hour is decremented.
+    :param keep_surface_values: If True, the per-surface irradiation is kept in the result as well
+
+    :returns: [ExposureMatrix] The zone results, shaped (zones, time stamps)
+    """
+    surfaces = list(surfaces)
+    if not surfaces:
+        raise ValueError("At least one surface is needed")
+    positions = batch.solar_position_series(time_stamps, daylight_savings_on, site.longitude, site.standard_meridian,
+                                            site.latitude)
+    values = surface_irradiation(positions, surfaces, direct_irradiation)
+    zones, membership = zone_membership(surfaces)
+    zone_values = np.ascontiguousarray((values @ membership).T)
+    return ExposureMatrix(zones, positions.time_stamps, zone_values, values if keep_surface_values else None)
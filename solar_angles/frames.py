@@ -0,0 +1,87 @@
+import numpy as np
+
+from solar_angles import batch
+from solar_angles.solar import Site
+
+# pandas is an optional dependency, only needed for the DataFrame helpers in this module
+try:
+    import pandas as pd
+except ImportError:  # pragma: no cover
+    pd = None
+
+
+def _require_pandas() -> None:
+    if pd is None:  # pragma: no cover
+        raise ImportError("pandas is required for solar_angles.frames; install it with `pip install pandas`")
+
+
+def _surface_names(surface_azimuths) -> dict:
+    if isinstance(surface_azimuths, dict):
+        return dict(surface_azimuths)
+    surfaces = {}
+    for surface in surface_azimuths:
+        degrees = float(batch.to_degrees(surface, 'surface_azimuths'))
+        name = f"{degrees:g}"
+        if name in surfaces:
+            raise ValueError(f"More than one surface would be named {name!r}; pass a dictionary of names instead")
+        surfaces[name] = surface
+    return surfaces
+
+
+def local_standard_clock(index, site: Site) -> np.ndarray:
+    """
+    Converts a pandas DatetimeIndex into local standard clock times for the site.
+
+    A timezone-aware index is converted through UTC using the site's standard meridian, so the result never includes
+    daylight savings and can be passed along with daylight_savings_on=False.
+    A naive index is assumed to already be in local clock time, and is returned unchanged.
+
+    :param index: A pandas DatetimeIndex
+    :param site: The location, whose standard meridian defines the local standard time
+    :returns: A datetime64 array of local clock times
+    """
+    _require_pandas()
+    if index.tz is None:
+        return index.values
+    utc = index.tz_convert('UTC').tz_localize(None)
+    offset = pd.to_timedelta(4.0 * site.standard_meridian.degrees, unit='min')
+    return (utc - offset).values
+
+
+def solar_dataframe(index, site: Site, surface_azimuths=None, daylight_savings_on=False):
+    """
+    Calculates the sun position, and optionally the angle of incidence on a set of surfaces, for every entry of a
+    pandas DatetimeIndex in a single vectorized pass, and returns the result as a DataFrame on the same index.
+
+    This replaces calling the scalar functions row by row through DataFrame.apply.
+
+    :param index: A pandas DatetimeIndex.  If it is timezone-aware, it is converted to local standard time using the
+                  site's standard meridian, and daylight_savings_on is ignored.  If it is naive, it is taken as local
+                  clock time, just like the datetime arguments to the scalar functions.
+    :param site: The location to calculate for
+    :param surface_azimuths: [CW from North] Optional surfaces to calculate the angle of incidence for, either as a
+                             dictionary of column suffix to azimuth, or as a sequence of azimuths, which are then
+                             named by their value in degrees, which must then be distinct.  Azimuths may be Angular
+                             instances or numbers in degrees.
+    :param daylight_savings_on: For a naive index only, a flag or array of flags if the clock time is a daylight
+                                savings number.
+
+    :returns: A DataFrame with columns 'hour_angle', 'altitude', 'azimuth', 'declination' in degrees,
+              'equation_of_time' in minutes, and one 'incidence_<name>' column in degrees for each surface.
+              Values that the scalar functions report as unvalued (sun down, or behind the surface) are NaN.
+    """
+    _require_pandas()
+    if index.tz is not None:
+        daylight_savings_on = False
+    clock = local_standard_clock(index, site)
+    positions = batch.solar_position_series(
+        clock, daylight_savings_on, site.longitude, site.standard_meridian, site.latitude
+    )
+    columns = positions.as_dict()
+    del columns['time_stamp']
+    if surface_azimuths is not None:
+        surfaces = _surface_names(surface_azimuths)
+        incidence = np.degrees(batch.solar_angle_of_incidence(positions, list(surfaces.values())))
+        for column, name in enumerate(surfaces):
+            columns[f"incidence_{name}"] = incidence[:, column]
+    return pd.DataFrame(columns, index=index)
@@ -0,0 +1,174 @@
+import math
+import time
+from datetime import datetime, timedelta
+
+from solar_angles import solar
+from solar_angles.solar import Angular
+
+# A fused pure-Python sun position kernel, for environments where NumPy is not available.
+# The scalar functions in solar.py are the readable reference, but each one re-validates its Angular arguments,
+# recomputes the day of year and the hour angle of the functions it chains to, and builds Angular instances for every
+# intermediate result, so the angle of incidence alone goes through the whole chain three times.
+# Here everything is computed once, in one function, from plain floats:
+#   - the sine and cosine of the declination and the equation of time in hours are tabulated per day of year (from
+#     the same 360/365 based tables as solar.py) when the module is imported,
+#   - the day of year comes from a table of month start days, rather than datetime.timetuple,
+#   - the site terms (the longitude correction, the sine and cosine of the latitude, and the surface azimuth) are
+#     worked out once by site_kernel, and the returned function closes over them, with the math functions bound to
+#     local names,
+#   - the results are returned as a tuple of floats in radians, with NaN for an undefined value, as in kernels.py.
+# The formulation follows solar.py exactly, including the wall azimuth cut-off from the raw difference of the solar
+# and surface azimuths, so the results agree with the chained functions to floating point round-off.
+# Run `python -m solar_angles.fused` for a timing comparison with the chained functions.
+
+DEFAULT_BENCHMARK_COUNT = 20000
+
+_NAN = float('nan')
+_TWO_PI = 2 * math.pi
+_HOURS_TO_RADIANS = math.radians(15.0)
+_SIN_DECLINATION = tuple(math.sin(x) for x in solar._DECLINATION_RADIANS)
+_COS_DECLINATION = tuple(math.cos(x) for x in solar._DECLINATION_RADIANS)
+_EQUATION_OF_TIME_HOURS = tuple(x / 60.0 for x in solar._EQUATION_OF_TIME_MINUTES)
+# days before the first of each month, indexed by month (index 0 unused), for common and leap years
+_MONTH_START_DAYS = (
+    (0, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334),
+    (0, 0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335),
+)
+
+
+def site_kernel(longitude_degrees: float, standard_meridian_degrees: float, latitude_degrees: float,
+                surface_azimuth_degrees: float = None):
+    """
+    Builds a sun position function for one site, and optionally one wall, with the site terms worked out up front.
+
+    >>> position = site_kernel(105.2, 105, 39.75, 180)
+    >>> hour, altitude, azimuth, incidence = position(datetime(2001, 7, 21, 12, 30), False)
+
+    :param longitude_degrees: [degrees west] The longitude west of the prime meridian
+    :param standard_meridian_degrees: [degrees west] The local standard meridian west of the prime meridian
+    :param latitude_degrees: [degrees north] The local latitude north of the equator
+    :param surface_azimuth_degrees: [degrees CW from North] The outward facing normal of a vertical wall, or None
+                                    if no angle of incidence is needed
+    :returns: A function taking a datetime.datetime in local clock time and a daylight savings flag, and returning a
+              tuple of the hour angle, altitude, azimuth and angle of incidence, in radians.  The azimuth is NaN when
+              the sun is down, and the angle of incidence is NaN when the sun is down or behind the wall, or when no
+              wall was given.
+    """
+    clock_offset_hours = -4 * (longitude_degrees - standard_meridian_degrees) / 60.0 - 12
+    latitude_radians = math.radians(latitude_degrees)
+    sin_latitude = math.sin(latitude_radians)
+    cos_latitude = math.cos(latitude_radians)
+    has_surface = surface_azimuth_degrees is not None
+    surface_radians = math.radians(surface_azimuth_degrees % 360) if has_surface else 0.0
+    month_start_days = _MONTH_START_DAYS
+    sin_declinations = _SIN_DECLINATION
+    cos_declinations = _COS_DECLINATION
+    eot_hours = _EQUATION_OF_TIME_HOURS
+    hours_to_radians = _HOURS_TO_RADIANS
+    two_pi = _TWO_PI
+    half_pi = 0.5 * math.pi
+    nan = _NAN
+    sin, cos, asin, acos, atan2 = math.sin, math.cos, math.asin, math.acos, math.atan2
+
+    def position(time_stamp: datetime, daylight_savings_on: bool) -> tuple:
+        year = time_stamp.year
+        leap = 1 if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0) else 0
+        day = month_start_days[leap][time_stamp.month] + time_stamp.day
+        civil_hour = time_stamp.hour - 1 if daylight_savings_on else time_stamp.hour
+        hour_radians = hours_to_radians * (civil_hour + time_stamp.minute / 60.0 + time_stamp.second / 3600.0
+                                           + clock_offset_hours + eot_hours[day])
+        sin_declination = sin_declinations[day]
+        cos_declination = cos_declinations[day]
+        cos_hour = cos(hour_radians)
+        altitude = asin(cos_latitude * cos_declination * cos_hour + sin_latitude * sin_declination)
+        if altitude < 0:
+            return hour_radians, altitude, nan, nan
+        east = -sin(hour_radians) * cos_declination
+        north = sin_declination * cos_latitude - cos_declination * sin_latitude * cos_hour
+        azimuth = atan2(east, north) % two_pi
+        if not has_surface:
+            return hour_radians, altitude, azimuth, nan
+        wall_azimuth = azimuth - surface_radians
+        if wall_azimuth > half_pi or wall_azimuth < -half_pi:
+            return hour_radians, altitude, azimuth, nan
+        return hour_radians, altitude, azimuth, acos(cos(altitude) * cos(wall_azimuth))
+
+    return position
+
+
+def solar_position(time_stamp: datetime, daylight_savings_on: bool, longitude_degrees: float,
+                   standard_meridian_degrees: float, latitude_degrees: float,
+                   surface_azimuth_degrees: float = None) -> tuple:
+    """
+    Calculates the sun position for a single time stamp with the fused kernel.
+    For many time stamps at one site, build the function once with :func:`site_kernel` instead.
+
+    :param time_stamp: The current date and time, in local clock time
+    :param daylight_savings_on: A flag if the current time is a daylight savings number.
+                                If True, the hour is decremented.
+    :param longitude_degrees: [degrees west] The longitude west of the prime meridian
+    :param standard_meridian_degrees: [degrees west] The local standard meridian west of the prime meridian
+    :param latitude_degrees: [degrees north] The local latitude north of the equator
+    :param surface_azimuth_degrees: [degrees CW from North] The outward facing normal of a vertical wall, or None
+
+    :returns: A tuple of the hour angle, altitude, azimuth and angle of incidence in radians, as for
+              :func:`site_kernel`
+    """
+    return site_kernel(longitude_degrees, standard_meridian_degrees, latitude_degrees,
+                       surface_azimuth_degrees)(time_stamp, daylight_savings_on)
+
+
+def _chained_position(time_stamp: datetime, daylight_savings_on: bool, location: tuple, surface: Angular) -> tuple:
+    # the same four values from the individual functions in solar.py, as a caller would assemble them
+    hour = solar.hour_angle(time_stamp, daylight_savings_on, *location[:2]).radians
+    altitude = solar.altitude_angle(time_stamp, daylight_savings_on, *location).radians
+    azimuth = solar.azimuth_angle(time_stamp, daylight_savings_on, *location).radians
+    incidence = solar.solar_angle_of_incidence(time_stamp, daylight_savings_on, *location, surface).radians
+    return hour, altitude, azimuth, incidence
+
+
+def benchmark(count: int = DEFAULT_BENCHMARK_COUNT, repeat: int = 3) -> dict:
+    """
+    Times the fused kernel against the chained functions in solar.py, over a year of evenly spaced time stamps for
+    Golden, CO and a south facing wall.
+
+    :param count: The number of time stamps
+    :param repeat: Each variant is run this many times and the fastest run is reported
+    :returns: A dictionary of variant name to seconds per call, with the 'speedup' of the site kernel over the
+              chained functions
+    """
+    step = timedelta(seconds=365 * 86400 // max(count, 1))
+    stamps = [datetime(2001, 1, 1) + i * step for i in range(count)]
+    location = (Angular(degrees=105.2), Angular(degrees=105), Angular(degrees=39.75))
+    surface = Angular(degrees=180)
+    kernel = site_kernel(105.2, 105, 39.75, 180)
+    variants = {
+        'chained': lambda dt: _chained_position(dt, False, location, surface),
+        'solar_position': lambda dt: solar.solar_position(dt, False, *location),
+        'fused': lambda dt: solar_position(dt, False, 105.2, 105, 39.75, 180),
+        'site_kernel': lambda dt: kernel(dt, False),
+    }
+    results = {}
+    for name, evaluate in variants.items():
+        seconds = float('inf')
+        for _ in range(max(repeat, 1)):
+            began = time.perf_counter()
+            for dt in stamps:
+                evaluate(dt)
+            seconds = min(seconds, time.perf_counter() - began)
+        results[name] = seconds / max(count, 1)
+    results['speedup'] = results['chained'] / results['site_kernel']
+    return results
+
+
+def main() -> int:  # pragma: no cover - exercised from the command line
+    results = benchmark()
+    for name, seconds in results.items():
+        if name != 'speedup':
+            print(f"{name}: {seconds * 1e6:.2f} microseconds per call")
+    print(f"site kernel speedup over the chained functions: {results['speedup']:.1f}x")
+    return 0
+
+
+if __name__ == '__main__':  # pragma: no cover
+    raise SystemExit(main())
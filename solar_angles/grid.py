@@ -0,0 +1,125 @@
+from pathlib import Path
+
+import numpy as np
+
+from solar_angles import batch, irradiance
+
+# Sun position over a spatial grid of latitudes and longitudes, for building solar resource maps.
+# The declination and equation of time only depend on the time stamp, so they are calculated once per time stamp and
+# broadcast over the whole grid; the grid itself is never expanded into Angular instances or per-cell calls.
+# Results are written one time stamp at a time into caller-supplied (or allocated) arrays shaped
+# (time stamps, rows, columns), which may be numpy.memmap instances so that large maps go straight to disk.
+# As in batch.py, angles are in radians, and values that are undefined (sun down, or behind the surface) are NaN.
+# The angle of incidence comes from irradiance.surface_incidence_angle, so a vertical surface follows the scalar
+# library, including its cut-off from the raw difference of the solar and surface azimuth, and a surface edge on to
+# the sun has an angle of incidence of 90 degrees rather than NaN.
+
+GRID_OUTPUTS = ('altitude', 'azimuth', 'incidence')
+
+
+class SolarGrid:
+    """
+    This class holds the output arrays of :func:`sun_position_grid`, each shaped (time stamps, rows, columns).
+    The incidence member is None unless a surface orientation was requested.
+    """
+
+    __slots__ = ('altitude', 'azimuth', 'incidence')
+
+    def __init__(self, altitude: np.ndarray, azimuth: np.ndarray, incidence: np.ndarray = None):
+        self.altitude = altitude
+        self.azimuth = azimuth
+        self.incidence = incidence
+
+
+def allocate_outputs(shape: tuple, with_incidence: bool = False, directory=None, dtype=np.float64) -> SolarGrid:
+    """
+    Allocates output arrays for :func:`sun_position_grid`.
+
+    :param shape: The output shape, (time stamps, rows, columns)
+    :param with_incidence: If True, an incidence array is allocated as well
+    :param directory: If given, each array is created as a memory-mapped .npy file in this directory, named after the
+                      output (altitude.npy, azimuth.npy, incidence.npy), instead of in memory
+    :param dtype: The floating point type of the arrays
+    :returns: [SolarGrid] The empty output arrays
+    """
+    arrays = {}
+    for name in GRID_OUTPUTS:
+        if name == 'incidence' and not with_incidence:
+            arrays[name] = None
+        elif directory is None:
+            arrays[name] = np.empty(shape, dtype=dtype)
+        else:
+            arrays[name] = np.lib.format.open_memmap(Path(directory) / f"{name}.npy", mode='w+', dtype=dtype,
+                                                     shape=shape)
+    return SolarGrid(arrays['altitude'], arrays['azimuth'], arrays['incidence'])
+
+
+def _grid_degrees(latitudes, longitudes) -> tuple:
+    latitude_degrees = batch.to_degrees(latitudes, 'latitudes')
+    longitude_degrees = batch.to_degrees(longitudes, 'longitudes')
+    if latitude_degrees.ndim == 1 and longitude_degrees.ndim == 1:
+        # axis vectors: latitudes down the rows, longitudes across the columns, broadcast rather than meshed
+        return latitude_degrees[:, np.newaxis], longitude_degrees[np.newaxis, :]
+    if latitude_degrees.ndim == 2 and latitude_degrees.shape == longitude_degrees.shape:
+        return latitude_degrees, longitude_degrees
+    raise ValueError("latitudes and longitudes must be two 1-D axis vectors or two 2-D arrays of the same shape")
+
+
+def sun_position_grid(time_stamps, daylight_savings_on, latitudes, longitudes, standard_meridian,
+                      surface_azimuth=None, surface_tilt=90.0, out: SolarGrid = None) -> SolarGrid:
+    """
+    Calculates the solar altitude and azimuth, and optionally the angle of incidence on a fixed surface orientation,
+    over a grid of locations for one or more time stamps.
+
+    :param time_stamps: A datetime.datetime, a sequence of them, or an array of datetime64 values, in local clock time
+    :param daylight_savings_on: A flag if the clock times are daylight savings numbers.
+                                If True, the hour is decremented.
+    :param latitudes: [north] Either a 1-D vector of row latitudes, or a 2-D array of cell latitudes, in degrees
+    :param longitudes: [west] Either a 1-D vector of column longitudes, or a 2-D array of cell longitudes, in degrees
+    :param standard_meridian: [west] The standard meridian for the clock time, as an Angular or in degrees.  A 2-D array
+                              matching the grid may be given when the grid spans several time zones.
+    :param surface_azimuth: [CW from North] If given, the incidence angle on a surface with this azimuth is calculated,
+                            as an Angular or in degrees
+    :param surface_tilt: [from horizontal] The tilt of that surface, as an Angular or in degrees; 90 is vertical
+    :param out: Preallocated output arrays, for example from :func:`allocate_outputs`, which may be memory-mapped.
+                If None, in-memory arrays are allocated.
+
+    :returns: [SolarGrid] The output arrays, shaped (time stamps, rows, columns), in radians
+    """
+    latitude_degrees, longitude_degrees = _grid_degrees(latitudes, longitudes)
+    grid_shape = np.broadcast_shapes(latitude_degrees.shape, longitude_degrees.shape)
+    standard_meridian_degrees = batch.to_degrees(standard_meridian, 'standard_meridian')
+    stamps = np.atleast_1d(batch.to_datetime64(time_stamps))
+    shape = (len(stamps),) + grid_shape
+    if out is None:
+        out = allocate_outputs(shape, with_incidence=surface_azimuth is not None)
+    if out.altitude.shape != shape or out.azimuth.shape != shape:
+        raise ValueError(f"Output arrays must be shaped {shape}")
+    if surface_azimuth is not None and (out.incidence is None or out.incidence.shape != shape):
+        raise ValueError(f"An incidence output array shaped {shape} is needed when surface_azimuth is given")
+
+    latitude_radians = np.radians(latitude_degrees)
+    days = batch.day_of_year(stamps)
+    hours = batch.clock_hours(stamps)
+    eot_minutes = batch.equation_of_time(days)
+    declination_radians = batch.declination_angle(days)
+    if surface_azimuth is not None:
+        surface_azimuth_degrees = batch.to_degrees(surface_azimuth, 'surface_azimuth')
+        surface_tilt_degrees = batch.to_degrees(surface_tilt, 'surface_tilt')
+    for index in range(len(stamps)):
+        hour_radians = batch.hour_angle(hours[index], daylight_savings_on, eot_minutes[index], longitude_degrees,
+                                        standard_meridian_degrees)
+        altitude = batch.altitude_angle(hour_radians, declination_radians[index], latitude_radians)
+        azimuth = batch.azimuth_angle(hour_radians, declination_radians[index], latitude_radians, altitude)
+        out.altitude[index] = altitude
+        out.azimuth[index] = azimuth
+        if surface_azimuth is not None:
+            positions = batch.SolarPositionSeries(stamps[index], hour_radians, altitude, azimuth,
+                                                  declination_radians[index], eot_minutes[index])
+            out.incidence[index] = irradiance.surface_incidence_angle(positions, surface_azimuth_degrees,
+                                                                      surface_tilt_degrees)[..., 0]
+    if isinstance(out.altitude, np.memmap):
+        for array in (out.altitude, out.azimuth, out.incidence):
+            if array is not None:
+                array.flush()
+    return out
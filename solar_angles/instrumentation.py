@@ -0,0 +1,259 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# This is an opt-in profiling layer for the functions in solar.py.
+# When it is disabled, nothing in solar.py is touched, so there is zero overhead on the normal code path.
+# When it is enabled, the public functions in the solar module namespace are swapped for thin wrappers that count
+# calls and accumulate wall time, and the Angular constructor and its from_radians / from_degrees fast paths are
+# wrapped to count allocations.
+# Because the chained functions in solar.py look each other up through the module namespace, the nested calls
+# (azimuth_angle -> altitude_angle -> hour_angle -> ...) are counted as well.
+# NOTE: Names imported with `from solar_angles.solar import x` *before* enabling keep pointing at the raw functions.
+#       Setting the environment variable below enables instrumentation while solar.py is imported, avoiding this.
+
+ENVIRONMENT_VARIABLE = 'SOLAR_ANGLES_PROFILE'
+
+INSTRUMENTED_FUNCTIONS = (
+    'day_of_year',
+    'equation_of_time',
+    'declination_angle',
+    'local_civil_time',
+    'local_solar_time',
+    'hour_angle',
+    'altitude_angle',
+    'azimuth_angle',
+    'wall_azimuth_angle',
+    'solar_angle_of_incidence',
+    'direct_radiation_on_surface',
+    'solar_position',
+)
+
+
+class Counters:
+    """
+    This class holds the accumulated instrumentation data.
+
+    Function statistics are stored per function name as call counts and cumulative seconds, where the cumulative time
+    of a function includes the time spent in any nested solar functions it calls.
+    Cache statistics are stored per cache name as hit and miss counts; caches report into these through
+    :func:`record_cache_access`.
+    All updates are guarded by a lock so that counters can be shared by multiple threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = {}
+        self.cumulative_seconds = {}
+        self.cache_hits = {}
+        self.cache_misses = {}
+        self.angular_allocations = 0
+
+    def reset(self) -> None:
+        """
+        Clears all the accumulated counts.
+        """
+        with self._lock:
+            self.calls = {}
+            self.cumulative_seconds = {}
+            self.cache_hits = {}
+            self.cache_misses = {}
+            self.angular_allocations = 0
+
+    def record_call(self, function_name: str, seconds: float) -> None:
+        with self._lock:
+            self.calls[function_name] = self.calls.get(function_name, 0) + 1
+            self.cumulative_seconds[function_name] = self.cumulative_seconds.get(function_name, 0.0) + seconds
+
+    def record_cache(self, cache_name: str, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.cache_hits[cache_name] = self.cache_hits.get(cache_name, 0) + 1
+            else:
+                self.cache_misses[cache_name] = self.cache_misses.get(cache_name, 0) + 1
+
+    def record_allocation(self) -> None:
+        with self._lock:
+            self.angular_allocations += 1
+
+    def as_dict(self) -> dict:
+        """
+        Exports a snapshot of the counters as plain Python data.
+
+        :returns: A dictionary with keys 'functions', 'caches' and 'angular_allocations'.
+                  Each function entry holds 'calls' and 'cumulative_seconds'; each cache entry holds 'hits', 'misses'
+                  and 'hit_rate', where the hit rate is None if the cache has not been accessed.
+        """
+        with self._lock:
+            functions = {
+                name: {'calls': count, 'cumulative_seconds': self.cumulative_seconds[name]}
+                for name, count in self.calls.items()
+            }
+            caches = {}
+            for name in sorted(set(self.cache_hits) | set(self.cache_misses)):
+                hits = self.cache_hits.get(name, 0)
+                misses = self.cache_misses.get(name, 0)
+                total = hits + misses
+                caches[name] = {'hits': hits, 'misses': misses, 'hit_rate': hits / total if total else None}
+            return {'functions': functions, 'caches': caches, 'angular_allocations': self.angular_allocations}
+
+    def to_prometheus(self, prefix: str = 'solar_angles') -> str:
+        """
+        Exports a snapshot of the counters in the Prometheus text exposition format.
+
+        :param prefix: The prefix to apply to each metric name.
+        :returns: The metrics as a newline terminated string, ready to be served from a /metrics endpoint.
+        """
+        snapshot = self.as_dict()
+        lines = [
+            f"# HELP {prefix}_calls_total Number of calls to each solar function.",
+            f"# TYPE {prefix}_calls_total counter",
+        ]
+        for name, stats in sorted(snapshot['functions'].items()):
+            lines.append(f'{prefix}_calls_total{{function="{name}"}} {stats["calls"]}')
+        lines.append(f"# HELP {prefix}_call_seconds_total Cumulative wall time spent in each solar function.")
+        lines.append(f"# TYPE {prefix}_call_seconds_total counter")
+        for name, stats in sorted(snapshot['functions'].items()):
+            lines.append(f'{prefix}_call_seconds_total{{function="{name}"}} {stats["cumulative_seconds"]!r}')
+        lines.append(f"# HELP {prefix}_cache_hits_total Number of cache hits for each cache.")
+        lines.append(f"# TYPE {prefix}_cache_hits_total counter")
+        for name, stats in snapshot['caches'].items():
+            lines.append(f'{prefix}_cache_hits_total{{cache="{name}"}} {stats["hits"]}')
+        lines.append(f"# HELP {prefix}_cache_misses_total Number of cache misses for each cache.")
+        lines.append(f"# TYPE {prefix}_cache_misses_total counter")
+        for name, stats in snapshot['caches'].items():
+            lines.append(f'{prefix}_cache_misses_total{{cache="{name}"}} {stats["misses"]}')
+        lines.append(f"# HELP {prefix}_angular_allocations_total Number of Angular instances constructed.")
+        lines.append(f"# TYPE {prefix}_angular_allocations_total counter")
+        lines.append(f"{prefix}_angular_allocations_total {snapshot['angular_allocations']}")
+        return '\n'.join(lines) + '\n'
+
+
+counters = Counters()
+_original_functions = {}
+_original_angular_init = None
+_ANGULAR_FACTORIES = ('from_radians', 'from_degrees')
+_original_angular_factories = {}
+
+
+def _wrap(function_name: str, function):
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            counters.record_call(function_name, time.perf_counter() - start)
+    return wrapper
+
+
+def is_enabled() -> bool:
+    """
+    Reports whether the instrumentation wrappers are currently installed.
+
+    :returns: True if enabled, False otherwise
+    """
+    return _original_angular_init is not None
+
+
+def enable() -> None:
+    """
+    Installs the instrumentation wrappers on the solar module functions and the Angular constructor.
+    Calling this while already enabled does nothing.
+    """
+    global _original_angular_init
+    if is_enabled():
+        return
+    from solar_angles import solar  # imported here since solar.py imports this module to honor the environment
+    for function_name in INSTRUMENTED_FUNCTIONS:
+        original = getattr(solar, function_name)
+        _original_functions[function_name] = original
+        setattr(solar, function_name, _wrap(function_name, original))
+    _original_angular_init = solar.Angular.__init__
+
+    def counting_init(self, *args, **kwargs):
+        counters.record_allocation()
+        _original_angular_init(self, *args, **kwargs)
+
+    solar.Angular.__init__ = counting_init
+    for factory_name in _ANGULAR_FACTORIES:
+        # the class dictionary holds the classmethod object itself, which is what has to be put back on disable
+        original_factory = solar.Angular.__dict__[factory_name]
+        _original_angular_factories[factory_name] = original_factory
+        setattr(solar.Angular, factory_name, classmethod(_counting_factory(original_factory.__func__)))
+
+
+def _counting_factory(factory):
+    @wraps(factory)
+    def wrapper(cls, value):
+        counters.record_allocation()
+        return factory(cls, value)
+    return wrapper
+
+
+def disable() -> None:
+    """
+    Restores the original solar module functions and Angular constructor.
+    The accumulated counters are kept so they can still be exported.
+    Calling this while already disabled does nothing.
+    """
+    global _original_angular_init
+    if not is_enabled():
+        return
+    from solar_angles import solar
+    for function_name, original in _original_functions.items():
+        setattr(solar, function_name, original)
+    _original_functions.clear()
+    solar.Angular.__init__ = _original_angular_init
+    for factory_name, original_factory in _original_angular_factories.items():
+        setattr(solar.Angular, factory_name, original_factory)
+    _original_angular_factories.clear()
+    _original_angular_init = None
+
+
+def record_cache_access(cache_name: str, hit: bool) -> None:
+    """
+    Reports a cache lookup to the counters, so that hit rates can be exported.
+    This is a no-op unless instrumentation is enabled, so caches can call it unconditionally.
+
+    :param cache_name: A name identifying the cache, used as the label in the exported metrics.
+    :param hit: True if the lookup was served from the cache, False if it had to be computed.
+    """
+    if _original_angular_init is not None:
+        counters.record_cache(cache_name, hit)
+
+
+@contextmanager
+def profiling(reset: bool = True):
+    """
+    A context manager which enables instrumentation for the duration of the block, and yields the counters.
+    If instrumentation was already enabled (for example from the environment variable) it is left enabled on exit.
+
+    >>> from solar_angles import solar
+    >>> with profiling() as stats:
+    ...     solar.altitude_angle(dt, False, longitude, standard_meridian, latitude)
+    >>> stats.as_dict()['functions']['altitude_angle']['calls']
+    1
+
+    :param reset: If True, the counters are cleared on entry.
+    """
+    was_enabled = is_enabled()
+    if reset:
+        counters.reset()
+    enable()
+    try:
+        yield counters
+    finally:
+        if not was_enabled:
+            disable()
+
+
+def enabled_from_environment() -> bool:
+    """
+    Checks the environment variable which requests instrumentation at import time.
+
+    :returns: True if the variable is set to anything other than an empty string or 0
+    """
+    return os.environ.get(ENVIRONMENT_VARIABLE, '') not in ('', '0')
@@ -0,0 +1,274 @@
+import numpy as np
+
+from solar_angles import batch
+from solar_angles.batch import SolarPositionSeries
+
+# Transposition models which split the irradiance on a tilted surface into direct (beam), sky diffuse and ground
+# reflected components, evaluated for a whole series of sun positions and a set of surfaces at once.
+# All of them are built on a single SolarPositionSeries, so the sun position is calculated once per time stamp and
+# shared by every surface and every component.
+# The scalar library only handles vertical walls; here surfaces also have a tilt from horizontal, where 90 degrees is
+# a vertical wall (the default) and 0 degrees is a horizontal roof.  Array results are shaped (time stamps, surfaces).
+# Sources:
+#   Hay, J.E. and J.A. Davies.  1980.  Calculations of the solar radiation incident on an inclined surface.
+#   Perez, R., P. Ineichen, R. Seals, J. Michalsky and R. Stewart.  1990.  Modeling daylight availability and
+#       irradiance components from direct and global irradiance.  Solar Energy 44(5).
+#   Kasten, F. and A.T. Young.  1989.  Revised optical air mass tables and approximation formula.  Applied Optics 28.
+
+SOLAR_CONSTANT = 1367.0  # W/m2
+DEFAULT_ALBEDO = 0.2
+MODELS = ('isotropic', 'hay_davies', 'perez')
+
+# Perez 1990 'allsites composite' coefficients, one row per sky clearness bin: F11, F12, F13, F21, F22, F23
+PEREZ_CLEARNESS_BINS = np.array([1.065, 1.230, 1.500, 1.950, 2.800, 4.500, 6.200])
+PEREZ_COEFFICIENTS = np.array([
+    [-0.0083117, 0.5877285, -0.0620636, -0.0596012, 0.0721249, -0.0220216],
+    [0.1299457, 0.6825954, -0.1513752, -0.0189325, 0.0659650, -0.0288748],
+    [0.3296958, 0.4868735, -0.2210958, 0.0554140, -0.0639588, -0.0260542],
+    [0.5682053, 0.1874525, -0.2951290, 0.1088631, -0.1519229, -0.0139754],
+    [0.8730280, -0.3920403, -0.3616149, 0.2255647, -0.4620442, 0.0012448],
+    [1.1326077, -1.2367284, -0.4118494, 0.2877813, -0.8230357, 0.0558225],
+    [1.0601591, -1.5999137, -0.3589221, 0.2642124, -1.1272340, 0.1310694],
+    [0.6777470, -0.3272588, -0.2504286, 0.1561313, -1.3765031, 0.2506212],
+])
+
+
+class IrradianceComponents:
+    """
+    This class holds the plane-of-surface irradiance split into its components.
+    Each member is an array shaped (time stamps, surfaces), in the units of the irradiance inputs.
+    """
+
+    __slots__ = ('direct', 'sky_diffuse', 'ground_reflected')
+
+    def __init__(self, direct: np.ndarray, sky_diffuse: np.ndarray, ground_reflected: np.ndarray):
+        self.direct = direct
+        self.sky_diffuse = sky_diffuse
+        self.ground_reflected = ground_reflected
+
+    @property
+    def diffuse(self) -> np.ndarray:
+        return self.sky_diffuse + self.ground_reflected
+
+    @property
+    def total(self) -> np.ndarray:
+        return self.direct + self.sky_diffuse + self.ground_reflected
+
+
+def _column(values) -> np.ndarray:
+    # irradiance inputs are per time stamp; turn them into a column so they broadcast across surfaces
+    values = np.asarray(values, dtype=np.float64)
+    return values[:, np.newaxis] if values.ndim == 1 else values
+
+
+def extraterrestrial_normal(positions: SolarPositionSeries) -> np.ndarray:
+    """
+    Calculates the extraterrestrial normal irradiance, correcting the solar constant for the earth-sun distance.
+
+    :param positions: The sun positions, as returned from :func:`solar_angles.batch.solar_position_series`
+    :returns: [W/m2] An array with one value per time stamp
+    """
+    days = batch.day_of_year(positions.time_stamps)
+    return SOLAR_CONSTANT * (1 + 0.033 * np.cos(np.radians(360.0 * days / 365.0)))
+
+
+def air_mass(positions: SolarPositionSeries) -> np.ndarray:
+    """
+    Calculates the relative optical air mass with the Kasten and Young formula.
+
+    :param positions: The sun positions, as returned from :func:`solar_angles.batch.solar_position_series`
+    :returns: [dimensionless] An array with one value per time stamp, NaN where the sun is down
+    """
+    zenith_degrees = 90.0 - positions.altitude_degrees
+    with np.errstate(invalid='ignore'):
+        result = 1.0 / (np.cos(np.radians(zenith_degrees)) + 0.50572 * (96.07995 - zenith_degrees) ** -1.6364)
+    return np.where(positions.sun_is_up, result, np.nan)
+
+
+def _cos_incidence(altitude, azimuth_difference, tilt_radians) -> np.ndarray:
+    # the cosine of the angle of incidence on a surface tilted from horizontal, from the sun altitude and the azimuth
+    # of the sun from the surface normal, all in radians; negative with the sun behind the surface
+    return np.sin(altitude) * np.cos(tilt_radians) + np.cos(altitude) * np.sin(tilt_radians) * np.cos(
+        azimuth_difference)
+
+
+def _incidence_radians(cos_theta: np.ndarray) -> np.ndarray:
+    # as in the scalar library, a surface edge on to the sun has an incidence of 90 degrees, and only a sun behind
+    # the surface (or down) is undefined
+    with np.errstate(invalid='ignore'):
+        return np.where(cos_theta >= 0, np.arccos(np.minimum(cos_theta, 1.0)), np.nan)
+
+
+def _signed_cos_incidence(positions: SolarPositionSeries, surface_azimuths, surface_tilts) -> np.ndarray:
+    # the cosine of the angle of incidence before clipping: NaN with the sun down or behind a vertical wall by the
+    # wall cut-off, and negative with the sun behind a tilted surface
+    azimuth_degrees = np.atleast_1d(batch.to_degrees(surface_azimuths, 'surface_azimuths'))
+    tilt_degrees = batch.to_degrees(surface_tilts, 'surface_tilts')
+    azimuth_difference = positions.azimuth[..., np.newaxis] - np.radians(azimuth_degrees)
+    cos_theta = _cos_incidence(positions.altitude[..., np.newaxis], azimuth_difference, np.radians(tilt_degrees))
+    vertical = np.broadcast_to(tilt_degrees == 90, azimuth_degrees.shape)
+    if np.any(vertical):
+        behind = np.isnan(batch._wall_azimuth_radians(positions, azimuth_degrees[vertical]))
+        cos_theta[..., vertical] = np.where(behind, np.nan, cos_theta[..., vertical])
+    return cos_theta
+
+
+def surface_cos_incidence(positions: SolarPositionSeries, surface_azimuths, surface_tilts=90.0) -> np.ndarray:
+    """
+    Calculates the cosine of the solar angle of incidence on tilted surfaces.
+
+    For vertical surfaces this is the cosine of :func:`solar_angles.batch.solar_angle_of_incidence`, including its
+    cut-off from the raw difference of the solar and surface azimuth, so a vertical surface here agrees with the scalar
+    library.  Other tilts, which the scalar library does not cover, take the azimuth difference around the full circle.
+
+    :param positions: The sun positions, as returned from :func:`solar_angles.batch.solar_position_series`.  The arrays
+                      may have any shape; the surfaces are added as a last axis.
+    :param surface_azimuths: [CW from North] A sequence of surface azimuths, as Angular instances or in degrees
+    :param surface_tilts: [from horizontal] The surface tilt(s), as Angular instances or in degrees; 90 is vertical
+    :returns: [dimensionless] An array shaped (time stamps, surfaces), zero where the sun is down or behind the surface
+    """
+    cos_theta = _signed_cos_incidence(positions, surface_azimuths, surface_tilts)
+    return np.nan_to_num(np.clip(cos_theta, 0.0, None), nan=0.0)
+
+
+def surface_incidence_angle(positions: SolarPositionSeries, surface_azimuths, surface_tilts=90.0) -> np.ndarray:
+    """
+    Calculates the solar angle of incidence on tilted surfaces, as :func:`surface_cos_incidence` does its cosine.
+    A surface edge on to the sun has an angle of incidence of 90 degrees, as in
+    :func:`solar_angles.solar.solar_angle_of_incidence`.
+
+    :param positions: The sun positions, as returned from :func:`solar_angles.batch.solar_position_series`
+    :param surface_azimuths: [CW from North] A sequence of surface azimuths, as Angular instances or in degrees
+    :param surface_tilts: [from horizontal] The surface tilt(s), as Angular instances or in degrees; 90 is vertical
+    :returns: [radians] An array shaped (time stamps, surfaces), NaN where the sun is down or behind the surface
+    """
+    return _incidence_radians(_signed_cos_incidence(positions, surface_azimuths, surface_tilts))
+
+
+def sky_view_factor(surface_tilts=90.0) -> np.ndarray:
+    """
+    Calculates the view factor from a tilted surface to the sky dome.
+
+    :param surface_tilts: [from horizontal] The surface tilt(s), as Angular instances or in degrees
+    :returns: [dimensionless] The view factor(s), 1 for a horizontal surface and 0.5 for a vertical one
+    """
+    return (1 + np.cos(np.radians(batch.to_degrees(surface_tilts, 'surface_tilts')))) / 2
+
+
+def ground_reflected(global_horizontal, surface_tilts=90.0, albedo=DEFAULT_ALBEDO) -> np.ndarray:
+    """
+    Calculates the irradiance reflected from an isotropic ground onto tilted surfaces.
+
+    :param global_horizontal: The global horizontal irradiance, one value per time stamp
+    :param surface_tilts: [from horizontal] The surface tilt(s), as Angular instances or in degrees
+    :param albedo: [dimensionless] The ground reflectance, as a single value or one value per time stamp
+    :returns: An array shaped (time stamps, surfaces), in the units of the irradiance input
+    """
+    return _column(global_horizontal) * _column(albedo) * (1 - sky_view_factor(surface_tilts))
+
+
+def isotropic(positions: SolarPositionSeries, surface_azimuths, surface_tilts, diffuse_horizontal) -> np.ndarray:
+    """
+    Calculates the sky diffuse irradiance on tilted surfaces, assuming a uniformly bright sky.
+
+    :param positions: The sun positions; unused by this model, but accepted so that all the models are interchangeable
+    :param surface_azimuths: [CW from North] A sequence of surface azimuths, as Angular instances or in degrees
+    :param surface_tilts: [from horizontal] The surface tilt(s), as Angular instances or in degrees
+    :param diffuse_horizontal: The diffuse horizontal irradiance, one value per time stamp
+    :returns: An array shaped (time stamps, surfaces), in the units of the irradiance input
+    """
+    surface_count = np.atleast_1d(batch.to_degrees(surface_azimuths, 'surface_azimuths')).shape[0]
+    view_factor = np.broadcast_to(sky_view_factor(surface_tilts), (surface_count,))
+    return _column(diffuse_horizontal) * view_factor
+
+
+def _beam_ratio(positions: SolarPositionSeries, cos_theta: np.ndarray) -> np.ndarray:
+    # ratio of the beam on the surface to the beam on the horizontal, with the horizontal limited near the horizon
+    cos_zenith = np.maximum(np.sin(positions.altitude), np.cos(np.radians(85.0)))[:, np.newaxis]
+    return cos_theta / cos_zenith
+
+
+def hay_davies(positions: SolarPositionSeries, surface_azimuths, surface_tilts, diffuse_horizontal,
+               direct_normal) -> np.ndarray:
+    """
+    Calculates the sky diffuse irradiance on tilted surfaces with the Hay and Davies model, which splits the sky
+    into a circumsolar part, weighted by the anisotropy index, and an isotropic remainder.
+
+    :param positions: The sun positions, as returned from :func:`solar_angles.batch.solar_position_series`
+    :param surface_azimuths: [CW from North] A sequence of surface azimuths, as Angular instances or in degrees
+    :param surface_tilts: [from horizontal] The surface tilt(s), as Angular instances or in degrees
+    :param diffuse_horizontal: [W/m2] The diffuse horizontal irradiance, one value per time stamp
+    :param direct_normal: [W/m2] The direct normal irradiance, one value per time stamp
+    :returns: [W/m2] An array shaped (time stamps, surfaces)
+    """
+    cos_theta = surface_cos_incidence(positions, surface_azimuths, surface_tilts)
+    anisotropy = np.where(positions.sun_is_up, np.asarray(direct_normal, dtype=np.float64) /
+                          extraterrestrial_normal(positions), 0.0)[:, np.newaxis]
+    isotropic_part = (1 - anisotropy) * sky_view_factor(surface_tilts)
+    return _column(diffuse_horizontal) * (isotropic_part + anisotropy * _beam_ratio(positions, cos_theta))
+
+
+def perez(positions: SolarPositionSeries, surface_azimuths, surface_tilts, diffuse_horizontal,
+          direct_normal) -> np.ndarray:
+    """
+    Calculates the sky diffuse irradiance on tilted surfaces with the Perez 1990 model, which adds a horizon
+    brightening band to the circumsolar and isotropic parts, with coefficients binned by sky clearness.
+
+    :param positions: The sun positions, as returned from :func:`solar_angles.batch.solar_position_series`
+    :param surface_azimuths: [CW from North] A sequence of surface azimuths, as Angular instances or in degrees
+    :param surface_tilts: [from horizontal] The surface tilt(s), as Angular instances or in degrees
+    :param diffuse_horizontal: [W/m2] The diffuse horizontal irradiance, one value per time stamp
+    :param direct_normal: [W/m2] The direct normal irradiance, one value per time stamp
+    :returns: [W/m2] An array shaped (time stamps, surfaces)
+    """
+    diffuse = np.asarray(diffuse_horizontal, dtype=np.float64)
+    direct = np.asarray(direct_normal, dtype=np.float64)
+    zenith = np.pi / 2 - positions.altitude
+    kappa_zenith = 1.041 * zenith ** 3
+    with np.errstate(invalid='ignore', divide='ignore'):
+        clearness = ((diffuse + direct) / diffuse + kappa_zenith) / (1 + kappa_zenith)
+    brightness = diffuse * air_mass(positions) / extraterrestrial_normal(positions)
+    # an overcast sky (no diffuse, or the sun down) falls into the first bin, and the brightness zeroes the terms
+    valid = positions.sun_is_up & (diffuse > 0)
+    clearness = np.where(valid, clearness, 1.0)
+    brightness = np.where(valid, brightness, 0.0)
+    f11, f12, f13, f21, f22, f23 = PEREZ_COEFFICIENTS[np.digitize(clearness, PEREZ_CLEARNESS_BINS)].T
+    zenith = np.where(valid, zenith, 0.0)
+    circumsolar = np.maximum(0.0, f11 + f12 * brightness + f13 * zenith)[:, np.newaxis]
+    horizon = np.where(valid, f21 + f22 * brightness + f23 * zenith, 0.0)[:, np.newaxis]
+    cos_theta = surface_cos_incidence(positions, surface_azimuths, surface_tilts)
+    tilt_radians = np.radians(batch.to_degrees(surface_tilts, 'surface_tilts'))
+    return _column(diffuse) * (
+        (1 - circumsolar) * sky_view_factor(surface_tilts) + circumsolar * _beam_ratio(positions, cos_theta) +
+        horizon * np.sin(tilt_radians)
+    )
+
+
+def total_irradiance(positions: SolarPositionSeries, surface_azimuths, surface_tilts, global_horizontal,
+                     direct_normal, diffuse_horizontal, albedo=DEFAULT_ALBEDO,
+                     model: str = 'perez') -> IrradianceComponents:
+    """
+    Calculates the direct, sky diffuse and ground reflected irradiance on a set of tilted surfaces, all from one
+    shared sun position series.
+
+    :param positions: The sun positions, as returned from :func:`solar_angles.batch.solar_position_series`
+    :param surface_azimuths: [CW from North] A sequence of surface azimuths, as Angular instances or in degrees
+    :param surface_tilts: [from horizontal] The surface tilt(s), as Angular instances or in degrees; 90 is vertical
+    :param global_horizontal: [W/m2] The global horizontal irradiance, one value per time stamp
+    :param direct_normal: [W/m2] The direct normal irradiance, one value per time stamp
+    :param diffuse_horizontal: [W/m2] The diffuse horizontal irradiance, one value per time stamp
+    :param albedo: [dimensionless] The ground reflectance, as a single value or one value per time stamp
+    :param model: The sky diffuse model, one of 'isotropic', 'hay_davies' or 'perez'
+    :returns: [IrradianceComponents] The component arrays, each shaped (time stamps, surfaces)
+    """
+    if model not in MODELS:
+        raise ValueError(f"Unknown sky diffuse model '{model}', expected one of {MODELS}")
+    direct = _column(direct_normal) * surface_cos_incidence(positions, surface_azimuths, surface_tilts)
+    if model == 'isotropic':
+        sky = isotropic(positions, surface_azimuths, surface_tilts, diffuse_horizontal)
+    elif model == 'hay_davies':
+        sky = hay_davies(positions, surface_azimuths, surface_tilts, diffuse_horizontal, direct_normal)
+    else:
+        sky = perez(positions, surface_azimuths, surface_tilts, diffuse_horizontal, direct_normal)
+    ground = np.broadcast_to(ground_reflected(global_horizontal, surface_tilts, albedo), direct.shape)
+    return IrradianceComponents(direct, sky, ground)
@@ -0,0 +1,180 @@
+import math
+import os
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - depends on the environment
+    numba = None
+
+# Accelerated kernels for the core solar chain: declination -> hour angle -> altitude -> azimuth -> incidence.
+# The kernels are written once, as plain Python on floats using only the math module, in the restricted style that
+# Numba can compile in nopython mode.  When Numba is installed they are compiled with nogil=True, so threads calling
+# into them really do run in parallel; when it is not, exactly the same functions run in the interpreter.
+# The backend is chosen at runtime with set_backend, or through the environment variable below, and defaults to
+# 'numba' when it is available.
+# As in batch.py, angles are returned in radians, and values that solar.py reports as an unvalued Angular (sun down,
+# or sun behind the surface) are returned as NaN.  Surfaces follow the wall azimuth convention of solar.py: a surface
+# sees the sun when the raw difference between the solar and surface azimuths is within +/- 90 degrees.
+
+ENVIRONMENT_VARIABLE = 'SOLAR_ANGLES_BACKEND'
+BACKENDS = ('python', 'numba')
+
+
+def _position(day, hours, daylight_savings_on, longitude_degrees, standard_meridian_degrees, latitude_degrees,
+              surface_azimuth_degrees):
+    day_radians = math.radians((day - 1.0) * (360.0 / 365.0))
+    declination = math.radians(
+        0.3963723 - 22.9132745 * math.cos(day_radians) + 4.0254304 * math.sin(day_radians) - 0.387205 * math.cos(
+            2.0 * day_radians) + 0.05196728 * math.sin(2.0 * day_radians) - 0.1545267 * math.cos(
+            3.0 * day_radians) + 0.08479777 * math.sin(3.0 * day_radians))
+    eot_radians = math.radians((day - 81.0) * (360.0 / 365.0))
+    eot_minutes = 9.87 * math.sin(2 * eot_radians) - 7.53 * math.cos(eot_radians) - 1.5 * math.sin(eot_radians)
+    civil_hours = hours - 1.0 if daylight_savings_on else hours
+    solar_hours = civil_hours - 4 * (longitude_degrees - standard_meridian_degrees) / 60.0 + eot_minutes / 60.0
+    hour = math.radians(15.0 * (solar_hours - 12))
+    latitude = math.radians(latitude_degrees)
+    altitude = math.asin(
+        math.cos(latitude) * math.cos(declination) * math.cos(hour) + math.sin(latitude) * math.sin(declination))
+    if altitude < 0:
+        return hour, altitude, math.nan, math.nan
+    cos_declination = math.cos(declination)
+    azimuth = math.atan2(-math.sin(hour) * cos_declination, math.sin(declination) * math.cos(
+        latitude) - cos_declination * math.sin(latitude) * math.cos(hour)) % (2 * math.pi)
+    wall_azimuth_degrees = math.degrees(azimuth) - surface_azimuth_degrees % 360
+    if wall_azimuth_degrees > 90 or wall_azimuth_degrees < -90:
+        return hour, altitude, azimuth, math.nan
+    incidence = math.acos(math.cos(altitude) * math.cos(math.radians(wall_azimuth_degrees)))
+    return hour, altitude, azimuth, incidence
+
+
+def _make_positions(position):
+    # the series loop is built around whichever element kernel it is given, compiled or not
+    def positions(days, hours, daylight_savings_on, longitude_degrees, standard_meridian_degrees, latitude_degrees,
+                  surface_azimuth_degrees, hour_out, altitude_out, azimuth_out, incidence_out):
+        for index in range(days.shape[0]):
+            hour_out[index], altitude_out[index], azimuth_out[index], incidence_out[index] = position(
+                days[index], hours[index], daylight_savings_on, longitude_degrees, standard_meridian_degrees,
+                latitude_degrees, surface_azimuth_degrees
+            )
+    return positions
+
+
+class _Backend:
+    """
+    This class holds the pair of kernel callables for one backend.
+    """
+
+    __slots__ = ('name', 'position', 'positions')
+
+    def __init__(self, name: str, position, positions):
+        self.name = name
+        self.position = position
+        self.positions = positions
+
+
+_backends = {'python': _Backend('python', _position, _make_positions(_position))}
+_active = None
+
+
+def _numba_backend() -> _Backend:
+    # compiled once, lazily, so importing this module never pays for compilation
+    if 'numba' not in _backends:
+        compiled_position = numba.njit(nogil=True, cache=True)(_position)
+        _backends['numba'] = _Backend('numba', compiled_position,
+                                      numba.njit(nogil=True)(_make_positions(compiled_position)))
+    return _backends['numba']
+
+
+def available_backends() -> tuple:
+    """
+    Lists the kernel backends that can be selected in this environment.
+
+    :returns: A tuple of backend names; 'python' is always available, 'numba' only if Numba is installed
+    """
+    return BACKENDS if numba is not None else ('python',)
+
+
+def set_backend(name: str) -> None:
+    """
+    Selects the kernel backend used by :func:`solar_position` and :func:`solar_positions`.
+    The selection is process wide.
+
+    :param name: One of 'python' or 'numba'
+    """
+    global _active
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown kernel backend {name!r}, must be one of {BACKENDS}")
+    if name not in available_backends():
+        raise ValueError(f"The kernel backend {name!r} is not available, is the package installed?")
+    _active = _numba_backend() if name == 'numba' else _backends['python']
+
+
+def get_backend() -> str:
+    """
+    Reports the kernel backend in use, selecting the default backend first if none has been chosen.
+
+    :returns: The backend name
+    """
+    return _backend().name
+
+
+def _backend() -> _Backend:
+    if _active is None:
+        set_backend(os.environ.get(ENVIRONMENT_VARIABLE) or ('numba' if numba is not None else 'python'))
+    return _active
+
+
+def solar_position(day: int, clock_hours: float, daylight_savings_on: bool, longitude_degrees: float,
+                   standard_meridian_degrees: float, latitude_degrees: float,
+                   surface_azimuth_degrees: float = 180.0) -> tuple:
+    """
+    Calculates the sun position and the angle of incidence on a vertical surface for one time, with the selected
+    kernel backend.  This is safe to call from many threads at once, and with the Numba backend the calls do not hold
+    the global interpreter lock while the kernel runs.
+
+    :param day: [dimensionless] The day of year, 1-366
+    :param clock_hours: [hours] The local clock time in hours, including fractional minutes and seconds
+    :param daylight_savings_on: A flag if the clock time is a daylight savings number. If True, the hour is decremented.
+    :param longitude_degrees: [degrees west] The longitude west of the prime meridian
+    :param standard_meridian_degrees: [degrees west] The local standard meridian west of the prime meridian
+    :param latitude_degrees: [degrees north] The latitude north of the equator
+    :param surface_azimuth_degrees: [degrees CW from North] The azimuth of the surface normal
+
+    :returns: [radians] A tuple of (hour angle, altitude, azimuth, incidence); azimuth is NaN if the sun is down and
+              incidence is NaN if the sun is down or behind the surface
+    """
+    return _backend().position(float(day), float(clock_hours), bool(daylight_savings_on), float(longitude_degrees),
+                               float(standard_meridian_degrees), float(latitude_degrees),
+                               float(surface_azimuth_degrees))
+
+
+def solar_positions(days, clock_hours, daylight_savings_on: bool, longitude_degrees: float,
+                    standard_meridian_degrees: float, latitude_degrees: float,
+                    surface_azimuth_degrees: float = 180.0) -> tuple:
+    """
+    Calculates the sun position and the angle of incidence on a vertical surface for a series of times at one location,
+    looping inside the selected kernel backend.  With the Numba backend the whole loop runs without the global
+    interpreter lock, so series for different locations can be evaluated on parallel threads.
+
+    :param days: [dimensionless] An array of days of year, for example from :func:`solar_angles.batch.day_of_year`
+    :param clock_hours: [hours] An array of clock hours, for example from :func:`solar_angles.batch.clock_hours`
+    :param daylight_savings_on: A flag if the clock times are daylight savings numbers.
+                                If True, the hour is decremented.
+    :param longitude_degrees: [degrees west] The longitude west of the prime meridian
+    :param standard_meridian_degrees: [degrees west] The local standard meridian west of the prime meridian
+    :param latitude_degrees: [degrees north] The latitude north of the equator
+    :param surface_azimuth_degrees: [degrees CW from North] The azimuth of the surface normal
+
+    :returns: [radians] A tuple of float64 arrays (hour angle, altitude, azimuth, incidence), NaN where undefined
+    """
+    days = np.ascontiguousarray(days, dtype=np.float64)
+    clock_hours = np.ascontiguousarray(clock_hours, dtype=np.float64)
+    if days.shape != clock_hours.shape or days.ndim != 1:
+        raise ValueError("days and clock_hours must be 1-D arrays of the same length")
+    outputs = tuple(np.empty_like(days) for _ in range(4))
+    _backend().positions(days, clock_hours, bool(daylight_savings_on), float(longitude_degrees),
+                         float(standard_meridian_degrees), float(latitude_degrees), float(surface_azimuth_degrees),
+                         *outputs)
+    return outputs
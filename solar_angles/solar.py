@@ -24,28 +24,37 @@ class Angular:
     Another class member, called .valued is available to determine if the class members contain meaningful values.
 
     If the constructor is called without either argument, the .valued variable is False, and the numeric vars are None.
+    An argument only counts as missing when it is None, so an angle of zero (the equator, the prime meridian, a north
+    facing surface) is a perfectly valued angle.
 
     If the constructor is called with both arguments, they will be assigned if they agree to within a small tolerance;
     otherwise a ValueError is thrown.
+
+    The from_radians and from_degrees class methods are a faster way to build a valued instance when the value is
+    known to be a number, as it is for the results calculated in this module.
     """
 
+    __slots__ = ('valued', 'radians', 'degrees')
+
     def __init__(self, radians=None, degrees=None):
         """
         Constructor for the class.  Call it with either radians or degrees, not both.
 
         >>> a = Angular(radians=math.pi)
         >>> b = Angular(degrees=180)
+        >>> c = Angular(degrees=0)
         """
 
-        if not radians and not degrees:
-            self.valued = False
-            self.radians = None
-            self.degrees = None
-        elif radians and not degrees:
-            self.valued = True
-            self.radians = radians
-            self.degrees = math.degrees(radians)
-        elif degrees and not radians:
+        if degrees is None:
+            if radians is None:
+                self.valued = False
+                self.radians = None
+                self.degrees = None
+            else:
+                self.valued = True
+                self.radians = radians
+                self.degrees = math.degrees(radians)
+        elif radians is None:
             self.valued = True
             self.radians = math.radians(degrees)
             self.degrees = degrees
@@ -56,10 +65,65 @@ class Angular:
             self.radians = radians
             self.degrees = degrees
 
+    @classmethod
+    def from_radians(cls, radians: float) -> 'Angular':
+        """
+        Builds a valued instance from a number of radians, without the argument checks of the constructor.
+
+        :param radians: The angle in radians, which must not be None
+        :returns: [Angular] The angle with both radian and degree versions
+        """
+        angle = cls.__new__(cls)
+        angle.valued = True
+        angle.radians = radians
+        angle.degrees = math.degrees(radians)
+        return angle
+
+    @classmethod
+    def from_degrees(cls, degrees: float) -> 'Angular':
+        """
+        Builds a valued instance from a number of degrees, without the argument checks of the constructor.
+
+        :param degrees: The angle in degrees, which must not be None
+        :returns: [Angular] The angle with both radian and degree versions
+        """
+        angle = cls.__new__(cls)
+        angle.valued = True
+        angle.radians = math.radians(degrees)
+        angle.degrees = degrees
+        return angle
+
     def __str__(self) -> str:
         return f"{self.valued=}, {self.radians=}, {self.degrees=}"
 
 
+class Site:
+    """
+    This class bundles the location arguments that are passed to the solar functions for one fixed place.
+
+    The scalar functions still take the location on every call, since a location can change between calls, but the
+    batch, pandas and weather file helpers work on a whole series for one place, and take a Site instead.
+    The angles follow the same conventions as the scalar functions: longitude and standard meridian are measured
+    west of the prime meridian, and latitude north of the equator.
+    """
+
+    def __init__(self, latitude: Angular, longitude: Angular, standard_meridian: Angular, name: str = ''):
+        """
+        Constructor for the class.
+
+        >>> golden = Site(Angular(degrees=39.75), Angular(degrees=105.2), Angular(degrees=105), 'Golden, CO')
+        """
+        if not all([x.valued for x in [latitude, longitude, standard_meridian]]):
+            raise ValueError("Invalid arguments to Site, must all be valid Angular objects")
+        self.latitude = latitude
+        self.longitude = longitude
+        self.standard_meridian = standard_meridian
+        self.name = name
+
+    def __str__(self) -> str:
+        return f"{self.name=}, {self.latitude.degrees=}, {self.longitude.degrees=}, {self.standard_meridian.degrees=}"
+
+
 def day_of_year(time_stamp: datetime) -> int:
     """
     Calculates the day of year (1-366) given a Python datetime.datetime instance.
@@ -83,8 +147,11 @@ def equation_of_time(time_stamp: datetime) -> float:
     :param time_stamp: The current date and time to be used in this calculation of day of year.
     :returns: The equation of time, which is the difference between local civil time and local solar time
     """
-    degrees = (day_of_year(time_stamp) - 81.0) * (360.0 / 365.0)
-    radians = math.radians(degrees)
+    return _EQUATION_OF_TIME_MINUTES[day_of_year(time_stamp)]
+
+
+def _equation_of_time_minutes(day: int) -> float:
+    radians = math.radians((day - 81.0) * (360.0 / 365.0))
     return 9.87 * math.sin(2 * radians) - 7.53 * math.cos(radians) - 1.5 * math.sin(radians)
 
 
@@ -97,11 +164,22 @@ def declination_angle(time_stamp: datetime) -> Angular:
     :param time_stamp: The current date and time to be used in this calculation of day of year.
     :returns: The solar declination angle in an Angular with both radian and degree versions
     """
-    radians = math.radians((day_of_year(time_stamp) - 1.0) * (360.0 / 365.0))
-    dec_angle_deg = 0.3963723 - 22.9132745 * math.cos(radians) + 4.0254304 * math.sin(radians) - 0.387205 * math.cos(
+    return Angular.from_degrees(_DECLINATION_DEGREES[day_of_year(time_stamp)])
+
+
+def _declination_degrees(day: int) -> float:
+    radians = math.radians((day - 1.0) * (360.0 / 365.0))
+    return 0.3963723 - 22.9132745 * math.cos(radians) + 4.0254304 * math.sin(radians) - 0.387205 * math.cos(
         2.0 * radians) + 0.05196728 * math.sin(2.0 * radians) - 0.1545267 * math.cos(
         3.0 * radians) + 0.08479777 * math.sin(3.0 * radians)
-    return Angular(degrees=dec_angle_deg)
+
+
+# The equation of time and declination only depend on the day of year, not the year itself, so they are tabulated
+# once for days 1-366 when the module is imported, and looked up from then on.  Index 0 is unused, so the day of year
+# indexes the tables directly.
+_EQUATION_OF_TIME_MINUTES = tuple(_equation_of_time_minutes(day) for day in range(367))
+_DECLINATION_DEGREES = tuple(_declination_degrees(day) for day in range(367))
+_DECLINATION_RADIANS = tuple(math.radians(degrees) for degrees in _DECLINATION_DEGREES)
 
 
 def local_civil_time(time_stamp: datetime, daylight_savings_on: bool, longitude: Angular,
@@ -174,7 +252,7 @@ def hour_angle(time_stamp: datetime, daylight_savings_on: bool, longitude: Angul
         raise ValueError("Invalid arguments to hour_angle, must all be valid Angular objects")
     local_solar_time_hours = local_solar_time(time_stamp, daylight_savings_on, longitude, standard_meridian)
     hour_angle_deg = 15.0 * (local_solar_time_hours - 12)
-    return Angular(degrees=hour_angle_deg)
+    return Angular.from_degrees(hour_angle_deg)
 
 
 def altitude_angle(time_stamp: datetime, daylight_savings_on: bool, longitude: Angular, standard_meridian: Angular,
@@ -199,10 +277,13 @@ def altitude_angle(time_stamp: datetime, daylight_savings_on: bool, longitude: A
         raise ValueError("Invalid arguments to altitude_angle, must all be valid Angular objects")
     declination_radians = declination_angle(time_stamp).radians
     hour_radians = hour_angle(time_stamp, daylight_savings_on, longitude, standard_meridian).radians
-    altitude_radians = math.asin(
-        math.cos(latitude.radians) * math.cos(declination_radians) * math.cos(hour_radians) + math.sin(
-            latitude.radians) * math.sin(declination_radians))
-    return Angular(radians=altitude_radians)
+    return Angular.from_radians(_altitude_radians(hour_radians, declination_radians, latitude.radians))
+
+
+def _altitude_radians(hour_radians: float, declination_radians: float, latitude_radians: float) -> float:
+    return math.asin(
+        math.cos(latitude_radians) * math.cos(declination_radians) * math.cos(hour_radians) + math.sin(
+            latitude_radians) * math.sin(declination_radians))
 
 
 def azimuth_angle(time_stamp: datetime, daylight_savings_on: bool, longitude: Angular, standard_meridian: Angular,
@@ -228,19 +309,24 @@ def azimuth_angle(time_stamp: datetime, daylight_savings_on: bool, longitude: An
     if not all([x.valued for x in [longitude, standard_meridian, latitude]]):
         raise ValueError("Invalid arguments to azimuth_angle, must all be valid Angular objects")
     declination_radians = declination_angle(time_stamp).radians
-    altitude = altitude_angle(time_stamp, daylight_savings_on, longitude, standard_meridian, latitude)
-    if altitude.degrees < 0:  # sun is down
-        return Angular()
     hour_radians = hour_angle(time_stamp, daylight_savings_on, longitude, standard_meridian).radians
-    acos_from_south = math.acos(
-        (math.sin(altitude.radians) * math.sin(latitude.radians) - math.sin(declination_radians)) / (
-                math.cos(altitude.radians) * math.cos(latitude.radians)))
-    if hour_radians < 0:
-        azimuth_from_south = acos_from_south
-    else:
-        azimuth_from_south = -acos_from_south
-    azimuth_angle_radians = math.radians(180) - azimuth_from_south
-    return Angular(radians=azimuth_angle_radians)
+    if _altitude_radians(hour_radians, declination_radians, latitude.radians) < 0:  # sun is down
+        return Angular()
+    return Angular.from_radians(_azimuth_radians(hour_radians, declination_radians, latitude.radians))
+
+
+def _azimuth_radians(hour_radians: float, declination_radians: float, latitude_radians: float) -> float:
+    # The azimuth is taken from the east and north components of the sun direction with atan2, rather than from
+    # acos((sin(altitude) sin(latitude) - sin(declination)) / (cos(altitude) cos(latitude))).  Both components are
+    # finite everywhere, so there is no division by zero at the zenith or the poles, no acos argument pushed past +/-1
+    # by round-off, and the morning / afternoon side comes from the sign of sin(hour angle) instead of a branch.
+    # The old branch on the sign of the hour angle itself put the sun on the wrong side of north when the hour angle
+    # passes +/-180 degrees, on midnight sun days, so azimuths (and angles of incidence) changed there.
+    cos_declination = math.cos(declination_radians)
+    east = -math.sin(hour_radians) * cos_declination
+    north = math.sin(declination_radians) * math.cos(latitude_radians) - cos_declination * math.sin(
+        latitude_radians) * math.cos(hour_radians)
+    return math.atan2(east, north) % (2 * math.pi)
 
 
 def wall_azimuth_angle(time_stamp: datetime, daylight_savings_on: bool, longitude: Angular, standard_meridian: Angular,
@@ -275,7 +361,7 @@ def wall_azimuth_angle(time_stamp: datetime, daylight_savings_on: bool, longitud
     wall_azimuth_degrees = solar_azimuth - this_surface_azimuth_deg
     if wall_azimuth_degrees > 90 or wall_azimuth_degrees < -90:
         return Angular()
-    return Angular(degrees=wall_azimuth_degrees)
+    return Angular.from_degrees(wall_azimuth_degrees)
 
 
 def solar_angle_of_incidence(time_stamp: datetime, daylight_savings_on: bool, longitude: Angular,
@@ -310,7 +396,7 @@ def solar_angle_of_incidence(time_stamp: datetime, daylight_savings_on: bool, lo
         return Angular()
     altitude_rad = altitude_angle(time_stamp, daylight_savings_on, longitude, standard_meridian, latitude).radians
     incidence_angle_radians = math.acos(math.cos(altitude_rad) * math.cos(wall_azimuth_rad))
-    return Angular(radians=incidence_angle_radians)
+    return Angular.from_radians(incidence_angle_radians)
 
 
 def direct_radiation_on_surface(time_stamp: datetime, daylight_savings_on: bool, longitude: Angular,
@@ -343,3 +429,87 @@ def direct_radiation_on_surface(time_stamp: datetime, daylight_savings_on: bool,
     theta = solar_angle_of_incidence(time_stamp, daylight_savings_on, longitude, standard_meridian, latitude,
                                      surface_azimuth).radians
     return horizontal_direct_irradiation * math.cos(theta)
+
+
+class SolarPosition:
+    """
+    This class holds the full sun position for a single time and location, in both radians and degrees.
+
+    It is returned by :func:`solar_position`, which calculates each intermediate quantity only once, instead of having
+    the caller make separate calls to hour_angle, altitude_angle, azimuth_angle, etc. and pull the values out of
+    each returned Angular.  The members are plain floats held in __slots__, so a record is small and cheap to build.
+
+    If the sun is down, the azimuth members are None, matching the behavior of :func:`azimuth_angle`.
+    The equation of time is in minutes, as returned by :func:`equation_of_time`.
+    """
+
+    __slots__ = (
+        'hour_angle_radians', 'hour_angle_degrees',
+        'altitude_radians', 'altitude_degrees',
+        'azimuth_radians', 'azimuth_degrees',
+        'declination_radians', 'declination_degrees',
+        'equation_of_time',
+    )
+
+    def __init__(self, hour_angle_radians: float, altitude_radians: float, azimuth_radians, declination_radians: float,
+                 equation_of_time_minutes: float):
+        self.hour_angle_radians = hour_angle_radians
+        self.hour_angle_degrees = math.degrees(hour_angle_radians)
+        self.altitude_radians = altitude_radians
+        self.altitude_degrees = math.degrees(altitude_radians)
+        self.azimuth_radians = azimuth_radians
+        self.azimuth_degrees = None if azimuth_radians is None else math.degrees(azimuth_radians)
+        self.declination_radians = declination_radians
+        self.declination_degrees = math.degrees(declination_radians)
+        self.equation_of_time = equation_of_time_minutes
+
+    @property
+    def sun_is_up(self) -> bool:
+        return self.altitude_degrees >= 0
+
+    def __str__(self) -> str:
+        return (f"{self.hour_angle_degrees=}, {self.altitude_degrees=}, {self.azimuth_degrees=}, "
+                f"{self.declination_degrees=}, {self.equation_of_time=}")
+
+
+def solar_position(time_stamp: datetime, daylight_savings_on: bool, longitude: Angular, standard_meridian: Angular,
+                   latitude: Angular) -> SolarPosition:
+    """
+    Calculates the hour angle, altitude, azimuth, declination and equation of time together in a single pass.
+    The values are identical to those of the individual functions, but the day of year, declination and hour angle
+    are only evaluated once, and no intermediate Angular instances are created.
+
+    :param time_stamp: The current date and time to be used in this calculation of day of year.
+    :param daylight_savings_on: A flag if the current time is a daylight savings number.
+                                If True, the hour is decremented.
+    :param longitude: [west] The current longitude west of the prime meridian.
+                      For Golden, CO, the variable should be = 105.2 degrees.
+    :param standard_meridian: [west] The local standard meridian for the location, west
+                              of the prime meridian.  For Golden, CO, the variable should be = 105 degrees.
+    :param latitude: [north] The local latitude for the location, north of the equator.
+                     For Golden, CO, the variable should be = 39.75 degrees.
+
+    :returns: [SolarPosition] The combined sun position record.
+              NOTE: If the sun is down, the azimuth values in the record are None.
+    """
+    if not all([x.valued for x in [longitude, standard_meridian, latitude]]):
+        raise ValueError("Invalid arguments to solar_position, must all be valid Angular objects")
+    day = day_of_year(time_stamp)
+    eot_minutes = _EQUATION_OF_TIME_MINUTES[day]
+    declination_radians = _DECLINATION_RADIANS[day]
+    civil_hour = time_stamp.hour - 1 if daylight_savings_on else time_stamp.hour
+    local_solar_time_hours = civil_hour + time_stamp.minute / 60.0 + time_stamp.second / 3600.0 - 4 * (
+            longitude.degrees - standard_meridian.degrees) / 60.0 + eot_minutes / 60.0
+    hour_radians = math.radians(15.0 * (local_solar_time_hours - 12))
+    altitude_radians = _altitude_radians(hour_radians, declination_radians, latitude.radians)
+    azimuth_radians = None
+    if altitude_radians >= 0:
+        azimuth_radians = _azimuth_radians(hour_radians, declination_radians, latitude.radians)
+    return SolarPosition(hour_radians, altitude_radians, azimuth_radians, declination_radians, eot_minutes)
+
+
+# opt-in profiling, enabled here so that the wrapped functions are in place before any caller imports them by name
+from solar_angles import instrumentation  # noqa: E402
+
+if instrumentation.enabled_from_environment():  # pragma: no cover
+    instrumentation.enable()
@@ -0,0 +1,161 @@
+from datetime import date
+
+import numpy as np
+
+from solar_angles import batch, irradiance
+from solar_angles.batch import SolarPositionSeries
+from solar_angles.solar import Site
+
+# Annual summary statistics reduced in a single streaming pass.
+# Reports which only need aggregates (hours of direct sun on each surface, cumulative cosine-weighted exposure, the
+# daily altitude range, the sunrise and sunset azimuth) do not need the full minute level series to be stored: the
+# time stamps are generated a few days at a time, each chunk is evaluated with the vectorized functions in batch.py,
+# folded into running accumulators, and thrown away.  Memory use is set by the chunk size, not the length of the year.
+# The accumulators only look at SolarPositionSeries chunks, so any source of sun positions can feed them, as long as
+# the chunks arrive in time order and every sample stands for the same length of time.
+# Surfaces may be tilted, as in irradiance.py, and a surface counts as sunlit whenever the cosine of the angle of
+# incidence from irradiance.surface_cos_incidence is positive.  The daily values are taken from
+# the samples themselves: the altitude extremes are the largest and smallest sampled altitudes of each day, whether the
+# sun is up or not, and the sunrise and sunset azimuths are those of the first and last sample of each day with the
+# sun up.  The sunrise and sunset azimuths are NaN on days without any sample with the sun up (polar night), and on
+# midnight sun days they are just the azimuths of the first and last samples of the day, not a real sunrise and sunset.
+# Angles are in radians.
+
+DEFAULT_STEP_SECONDS = 60
+DEFAULT_CHUNK_DAYS = 7
+
+
+class AnnualSummary:
+    """
+    This class holds the reduced statistics of a date range.
+
+    The sunlit hours and exposure hours members have one value per surface; the exposure is the sum of the cosine of
+    the angle of incidence over the sunlit time, so a surface facing the sun squarely for one hour collects one hour.
+    Multiplying it by a direct normal irradiance gives the incident energy.  The daily members have one value per
+    date, in radians.
+    """
+
+    __slots__ = ('dates', 'sunlit_hours', 'exposure_hours', 'max_altitude', 'min_altitude', 'sunrise_azimuth',
+                 'sunset_azimuth')
+
+    def __init__(self, dates: np.ndarray, sunlit_hours: np.ndarray, exposure_hours: np.ndarray,
+                 max_altitude: np.ndarray, min_altitude: np.ndarray, sunrise_azimuth: np.ndarray,
+                 sunset_azimuth: np.ndarray):
+        self.dates = dates
+        self.sunlit_hours = sunlit_hours
+        self.exposure_hours = exposure_hours
+        self.max_altitude = max_altitude
+        self.min_altitude = min_altitude
+        self.sunrise_azimuth = sunrise_azimuth
+        self.sunset_azimuth = sunset_azimuth
+
+
+class SummaryAccumulator:
+    """
+    This class folds chunks of sun positions into the running totals of an :class:`AnnualSummary`.
+
+    Call :meth:`update` with each chunk, in time order, and :meth:`result` at the end.
+    """
+
+    def __init__(self, start_date, end_date, surface_azimuths, surface_tilts=90.0,
+                 step_seconds: float = DEFAULT_STEP_SECONDS):
+        """
+        Constructor for the class.
+
+        :param start_date: The first day of the range, as a date, datetime or datetime64
+        :param end_date: The last day of the range, inclusive
+        :param surface_azimuths: [CW from North] A sequence of surface azimuths, as Angular instances or in degrees
+        :param surface_tilts: [from horizontal] The surface tilt(s), as Angular instances or in degrees; 90 is vertical
+        :param step_seconds: [seconds] The length of time each sample stands for
+        """
+        if step_seconds <= 0:
+            raise ValueError("step_seconds must be greater than 0")
+        self.dates = np.arange(np.datetime64(start_date, 'D'), np.datetime64(end_date, 'D') + 1)
+        if len(self.dates) == 0:
+            raise ValueError("end_date must not be before start_date")
+        self.surface_azimuths = list(surface_azimuths)
+        self.surface_tilts = surface_tilts
+        self.step_hours = step_seconds / 3600.0
+        day_count = len(self.dates)
+        self._sunlit_samples = np.zeros(len(self.surface_azimuths), dtype=np.int64)
+        self._cos_sum = np.zeros(len(self.surface_azimuths))
+        self._max_altitude = np.full(day_count, np.nan)
+        self._min_altitude = np.full(day_count, np.nan)
+        self._sunrise_azimuth = np.full(day_count, np.nan)
+        self._sunset_azimuth = np.full(day_count, np.nan)
+
+    def update(self, positions: SolarPositionSeries) -> None:
+        """
+        Adds a chunk of sun positions to the running totals.
+
+        :param positions: The sun positions, as returned from :func:`solar_angles.batch.solar_position_series`
+        """
+        if len(positions) == 0:
+            return
+        day_index = (positions.time_stamps.astype('datetime64[D]') - self.dates[0]).astype(np.int64)
+        if day_index.min() < 0 or day_index.max() >= len(self.dates):
+            raise ValueError("The positions include time stamps outside of the summary date range")
+        cos_theta = irradiance.surface_cos_incidence(positions, self.surface_azimuths, self.surface_tilts)
+        self._sunlit_samples += np.count_nonzero(cos_theta > 0, axis=0)
+        self._cos_sum += cos_theta.sum(axis=0)
+        altitude = positions.altitude.astype(np.float64)
+        np.fmax.at(self._max_altitude, day_index, altitude)
+        np.fmin.at(self._min_altitude, day_index, altitude)
+
+        up = np.nonzero(~np.isnan(positions.azimuth))[0]
+        if len(up) == 0:
+            return
+        up_days = day_index[up]
+        # the first sample of a day with the sun up only counts if no earlier chunk had one, while the last one always
+        # replaces whatever an earlier chunk found
+        days, first = np.unique(up_days, return_index=True)
+        unset = np.isnan(self._sunrise_azimuth[days])
+        self._sunrise_azimuth[days[unset]] = positions.azimuth[up[first[unset]]]
+        days, last_reversed = np.unique(up_days[::-1], return_index=True)
+        self._sunset_azimuth[days] = positions.azimuth[up[len(up) - 1 - last_reversed]]
+
+    def result(self) -> AnnualSummary:
+        """
+        Collects the statistics accumulated so far.
+
+        :returns: [AnnualSummary] A copy of the running totals, so more chunks can still be added afterwards
+        """
+        return AnnualSummary(self.dates.copy(), self._sunlit_samples * self.step_hours, self._cos_sum * self.step_hours,
+                             self._max_altitude.copy(), self._min_altitude.copy(), self._sunrise_azimuth.copy(),
+                             self._sunset_azimuth.copy())
+
+
+def annual_summary(site: Site, year: int, surface_azimuths, surface_tilts=90.0,
+                   step_seconds: int = DEFAULT_STEP_SECONDS, daylight_savings_on: bool = False,
+                   chunk_days: int = DEFAULT_CHUNK_DAYS, start_date=None, end_date=None) -> AnnualSummary:
+    """
+    Reduces a year of sun positions for one site to annual and daily statistics, without storing the series.
+    The samples are placed in the middle of each step (rounded down to a whole second).
+
+    :param site: The location to calculate for
+    :param year: The calendar year
+    :param surface_azimuths: [CW from North] A sequence of surface azimuths, as Angular instances or in degrees
+    :param surface_tilts: [from horizontal] The surface tilt(s), as Angular instances or in degrees; 90 is vertical
+    :param step_seconds: [seconds] The sampling step, which must divide a day into a whole number of steps
+    :param daylight_savings_on: A flag if the clock times should be daylight savings numbers.
+    :param chunk_days: The number of days evaluated at once
+    :param start_date: If given, the first day to summarize instead of the first day of the year
+    :param end_date: If given, the last day to summarize instead of the last day of the year
+
+    :returns: [AnnualSummary] The reduced statistics
+    """
+    if step_seconds <= 0 or 86400 % step_seconds:
+        raise ValueError("step_seconds must be a whole number of seconds which divides a day evenly")
+    if chunk_days < 1:
+        raise ValueError("chunk_days must be at least 1")
+    accumulator = SummaryAccumulator(date(year, 1, 1) if start_date is None else start_date,
+                                     date(year, 12, 31) if end_date is None else end_date,
+                                     surface_azimuths, surface_tilts, step_seconds)
+    offsets = np.arange(step_seconds // 2, 86400, step_seconds).astype('timedelta64[s]')
+    for first in range(0, len(accumulator.dates), chunk_days):
+        days = accumulator.dates[first:first + chunk_days].astype('datetime64[s]')
+        stamps = (days[:, np.newaxis] + offsets).ravel()
+        accumulator.update(batch.solar_position_series(
+            stamps, daylight_savings_on, site.longitude, site.standard_meridian, site.latitude
+        ))
+    return accumulator.result()
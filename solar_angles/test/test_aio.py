@@ -0,0 +1,114 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
+from unittest import TestCase
+
+import numpy as np
+
+from solar_angles import aio, batch, summary
+from solar_angles.solar import Angular, Site
+
+
+class _CountingExecutor(ThreadPoolExecutor):
+
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.futures = []
+
+    def submit(self, *args, **kwargs):
+        future = super().submit(*args, **kwargs)
+        self.futures.append(future)
+        return future
+
+
+async def _collect(stream) -> list:
+    return [positions async for positions in stream]
+
+
+class TestAsyncAdapters(TestCase):
+
+    def setUp(self):
+        self.stamps = np.arange(np.datetime64('2011-01-01'), np.datetime64('2011-01-11'), np.timedelta64(10, 'm'))
+        self.expected = batch.solar_position_series(self.stamps, False, 105.2, 105, 39.75)
+
+    def test_solar_position_series(self):
+        positions = asyncio.run(aio.solar_position_series(self.stamps, False, 105.2, 105, 39.75))
+        np.testing.assert_array_equal(positions.altitude, self.expected.altitude)
+
+    def test_run_batch_in_a_process_pool(self):
+        site = Site(Angular(degrees=39.75), Angular(degrees=105.2), Angular(degrees=105))
+
+        async def run():
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                return await aio.run_batch(summary.annual_summary, site, 2011, [180], step_seconds=3600,
+                                           start_date=date(2011, 6, 1), end_date=date(2011, 6, 3), executor=executor)
+
+        result = asyncio.run(run())
+        expected = summary.annual_summary(site, 2011, [180], step_seconds=3600, start_date=date(2011, 6, 1),
+                                          end_date=date(2011, 6, 3))
+        np.testing.assert_array_equal(result.max_altitude, expected.max_altitude)
+
+    def test_stream_matches_batch(self):
+        flags = np.arange(len(self.stamps)) % 7 == 0
+        expected = batch.solar_position_series(self.stamps, flags, 105.2, 105, 39.75)
+        chunks = asyncio.run(_collect(aio.stream_position_series(self.stamps, flags, 105.2, 105, 39.75,
+                                                                 chunk_size=500, max_pending=2)))
+        self.assertEqual([len(x) for x in chunks], [500, 500, 440])
+        np.testing.assert_array_equal(np.concatenate([x.hour_angle for x in chunks]), expected.hour_angle)
+        np.testing.assert_array_equal(np.concatenate([x.time_stamps for x in chunks]), expected.time_stamps)
+
+    def test_back_pressure_from_an_async_source(self):
+        pulled = []
+
+        async def source():
+            for day in range(10):
+                pulled.append(day)
+                yield self.stamps[day * 144:(day + 1) * 144]
+
+        async def consume():
+            received = 0
+            max_pending = 3
+            async for positions in aio.stream_position_series(source(), False, 105.2, 105, 39.75,
+                                                              max_pending=max_pending):
+                received += 1
+                # the chunk just received was one of the max_pending in flight, and no more are pulled until it has
+                # been taken
+                self.assertLessEqual(len(pulled), received + max_pending - 1)
+                np.testing.assert_array_equal(positions.altitude,
+                                              self.expected.altitude[(received - 1) * 144:received * 144])
+                await asyncio.sleep(0)
+            return received
+
+        self.assertEqual(asyncio.run(consume()), 10)
+        with self.assertRaises(ValueError):
+            asyncio.run(_collect(aio.stream_position_series(source(), [True, False], 105.2, 105, 39.75)))
+
+    def test_closing_the_stream_cancels_queued_chunks(self):
+        executor = _CountingExecutor()
+        gate = threading.Event()
+
+        async def run():
+            stream = aio.stream_position_series(self.stamps, False, 105.2, 105, 39.75, chunk_size=100,
+                                                max_pending=4, executor=executor)
+            # hold the single worker, so the chunks after the first one stay queued in the executor
+            executor.submit(gate.wait)
+            waiting = asyncio.ensure_future(stream.__anext__())
+            await asyncio.sleep(0.05)
+            waiting.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await waiting
+            await stream.aclose()
+
+        asyncio.run(run())
+        gate.set()
+        executor.shutdown(wait=True)
+        chunk_futures = executor.futures[1:]
+        self.assertEqual(len(chunk_futures), 4)
+        self.assertTrue(all(future.cancelled() for future in chunk_futures))
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            asyncio.run(_collect(aio.stream_position_series(self.stamps, False, 105.2, 105, 39.75, chunk_size=0)))
+        with self.assertRaises(ValueError):
+            asyncio.run(_collect(aio.stream_position_series(self.stamps, False, 105.2, 105, 39.75, max_pending=0)))
@@ -0,0 +1,197 @@
+from datetime import datetime, timedelta
+from math import cos
+from unittest import TestCase
+
+import numpy as np
+
+from solar_angles import batch, solar
+from solar_angles.solar import Angular
+
+
+def _hourly_stamps(start: datetime, count: int) -> list:
+    return [start + timedelta(minutes=30 * i) for i in range(count)]
+
+
+class TestTimeConversion(TestCase):
+
+    def test_day_of_year(self):
+        stamps = [datetime(1996, 1, 1), datetime(1996, 12, 31, 23, 59), datetime(1900, 12, 31), datetime(2001, 3, 1)]
+        expected = [solar.day_of_year(x) for x in stamps]
+        np.testing.assert_array_equal(batch.day_of_year(stamps), expected)
+
+    def test_clock_hours(self):
+        stamps = [datetime(2001, 1, 1, 0, 0, 0), datetime(2001, 1, 1, 13, 30, 36)]
+        np.testing.assert_allclose(batch.clock_hours(stamps), [0.0, 13.51])
+
+    def test_daily_tables_match_the_series(self):
+        # integer days are looked up in the tables, float days go through the series, and both must agree
+        days = np.arange(1, 367)
+        np.testing.assert_allclose(batch.equation_of_time(days), batch.equation_of_time(days.astype(np.float64)),
+                                   rtol=0, atol=1e-12)
+        np.testing.assert_allclose(batch.declination_angle(days), batch.declination_angle(days.astype(np.float64)),
+                                   rtol=0, atol=1e-12)
+        scalar_stamps = [datetime(2000, 1, 1) + timedelta(days=int(day) - 1) for day in days]
+        np.testing.assert_allclose(batch.equation_of_time(days), [solar.equation_of_time(x) for x in scalar_stamps],
+                                   rtol=0, atol=1e-12)
+        np.testing.assert_allclose(np.degrees(batch.declination_angle(days)),
+                                   [solar.declination_angle(x).degrees for x in scalar_stamps], rtol=0, atol=1e-12)
+
+
+class TestSolarPositionSeries(TestCase):
+
+    def setUp(self):
+        self.longitude = Angular(degrees=85)
+        self.standard_meridian = Angular(degrees=90)
+        self.latitude = Angular(degrees=40)
+        self.stamps = _hourly_stamps(datetime(2001, 7, 20), 96)
+
+    def test_matches_scalar(self):
+        for dst_on in [True, False]:
+            series = batch.solar_position_series(
+                self.stamps, dst_on, self.longitude, self.standard_meridian, self.latitude
+            )
+            self.assertEqual(len(series), len(self.stamps))
+            for i, dt in enumerate(self.stamps):
+                expected = solar.solar_position(dt, dst_on, self.longitude, self.standard_meridian, self.latitude)
+                self.assertAlmostEqual(series.hour_angle_degrees[i], expected.hour_angle_degrees, delta=1e-9)
+                self.assertAlmostEqual(series.altitude_degrees[i], expected.altitude_degrees, delta=1e-9)
+                self.assertAlmostEqual(series.declination_degrees[i], expected.declination_degrees, delta=1e-9)
+                self.assertAlmostEqual(series.equation_of_time[i], expected.equation_of_time, delta=1e-9)
+                if expected.sun_is_up:
+                    self.assertAlmostEqual(series.azimuth_degrees[i], expected.azimuth_degrees, delta=1e-9)
+                else:
+                    self.assertTrue(np.isnan(series.azimuth[i]))
+
+    def test_degrees_and_angular_inputs_agree(self):
+        a = batch.solar_position_series(self.stamps, True, self.longitude, self.standard_meridian, self.latitude)
+        b = batch.solar_position_series(self.stamps, True, 85, 90, 40)
+        np.testing.assert_array_equal(a.altitude, b.altitude)
+
+    def test_record_access(self):
+        series = batch.solar_position_series(self.stamps, True, self.longitude, self.standard_meridian, self.latitude)
+        record = series[20]
+        self.assertIsInstance(record, solar.SolarPosition)
+        self.assertEqual(record.altitude_radians, series.altitude[20])
+        self.assertIsNone(series[0].azimuth_radians)  # midnight
+
+    def test_as_dict(self):
+        series = batch.solar_position_series(self.stamps, True, self.longitude, self.standard_meridian, self.latitude)
+        columns = series.as_dict(degrees=False)
+        self.assertIs(columns['altitude'], series.altitude)
+        columns = series.as_dict()
+        np.testing.assert_allclose(columns['altitude'], np.degrees(series.altitude))
+        self.assertEqual(set(columns), {'time_stamp', 'hour_angle', 'altitude', 'azimuth', 'declination',
+                                        'equation_of_time'})
+
+    def test_azimuth_at_the_zenith_and_poles(self):
+        # overhead at solar noon, and both poles, which divided by zero in the old acos formulation
+        declination = np.radians(23.44)
+        with np.errstate(all='raise'):
+            zenith = batch.azimuth_angle(0.0, declination, declination, np.pi / 2)
+            poles = batch.azimuth_angle(np.array([0.5, 0.5]), declination, np.radians([90.0, -90.0]),
+                                        np.array([declination, -declination]))
+        self.assertTrue(np.isfinite(zenith))
+        self.assertAlmostEqual(float(poles[0]), np.pi + 0.5, delta=1e-12)
+        self.assertTrue(np.isnan(poles[1]))
+
+    def test_float32_error_bounds(self):
+        stamps = np.arange('2001-01-01T00:05', '2002-01-01', 20, dtype='datetime64[m]')
+        surfaces = [0, 90, 180, 270, 33]
+        bounds = batch.FLOAT32_MAX_ERROR_DEGREES
+        for latitude in (-60, -23, 0, 10, 23.4, 40, 75):
+            full = batch.solar_position_series(stamps, False, 97.3, 90, latitude)
+            reduced = batch.solar_position_series(stamps, False, 97.3, 90, latitude, dtype=np.float32)
+            self.assertEqual(reduced.altitude.dtype, np.float32)
+            self.assertEqual(reduced.azimuth.dtype, np.float32)
+            np.testing.assert_allclose(reduced.altitude_degrees, full.altitude_degrees, rtol=0,
+                                       atol=bounds['altitude'])
+            # azimuths just either side of north are compared around the circle
+            azimuth_error = (reduced.azimuth_degrees - full.azimuth_degrees + 180) % 360 - 180
+            np.testing.assert_array_equal(np.isnan(azimuth_error), np.isnan(full.azimuth))
+            self.assertLessEqual(np.nanmax(np.abs(azimuth_error)), bounds['azimuth'])
+            reduced_incidence = batch.solar_angle_of_incidence(reduced, surfaces)
+            self.assertEqual(reduced_incidence.dtype, np.float32)
+            np.testing.assert_allclose(np.degrees(reduced_incidence), np.degrees(
+                batch.solar_angle_of_incidence(full, surfaces)), rtol=0, atol=bounds['incidence'])
+
+    def test_zero_valued_location(self):
+        zero = Angular(degrees=0)
+        series = batch.solar_position_series(self.stamps, False, zero, zero, zero)
+        self.assertTrue(np.array_equal(series.hour_angle, batch.solar_position_series(
+            self.stamps, False, 0, 0, 0).hour_angle))
+        surfaces = [Angular(degrees=0), 0, 360]
+        wall_azimuth = batch.wall_azimuth_angle(series, surfaces)
+        incidence = batch.solar_angle_of_incidence(series, surfaces)
+        for i, dt in enumerate(self.stamps):
+            position = solar.solar_position(dt, False, zero, zero, zero)
+            self.assertAlmostEqual(series.altitude[i], position.altitude_radians, delta=1e-9)
+            expected_wall = solar.wall_azimuth_angle(dt, False, zero, zero, zero, zero)
+            expected_incidence = solar.solar_angle_of_incidence(dt, False, zero, zero, zero, zero)
+            for j in range(len(surfaces)):
+                if expected_wall.valued:
+                    self.assertAlmostEqual(wall_azimuth[i, j], expected_wall.radians, delta=1e-9)
+                    self.assertAlmostEqual(incidence[i, j], expected_incidence.radians, delta=1e-9)
+                else:
+                    self.assertTrue(np.isnan(wall_azimuth[i, j]))
+                    self.assertTrue(np.isnan(incidence[i, j]))
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            batch.solar_position_series(self.stamps, True, Angular(), Angular(), Angular())
+        with self.assertRaises(ValueError):
+            batch.solar_position_series(self.stamps, True, 85, 90, 40, dtype=np.float16)
+
+
+class TestSurfaceCalculations(TestCase):
+
+    def setUp(self):
+        self.longitude = Angular(degrees=85)
+        self.standard_meridian = Angular(degrees=90)
+        self.latitude = Angular(degrees=40)
+        self.stamps = _hourly_stamps(datetime(2001, 7, 21), 48)
+        self.series = batch.solar_position_series(
+            self.stamps, True, self.longitude, self.standard_meridian, self.latitude
+        )
+        self.surfaces = [Angular(degrees=90), Angular(degrees=180), Angular(degrees=270), Angular(degrees=450)]
+
+    def test_wall_azimuth_matches_scalar(self):
+        result = batch.wall_azimuth_angle(self.series, self.surfaces)
+        self.assertEqual(result.shape, (len(self.stamps), len(self.surfaces)))
+        for i, dt in enumerate(self.stamps):
+            for j, surface in enumerate(self.surfaces):
+                expected = solar.wall_azimuth_angle(
+                    dt, True, self.longitude, self.standard_meridian, self.latitude, surface
+                )
+                if expected.valued:
+                    self.assertAlmostEqual(result[i, j], expected.radians, delta=1e-9)
+                else:
+                    self.assertTrue(np.isnan(result[i, j]))
+
+    def test_incidence_matches_scalar(self):
+        result = batch.solar_angle_of_incidence(self.series, self.surfaces)
+        for i, dt in enumerate(self.stamps):
+            for j, surface in enumerate(self.surfaces):
+                expected = solar.solar_angle_of_incidence(
+                    dt, True, self.longitude, self.standard_meridian, self.latitude, surface
+                )
+                if expected.valued:
+                    self.assertAlmostEqual(result[i, j], expected.radians, delta=1e-9)
+                else:
+                    self.assertTrue(np.isnan(result[i, j]))
+
+    def test_single_surface_shape(self):
+        result = batch.solar_angle_of_incidence(self.series, 180)
+        self.assertEqual(result.shape, (len(self.stamps),))
+
+    def test_direct_radiation(self):
+        irradiation = np.full(len(self.stamps), 293.0)
+        result = batch.direct_radiation_on_surface(self.series, self.surfaces, irradiation)
+        theta = batch.solar_angle_of_incidence(self.series, self.surfaces)
+        for i in range(len(self.stamps)):
+            for j in range(len(self.surfaces)):
+                if np.isnan(theta[i, j]):
+                    self.assertEqual(result[i, j], 0.0)
+                else:
+                    self.assertAlmostEqual(result[i, j], 293.0 * cos(theta[i, j]), delta=1e-9)
+        single = batch.direct_radiation_on_surface(self.series, 180, 293.0)
+        np.testing.assert_allclose(single, result[:, 1])
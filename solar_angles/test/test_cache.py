@@ -0,0 +1,170 @@
+import threading
+from datetime import datetime
+from unittest import TestCase
+
+from solar_angles import instrumentation, solar
+from solar_angles.cache import PositionCache
+from solar_angles.solar import Angular, Site
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestPositionCache(TestCase):
+
+    def setUp(self):
+        self.golden = Site(Angular(degrees=39.75), Angular(degrees=105.2), Angular(degrees=105), 'Golden, CO')
+        self.greenwich = Site(Angular(degrees=51.48), Angular(degrees=0), Angular(degrees=0), 'Greenwich')
+
+    def test_matches_scalar_at_the_rounded_time(self):
+        cache = PositionCache(resolution_seconds=60)
+        cache.add_site('golden', self.golden)
+        position = cache.solar_position('golden', datetime(2001, 7, 21, 10, 0, 40), daylight_savings_on=True)
+        expected = solar.solar_position(datetime(2001, 7, 21, 10, 1, 0), True, self.golden.longitude,
+                                        self.golden.standard_meridian, self.golden.latitude)
+        self.assertEqual(position.altitude_radians, expected.altitude_radians)
+        self.assertEqual(position.azimuth_radians, expected.azimuth_radians)
+
+    def test_rounding(self):
+        cache = PositionCache(resolution_seconds=900)
+        self.assertEqual(cache.rounded_time_stamp(datetime(2001, 7, 21, 10, 7, 29)), datetime(2001, 7, 21, 10, 0))
+        self.assertEqual(cache.rounded_time_stamp(datetime(2001, 7, 21, 10, 7, 31)), datetime(2001, 7, 21, 10, 15))
+        self.assertEqual(cache.rounded_time_stamp(datetime(2001, 7, 21, 23, 59)), datetime(2001, 7, 22))
+
+    def test_hits_within_a_step(self):
+        cache = PositionCache(resolution_seconds=60)
+        cache.add_site('golden', self.golden)
+        first = cache.solar_position('golden', datetime(2001, 7, 21, 10, 0, 5))
+        second = cache.solar_position('golden', datetime(2001, 7, 21, 10, 0, 25))
+        self.assertIs(first, second)
+        # daylight savings and other sites are separate entries
+        cache.add_site('greenwich', self.greenwich)
+        self.assertIsNot(cache.solar_position('golden', datetime(2001, 7, 21, 10, 0, 5), True), first)
+        cache.solar_position('greenwich', datetime(2001, 7, 21, 10, 0, 5))
+        statistics = cache.statistics()
+        self.assertEqual(statistics['hits'], 1)
+        self.assertEqual(statistics['misses'], 3)
+        self.assertEqual(statistics['size'], 3)
+        self.assertAlmostEqual(statistics['hit_rate'], 0.25)
+
+    def test_least_recently_used_eviction(self):
+        cache = PositionCache(max_size=2)
+        cache.add_site('golden', self.golden)
+        stamps = [datetime(2001, 7, 21, 10, minute) for minute in range(3)]
+        cache.solar_position('golden', stamps[0])
+        cache.solar_position('golden', stamps[1])
+        cache.solar_position('golden', stamps[0])  # now the most recently used
+        cache.solar_position('golden', stamps[2])  # evicts stamps[1]
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.statistics()['evictions'], 1)
+        cache.solar_position('golden', stamps[0])
+        self.assertEqual(cache.statistics()['hits'], 2)
+        cache.solar_position('golden', stamps[1])
+        self.assertEqual(cache.statistics()['misses'], 4)
+
+    def test_expiry(self):
+        clock = FakeClock()
+        cache = PositionCache(ttl_seconds=10, clock=clock)
+        cache.add_site('golden', self.golden)
+        stamp = datetime(2001, 7, 21, 10)
+        cache.solar_position('golden', stamp)
+        clock.now = 9.0
+        cache.solar_position('golden', stamp)
+        clock.now = 10.0
+        cache.solar_position('golden', stamp)
+        statistics = cache.statistics()
+        self.assertEqual((statistics['hits'], statistics['misses'], statistics['expirations']), (1, 2, 1))
+
+    def test_prefetch(self):
+        cache = PositionCache(resolution_seconds=60, prefetch_steps=5)
+        cache.add_site('golden', self.golden)
+        for minute in range(6):
+            cache.solar_position('golden', datetime(2001, 7, 21, 10, minute))
+        statistics = cache.statistics()
+        self.assertEqual((statistics['hits'], statistics['misses'], statistics['prefetched']), (5, 1, 5))
+        prefetched = cache.solar_position('golden', datetime(2001, 7, 21, 10, 3))
+        expected = solar.solar_position(datetime(2001, 7, 21, 10, 3), False, self.golden.longitude,
+                                        self.golden.standard_meridian, self.golden.latitude)
+        self.assertEqual(prefetched.altitude_radians, expected.altitude_radians)
+        # a miss only calculates the following steps which are not cached yet
+        cache.solar_position('golden', datetime(2001, 7, 21, 9, 58, 10))
+        self.assertEqual(cache.statistics()['prefetched'], 6)
+        self.assertEqual(len(cache), 8)
+
+    def test_prefetch_refreshes_expired_entries(self):
+        clock = FakeClock()
+        cache = PositionCache(resolution_seconds=60, prefetch_steps=2, ttl_seconds=10, clock=clock)
+        cache.add_site('golden', self.golden)
+        cache.solar_position('golden', datetime(2001, 7, 21, 10, 0))
+        clock.now = 20.0
+        # the entries prefetched for 10:01 and 10:02 have expired, so this miss calculates them again
+        cache.solar_position('golden', datetime(2001, 7, 21, 9, 59))
+        self.assertEqual(cache.statistics()['prefetched'], 4)
+        cache.solar_position('golden', datetime(2001, 7, 21, 10, 1))
+        statistics = cache.statistics()
+        self.assertEqual((statistics['hits'], statistics['misses'], statistics['expirations']), (1, 2, 0))
+
+    def test_site_registration(self):
+        cache = PositionCache()
+        with self.assertRaises(KeyError):
+            cache.solar_position('golden', datetime(2001, 7, 21, 10))
+        cache.add_site('golden', self.golden)
+        first = cache.solar_position('golden', datetime(2001, 7, 21, 10))
+        cache.add_site('golden', self.greenwich)
+        self.assertEqual(len(cache), 0)
+        self.assertNotEqual(cache.solar_position('golden', datetime(2001, 7, 21, 10)).altitude_radians,
+                            first.altitude_radians)
+        cache.remove_site('golden')
+        self.assertEqual(len(cache), 0)
+        with self.assertRaises(KeyError):
+            cache.remove_site('golden')
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            PositionCache(resolution_seconds=0)
+        with self.assertRaises(ValueError):
+            PositionCache(prefetch_steps=-1)
+        with self.assertRaises(ValueError):
+            PositionCache(max_size=4, prefetch_steps=4)
+        with self.assertRaises(ValueError):
+            PositionCache(ttl_seconds=0)
+
+    def test_reports_to_instrumentation(self):
+        cache = PositionCache(name='test_positions')
+        cache.add_site('golden', self.golden)
+        with instrumentation.profiling() as stats:
+            cache.solar_position('golden', datetime(2001, 7, 21, 10))
+            cache.solar_position('golden', datetime(2001, 7, 21, 10))
+        self.assertEqual(stats.as_dict()['caches']['test_positions'], {'hits': 1, 'misses': 1, 'hit_rate': 0.5})
+
+    def test_threads(self):
+        cache = PositionCache(max_size=50, prefetch_steps=3)
+        cache.add_site('golden', self.golden)
+        cache.add_site('greenwich', self.greenwich)
+        errors = []
+
+        def worker(site_id):
+            try:
+                for _ in range(5):
+                    for minute in range(60):
+                        position = cache.solar_position(site_id, datetime(2001, 7, 21, 12, minute))
+                        if position is None:
+                            errors.append(minute)
+            except Exception as error:  # pragma: no cover - reported through the assertion below
+                errors.append(error)
+
+        threads = [threading.Thread(target=worker, args=(site_id,)) for site_id in ['golden', 'greenwich'] * 4]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        statistics = cache.statistics()
+        self.assertEqual(statistics['hits'] + statistics['misses'], 8 * 5 * 60)
+        self.assertLessEqual(statistics['size'], 50)
@@ -0,0 +1,58 @@
+from unittest import TestCase
+
+import numpy as np
+
+from solar_angles import batch
+from solar_angles.daylight import daylight_position_series
+from solar_angles.solar import Angular
+
+
+class TestDaylightPositionSeries(TestCase):
+
+    def setUp(self):
+        self.stamps = np.arange('2001-01-01T00:10', '2002-01-01', 20, dtype='datetime64[m]')
+        self.surfaces = [0, 90, 180, 270]
+
+    def _check_against_dense(self, latitude, daylight_savings_on=False):
+        dense = batch.solar_position_series(self.stamps, daylight_savings_on, 97.3, 90, latitude)
+        sparse = daylight_position_series(self.stamps, daylight_savings_on, 97.3, 90, latitude, self.surfaces)
+        # the daylight set is exactly where the dense path reports a valued azimuth
+        np.testing.assert_array_equal(sparse.daylight_mask, ~np.isnan(dense.azimuth))
+        np.testing.assert_array_equal(sparse.positions.time_stamps, dense.time_stamps[sparse.index])
+        for name in ('hour_angle', 'altitude', 'azimuth', 'declination', 'equation_of_time'):
+            np.testing.assert_allclose(getattr(sparse.positions, name), getattr(dense, name)[sparse.index], rtol=0,
+                                       atol=1e-12)
+        np.testing.assert_allclose(sparse.dense(sparse.positions.azimuth), dense.azimuth, rtol=0, atol=1e-12)
+        np.testing.assert_allclose(sparse.dense(sparse.incidence), batch.solar_angle_of_incidence(dense, self.surfaces),
+                                   rtol=0, atol=1e-12)
+        np.testing.assert_allclose(sparse.dense(sparse.wall_azimuth), batch.wall_azimuth_angle(dense, self.surfaces),
+                                   rtol=0, atol=1e-12)
+        return sparse
+
+    def test_matches_dense_path(self):
+        for latitude in (-45, 0, 23.4, 39.75, 60):
+            with self.subTest(latitude=latitude):
+                sparse = self._check_against_dense(latitude)
+                self.assertAlmostEqual(len(sparse) / len(self.stamps), 0.5, delta=0.02)
+        self._check_against_dense(39.75, daylight_savings_on=True)
+
+    def test_polar_day_and_night(self):
+        sparse = self._check_against_dense(80)
+        june = (self.stamps >= np.datetime64('2001-06-01')) & (self.stamps < np.datetime64('2001-07-01'))
+        december = (self.stamps >= np.datetime64('2001-12-01')) & (self.stamps < np.datetime64('2002-01-01'))
+        self.assertTrue(np.all(sparse.daylight_mask[june]))
+        self.assertFalse(np.any(sparse.daylight_mask[december]))
+
+    def test_dense_fill_value(self):
+        sparse = daylight_position_series(self.stamps[:72], False, Angular(degrees=85), Angular(degrees=90),
+                                          Angular(degrees=40))
+        self.assertIsNone(sparse.incidence)
+        filled = sparse.dense(sparse.positions.altitude, fill_value=-1.0)
+        self.assertEqual(filled.shape, (72,))
+        self.assertTrue(np.all(filled[~sparse.daylight_mask] == -1.0))
+        self.assertTrue(np.all(filled[sparse.daylight_mask] >= 0))
+
+    def test_float32(self):
+        sparse = daylight_position_series(self.stamps, False, 97.3, 90, 39.75, self.surfaces, dtype=np.float32)
+        self.assertEqual(sparse.positions.azimuth.dtype, np.float32)
+        self.assertEqual(sparse.incidence.dtype, np.float32)
@@ -0,0 +1,264 @@
+import math
+import random
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+import numpy as np
+
+from solar_angles import batch, daylight, kernels, solar
+from solar_angles.events import altitude_crossings
+from solar_angles.solar import Angular, Site
+from solar_angles.trajectory import track_sun_angles
+
+# Randomized equivalence checks between the reference scalar functions in solar.py and every faster path.
+# Each family of cases is drawn from a seeded generator, so a failure is reproducible from the seed and case index in
+# the assertion message.  Besides uniformly drawn cases there are families which concentrate on the edges of the
+# formulas: time stamps just either side of sunrise and sunset (the sun-down cut-off), surfaces just either side of the
+# +/- 90 degree wall azimuth cut-off, sites close to the poles and time stamps close to solar noon, where the sun
+# passes due south or north and the altitude arcsine is near the ends of its domain.
+
+SEED = 20240730
+CASES = 150
+TOLERANCE_RADIANS = 1e-9
+
+
+class Case:
+    """
+    This class holds one randomly drawn set of arguments for the scalar functions.
+    """
+
+    __slots__ = ('time_stamp', 'daylight_savings_on', 'latitude', 'longitude', 'standard_meridian', 'surface_azimuth')
+
+    def __init__(self, time_stamp: datetime, daylight_savings_on: bool, latitude: float, longitude: float,
+                 standard_meridian: float, surface_azimuth: float):
+        self.time_stamp = time_stamp
+        self.daylight_savings_on = daylight_savings_on
+        self.latitude = latitude
+        self.longitude = longitude
+        self.standard_meridian = standard_meridian
+        self.surface_azimuth = surface_azimuth
+
+    def __repr__(self) -> str:
+        return (f"Case({self.time_stamp!r}, {self.daylight_savings_on}, latitude={self.latitude!r}, "
+                f"longitude={self.longitude!r}, standard_meridian={self.standard_meridian!r}, "
+                f"surface_azimuth={self.surface_azimuth!r})")
+
+    @property
+    def location(self) -> tuple:
+        return (Angular(degrees=self.longitude), Angular(degrees=self.standard_meridian),
+                Angular(degrees=self.latitude))
+
+    @property
+    def scalar_arguments(self) -> tuple:
+        return (self.time_stamp, self.daylight_savings_on) + self.location
+
+
+def _random_case(generator: random.Random, latitude_range=(-89.0, 89.0)) -> Case:
+    longitude = generator.uniform(-180.0, 180.0)
+    # the meridian is usually the nearest time zone, but not always, as with many real zones
+    standard_meridian = 15.0 * round(longitude / 15.0) + generator.choice([0.0, 0.0, 15.0, -15.0, 7.5])
+    time_stamp = datetime(generator.randint(1901, 2099), 1, 1) + timedelta(
+        seconds=generator.randint(0, 365 * 86400 - 1))
+    return Case(time_stamp, generator.random() < 0.3, generator.uniform(*latitude_range), longitude,
+                standard_meridian, generator.uniform(0.0, 720.0))
+
+
+def uniform_cases(seed: int = SEED, count: int = CASES) -> list:
+    generator = random.Random(seed)
+    return [_random_case(generator) for _ in range(count)]
+
+
+def polar_cases(seed: int = SEED, count: int = CASES) -> list:
+    generator = random.Random(seed + 1)
+    cases = []
+    for _ in range(count):
+        case = _random_case(generator, latitude_range=(89.0, 89.999))
+        case.latitude *= generator.choice([1, -1])
+        cases.append(case)
+    return cases
+
+
+def noon_cases(seed: int = SEED, count: int = CASES) -> list:
+    # clock times within a few seconds of solar noon
+    generator = random.Random(seed + 2)
+    cases = []
+    for _ in range(count):
+        case = _random_case(generator)
+        day = datetime(case.time_stamp.year, case.time_stamp.month, case.time_stamp.day)
+        noon_hours = 12 + 4 * (case.longitude - case.standard_meridian) / 60.0 - solar.equation_of_time(day) / 60.0
+        noon_hours += float(case.daylight_savings_on)
+        case.time_stamp = day + timedelta(seconds=round(noon_hours * 3600) + generator.randint(-3, 3))
+        cases.append(case)
+    return [case for case in cases if case.time_stamp.date() == (case.time_stamp - timedelta(seconds=3)).date()]
+
+
+def horizon_cases(seed: int = SEED, count: int = CASES) -> list:
+    # clock times a few seconds either side of sunrise or sunset
+    generator = random.Random(seed + 3)
+    cases = []
+    while len(cases) < count:
+        case = _random_case(generator, latitude_range=(-65.0, 65.0))
+        site = Site(*(Angular(degrees=x) for x in (case.latitude, case.longitude, case.standard_meridian)))
+        day = case.time_stamp.date()
+        _, rising, setting = altitude_crossings(site, day, day, daylight_savings_on=case.daylight_savings_on)
+        crossing = generator.choice([rising[0], setting[0]])
+        if np.isnat(crossing):
+            continue
+        offset = generator.choice([-1, 1]) * generator.randint(2, 5)
+        time_stamp = crossing.astype(datetime) + timedelta(seconds=offset)
+        if time_stamp.date() != day:
+            continue
+        case.time_stamp = time_stamp
+        cases.append(case)
+    return cases
+
+
+def wall_edge_cases(seed: int = SEED, count: int = CASES) -> list:
+    # surfaces turned just short of, or just past, the point where the sun goes behind them
+    generator = random.Random(seed + 4)
+    cases = []
+    while len(cases) < count:
+        case = _random_case(generator, latitude_range=(-60.0, 60.0))
+        azimuth = solar.azimuth_angle(*case.scalar_arguments)
+        if not azimuth.valued:
+            continue
+        edge = generator.choice([90.0, -90.0]) + generator.choice([1e-6, -1e-6])
+        surface_azimuth = azimuth.degrees - edge
+        if not 0.0 < surface_azimuth < 360.0:
+            continue
+        case.surface_azimuth = surface_azimuth
+        cases.append(case)
+    return cases
+
+
+FAMILIES = {
+    'uniform': uniform_cases,
+    'polar': polar_cases,
+    'noon': noon_cases,
+    'horizon': horizon_cases,
+    'wall_edge': wall_edge_cases,
+}
+
+
+class Expected:
+    """
+    This class holds the reference scalar results for one case, in radians, with None where unvalued.
+    """
+
+    __slots__ = ('hour_angle', 'altitude', 'azimuth', 'wall_azimuth', 'incidence')
+
+    def __init__(self, case: Case):
+        arguments = case.scalar_arguments
+        surface = Angular(degrees=case.surface_azimuth)
+        self.hour_angle = solar.hour_angle(*arguments[:4]).radians
+        self.altitude = solar.altitude_angle(*arguments).radians
+        self.azimuth = solar.azimuth_angle(*arguments).radians
+        self.wall_azimuth = solar.wall_azimuth_angle(*arguments, surface).radians
+        self.incidence = solar.solar_angle_of_incidence(*arguments, surface).radians
+
+
+class TestScalarToFastEquivalence(TestCase):
+
+    def assertAngle(self, actual, expected, message, circular=False):
+        if expected is None:
+            self.assertTrue(actual is None or math.isnan(actual), f"{message}: expected unvalued, got {actual}")
+            return
+        self.assertFalse(actual is None or math.isnan(actual), f"{message}: expected {expected}, got unvalued")
+        difference = actual - expected
+        if circular:
+            difference = (difference + math.pi) % (2 * math.pi) - math.pi
+        self.assertLessEqual(abs(difference), TOLERANCE_RADIANS, f"{message}: expected {expected}, got {actual}")
+
+    def _families(self):
+        for family, generate in FAMILIES.items():
+            cases = generate()
+            yield family, cases, [Expected(case) for case in cases]
+
+    def test_day_tables(self):
+        for family, cases, _ in self._families():
+            for index, case in enumerate(cases):
+                day = solar.day_of_year(case.time_stamp)
+                message = f"{family}[{index}] {case!r}"
+                self.assertEqual(solar.equation_of_time(case.time_stamp), solar._equation_of_time_minutes(day), message)
+                self.assertEqual(solar.declination_angle(case.time_stamp).degrees, solar._declination_degrees(day),
+                                 message)
+
+    def test_solar_position_record(self):
+        for family, cases, expected in self._families():
+            for index, (case, reference) in enumerate(zip(cases, expected)):
+                message = f"{family}[{index}] {case!r}"
+                position = solar.solar_position(*case.scalar_arguments)
+                self.assertAngle(position.hour_angle_radians, reference.hour_angle, message)
+                self.assertAngle(position.altitude_radians, reference.altitude, message)
+                self.assertAngle(position.azimuth_radians, reference.azimuth, message, circular=True)
+
+    def test_batch(self):
+        for family, cases, expected in self._families():
+            for index, (case, reference) in enumerate(zip(cases, expected)):
+                message = f"{family}[{index}] {case!r}"
+                positions = batch.solar_position_series([case.time_stamp], case.daylight_savings_on, case.longitude,
+                                                        case.standard_meridian, case.latitude)
+                self.assertAngle(positions.hour_angle[0], reference.hour_angle, message)
+                self.assertAngle(positions.altitude[0], reference.altitude, message)
+                self.assertAngle(positions.azimuth[0], reference.azimuth, message, circular=True)
+                self.assertAngle(batch.wall_azimuth_angle(positions, case.surface_azimuth)[0], reference.wall_azimuth,
+                                 message)
+                self.assertAngle(batch.solar_angle_of_incidence(positions, case.surface_azimuth)[0],
+                                 reference.incidence, message)
+
+    def test_kernels(self):
+        for backend in kernels.available_backends():
+            original = kernels.get_backend()
+            kernels.set_backend(backend)
+            try:
+                for family, cases, expected in self._families():
+                    for index, (case, reference) in enumerate(zip(cases, expected)):
+                        message = f"{backend} {family}[{index}] {case!r}"
+                        hour, altitude, azimuth, incidence = kernels.solar_position(
+                            solar.day_of_year(case.time_stamp), batch.clock_hours([case.time_stamp])[0],
+                            case.daylight_savings_on, case.longitude, case.standard_meridian, case.latitude,
+                            case.surface_azimuth
+                        )
+                        self.assertAngle(hour, reference.hour_angle, message)
+                        self.assertAngle(altitude, reference.altitude, message)
+                        self.assertAngle(azimuth, reference.azimuth, message, circular=True)
+                        self.assertAngle(incidence, reference.incidence, message)
+            finally:
+                kernels.set_backend(original)
+
+    def test_daylight(self):
+        for family, cases, expected in self._families():
+            for index, (case, reference) in enumerate(zip(cases, expected)):
+                message = f"{family}[{index}] {case!r}"
+                series = daylight.daylight_position_series(
+                    [case.time_stamp], case.daylight_savings_on, case.longitude, case.standard_meridian,
+                    case.latitude, case.surface_azimuth
+                )
+                self.assertAngle(series.dense(series.positions.azimuth)[0], reference.azimuth, message, circular=True)
+                self.assertAngle(series.dense(series.incidence)[0], reference.incidence, message)
+
+    def test_trajectory(self):
+        # every case is a different point of one track, so the whole family goes through in a single call
+        for family, cases, expected in self._families():
+            track = track_sun_angles(
+                [case.time_stamp for case in cases], np.array([case.daylight_savings_on for case in cases]),
+                [case.latitude for case in cases], [case.longitude for case in cases], 0.0,
+                [case.standard_meridian for case in cases]
+            )
+            for index, (case, reference) in enumerate(zip(cases, expected)):
+                message = f"{family}[{index}] {case!r}"
+                self.assertAngle(track.altitude[index], reference.altitude, message)
+                self.assertAngle(track.azimuth[index], reference.azimuth, message, circular=True)
+
+    def test_edge_families_reach_the_edges(self):
+        # guard against the generators drifting away from what they are meant to exercise
+        horizon = [Expected(case) for case in horizon_cases()]
+        self.assertTrue(any(x.azimuth is None for x in horizon) and any(x.azimuth is not None for x in horizon))
+        for reference in horizon:
+            self.assertLess(abs(reference.altitude), math.radians(0.1))
+        walls = [Expected(case) for case in wall_edge_cases()]
+        self.assertTrue(any(x.wall_azimuth is None for x in walls) and any(x.wall_azimuth is not None for x in walls))
+        for case in polar_cases():
+            self.assertGreater(abs(case.latitude), 89.0)
+        for case in noon_cases():
+            self.assertLess(abs(Expected(case).hour_angle), math.radians(0.1), repr(case))
@@ -0,0 +1,170 @@
+from datetime import date, datetime, timedelta
+from unittest import TestCase
+
+import numpy as np
+
+from solar_angles import events, solar
+from solar_angles.solar import Angular, Site
+
+
+def _as_datetime(stamp: np.datetime64) -> datetime:
+    return stamp.astype('datetime64[s]').astype(datetime)
+
+
+class TestAltitudeCrossings(TestCase):
+
+    def setUp(self):
+        self.site = Site(Angular(degrees=39.75), Angular(degrees=105.2), Angular(degrees=105), 'Golden, CO')
+
+    def _altitude(self, stamp, dst_on=False) -> float:
+        return solar.altitude_angle(
+            _as_datetime(stamp), dst_on, self.site.longitude, self.site.standard_meridian, self.site.latitude
+        ).degrees
+
+    def test_sunrise_sunset(self):
+        dates, rising, setting = events.altitude_crossings(self.site, date(2001, 1, 1), date(2001, 12, 31))
+        self.assertEqual(len(dates), 365)
+        for i in range(0, 365, 15):
+            # one second either side of the instant, the altitude must be on either side of the threshold
+            self.assertLess(self._altitude(rising[i] - np.timedelta64(1, 's')), 0)
+            self.assertGreater(self._altitude(rising[i] + np.timedelta64(1, 's')), 0)
+            self.assertGreater(self._altitude(setting[i] - np.timedelta64(1, 's')), 0)
+            self.assertLess(self._altitude(setting[i] + np.timedelta64(1, 's')), 0)
+
+    def test_threshold_and_daylight_savings(self):
+        _, rising, setting = events.altitude_crossings(self.site, date(2001, 7, 21), date(2001, 7, 21), -6.0, True)
+        self.assertAlmostEqual(self._altitude(rising[0], True), -6.0, delta=0.01)
+        self.assertAlmostEqual(self._altitude(setting[0], True), -6.0, delta=0.01)
+        _, standard_rising, _ = events.altitude_crossings(self.site, date(2001, 7, 21), date(2001, 7, 21), -6.0)
+        self.assertEqual(rising[0] - standard_rising[0], np.timedelta64(3600, 's'))
+
+    def test_polar_day_and_night(self):
+        arctic = Site(Angular(degrees=78), Angular(degrees=-15), Angular(degrees=-15))
+        _, rising, setting = events.altitude_crossings(arctic, date(2001, 6, 21), date(2001, 6, 21))
+        self.assertTrue(np.isnat(rising[0]))
+        self.assertTrue(np.isnat(setting[0]))
+        _, rising, _ = events.altitude_crossings(arctic, date(2001, 12, 21), date(2001, 12, 21))
+        self.assertTrue(np.isnat(rising[0]))
+
+    def test_bad_range(self):
+        with self.assertRaises(ValueError):
+            events.altitude_crossings(self.site, date(2001, 2, 1), date(2001, 1, 1))
+
+
+class TestAzimuthCrossings(TestCase):
+
+    def setUp(self):
+        self.site = Site(Angular(degrees=39.75), Angular(degrees=105.2), Angular(degrees=105), 'Golden, CO')
+
+    def test_due_south(self):
+        times, directions = events.azimuth_crossings(self.site, date(2001, 3, 1), date(2001, 3, 31), 180.0)
+        self.assertEqual(len(times), 31)
+        self.assertTrue(np.all(directions == 1))
+        for stamp in times:
+            dt = _as_datetime(stamp)
+            before = solar.azimuth_angle(dt - timedelta(seconds=2), False, self.site.longitude,
+                                         self.site.standard_meridian, self.site.latitude).degrees
+            after = solar.azimuth_angle(dt + timedelta(seconds=2), False, self.site.longitude,
+                                        self.site.standard_meridian, self.site.latitude).degrees
+            self.assertLess(before, 180.0)
+            self.assertGreater(after, 180.0)
+
+    def test_wall_boundaries_match_wall_azimuth(self):
+        wall = Angular(degrees=180)
+        for boundary in [90.0, 270.0]:
+            times, _ = events.azimuth_crossings(self.site, date(2001, 6, 21), date(2001, 6, 21), boundary)
+            self.assertEqual(len(times), 1)
+            dt = _as_datetime(times[0])
+            lit = [
+                solar.wall_azimuth_angle(dt + timedelta(seconds=s), False, self.site.longitude,
+                                         self.site.standard_meridian, self.site.latitude, wall).valued
+                for s in [-2, 2]
+            ]
+            self.assertEqual(lit, [False, True] if boundary == 90.0 else [True, False])
+
+    def test_no_crossing_when_never_reached(self):
+        # the summer sun in Golden never gets around to due north
+        times, directions = events.azimuth_crossings(self.site, date(2001, 6, 21), date(2001, 6, 22), 0.0)
+        self.assertEqual(len(times), 0)
+        self.assertEqual(len(directions), 0)
+
+    def test_midnight_sun_passes_north(self):
+        # above the arctic circle in June the sun stays up and passes due north around local midnight
+        arctic = Site(Angular(degrees=75), Angular(degrees=-20), Angular(degrees=-15))
+        for target in [0.0, 360.0]:
+            times, directions = events.azimuth_crossings(arctic, date(2001, 6, 20), date(2001, 6, 22), target)
+            self.assertEqual(len(times), 3)
+            self.assertTrue(np.all(directions == 1))
+            for stamp in times:
+                dt = _as_datetime(stamp)
+                self.assertEqual(dt.hour, 23)  # solar midnight is about 20 minutes before clock midnight here
+                before = solar.azimuth_angle(dt - timedelta(seconds=2), False, arctic.longitude,
+                                             arctic.standard_meridian, arctic.latitude).degrees
+                after = solar.azimuth_angle(dt + timedelta(seconds=2), False, arctic.longitude,
+                                            arctic.standard_meridian, arctic.latitude).degrees
+                self.assertGreater(before, 359.0)
+                self.assertLess(after, 1.0)
+
+    def test_bad_samples(self):
+        with self.assertRaises(ValueError):
+            events.azimuth_crossings(self.site, date(2001, 6, 21), date(2001, 6, 21), 180.0, samples_per_day=1)
+
+
+class TestSurfaceSunWindows(TestCase):
+
+    def setUp(self):
+        self.site = Site(Angular(degrees=39.75), Angular(degrees=105.2), Angular(degrees=105), 'Golden, CO')
+
+    def _lit(self, dt: datetime, surface: Angular) -> bool:
+        return solar.solar_angle_of_incidence(
+            dt, False, self.site.longitude, self.site.standard_meridian, self.site.latitude, surface
+        ).valued
+
+    def test_windows_match_incidence(self):
+        surfaces = [Angular(degrees=90), Angular(degrees=180), Angular(degrees=270), Angular(degrees=360),
+                    Angular(degrees=450)]
+        windows = events.surface_sun_windows(self.site, date(2001, 6, 20), date(2001, 6, 22), surfaces)
+        self.assertEqual(windows.for_surface(0), windows.for_surface(4))
+        for surface_index, surface in enumerate(surfaces):
+            surface_windows = windows.for_surface(surface_index)
+            # one window a day; the north wall only sees the morning sun, as wall_azimuth_angle does not wrap around
+            self.assertEqual(len(surface_windows), 3)
+            for start, end in surface_windows:
+                self.assertLess(start, end)
+                start, end = _as_datetime(start), _as_datetime(end)
+                self.assertFalse(self._lit(start - timedelta(seconds=2), surface))
+                self.assertTrue(self._lit(start + timedelta(seconds=2), surface))
+                self.assertTrue(self._lit(end - timedelta(seconds=2), surface))
+                self.assertFalse(self._lit(end + timedelta(seconds=2), surface))
+
+    def test_minute_scan_agrees(self):
+        surface = Angular(degrees=135)
+        windows = events.surface_sun_windows(self.site, date(2001, 2, 1), date(2001, 2, 1), [surface])
+        (start, end), = windows.for_surface(0)
+        start, end = _as_datetime(start), _as_datetime(end)
+        for minute in range(0, 24 * 60):
+            dt = datetime(2001, 2, 1) + timedelta(minutes=minute)
+            if abs((dt - start).total_seconds()) > 2 and abs((dt - end).total_seconds()) > 2:
+                self.assertEqual(self._lit(dt, surface), start < dt < end)
+
+    def test_midnight_sun_minute_scan_agrees(self):
+        # the sun passes north around midnight, where the scalar cut-off from the raw azimuth difference flips
+        arctic = Site(Angular(degrees=75), Angular(degrees=-20), Angular(degrees=-15))
+        surfaces = [0, 20, 90, 180, 340]
+        windows = events.surface_sun_windows(arctic, date(2001, 6, 21), date(2001, 6, 21), surfaces)
+        for surface_index, surface in enumerate(surfaces):
+            surface_windows = [(_as_datetime(start), _as_datetime(end))
+                               for start, end in windows.for_surface(surface_index)]
+            self.assertTrue(surface_windows)
+            for minute in range(0, 24 * 60):
+                dt = datetime(2001, 6, 21) + timedelta(minutes=minute)
+                if any(abs((dt - x).total_seconds()) <= 2 for window in surface_windows for x in window):
+                    continue
+                lit = solar.solar_angle_of_incidence(dt, False, arctic.longitude, arctic.standard_meridian,
+                                                     arctic.latitude, Angular(degrees=surface)).valued
+                self.assertEqual(lit, any(start < dt < end for start, end in surface_windows))
+
+    def test_polar_night_has_no_windows(self):
+        arctic = Site(Angular(degrees=78), Angular(degrees=-15), Angular(degrees=-15))
+        windows = events.surface_sun_windows(arctic, date(2001, 12, 21), date(2001, 12, 22), [180])
+        self.assertEqual(len(windows), 0)
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+import numpy as np
+
+from solar_angles import batch, irradiance, solar
+from solar_angles.exposure import Surface, exposure_matrix, zone_membership
+from solar_angles.solar import Angular, Site
+
+
+class TestExposureMatrix(TestCase):
+
+    def setUp(self):
+        self.site = Site(Angular(degrees=39.75), Angular(degrees=105.2), Angular(degrees=105), 'Golden, CO')
+        self.stamps = [datetime(2001, 7, 21) + timedelta(minutes=30 * i) for i in range(48)]
+        self.irradiation = np.linspace(200.0, 400.0, len(self.stamps))
+        self.surfaces = [
+            Surface('office south', 'office', Angular(degrees=180), area=10.0),
+            Surface('office west', 'office', 270, area=5.0),
+            Surface('lobby east', 'lobby', 90, area=8.0),
+            Surface('lobby roof', 'lobby', 180, tilt=15, area=20.0),
+            Surface('store north', 'store', 0, area=3.0),
+        ]
+
+    def test_matches_scalar(self):
+        result = exposure_matrix(self.site, self.surfaces, self.stamps, self.irradiation, keep_surface_values=True)
+        self.assertEqual(result.zones, ['office', 'lobby', 'store'])
+        self.assertEqual(result.values.shape, (3, len(self.stamps)))
+        for i, dt in enumerate(self.stamps):
+            office = 0.0
+            for surface in self.surfaces[:2]:
+                azimuth = surface.azimuth if isinstance(surface.azimuth, Angular) else Angular(degrees=surface.azimuth)
+                incidence = solar.solar_angle_of_incidence(dt, False, self.site.longitude,
+                                                           self.site.standard_meridian, self.site.latitude, azimuth)
+                if incidence.valued:
+                    office += surface.area * solar.direct_radiation_on_surface(
+                        dt, False, self.site.longitude, self.site.standard_meridian, self.site.latitude, azimuth,
+                        self.irradiation[i])
+            self.assertAlmostEqual(result.for_zone('office')[i], office, delta=1e-9)
+
+    def test_tilted_surfaces_and_zone_sums(self):
+        result = exposure_matrix(self.site, self.surfaces, self.stamps, self.irradiation, keep_surface_values=True)
+        positions = batch.solar_position_series(self.stamps, False, 105.2, 105, 39.75)
+        roof = irradiance.surface_cos_incidence(positions, [180], 15)[:, 0] * self.irradiation
+        np.testing.assert_allclose(result.surface_values[:, 3], roof)
+        lobby = 8.0 * result.surface_values[:, 2] + 20.0 * roof
+        np.testing.assert_allclose(result.for_zone('lobby'), lobby)
+        self.assertTrue(np.all(result.values >= 0))
+        self.assertTrue(np.all(result.values[:, :8] == 0))  # before sunrise
+
+    def test_walls_and_vertical_tilts_agree(self):
+        # the summer sun passes north of east and west here, where the raw difference cut-off matters
+        stamps = [datetime(2001, 6, 21) + timedelta(minutes=15 * i) for i in range(96)]
+        azimuths = [0, 10, 350, Angular(degrees=355), 45, 315]
+        walls = [Surface(f'wall {i}', f'zone {i}', azimuth) for i, azimuth in enumerate(azimuths)]
+        vertical = [Surface(f'wall {i}', f'zone {i}', azimuth, tilt=90) for i, azimuth in enumerate(azimuths)]
+        wall_result = exposure_matrix(self.site, walls, stamps, 500.0, keep_surface_values=True)
+        vertical_result = exposure_matrix(self.site, vertical, stamps, 500.0, keep_surface_values=True)
+        np.testing.assert_array_equal(wall_result.values, vertical_result.values)
+        positions = batch.solar_position_series(stamps, False, 105.2, 105, 39.75)
+        np.testing.assert_allclose(wall_result.surface_values,
+                                   batch.direct_radiation_on_surface(positions, azimuths, 500.0), atol=1e-9)
+
+    def test_single_irradiation_value(self):
+        result = exposure_matrix(self.site, self.surfaces, self.stamps, 300.0)
+        self.assertIsNone(result.surface_values)
+        self.assertEqual(result.values.shape, (3, len(self.stamps)))
+        self.assertTrue(result.values.flags['C_CONTIGUOUS'])
+
+    def test_membership(self):
+        zones, membership = zone_membership(self.surfaces)
+        self.assertEqual(zones, ['office', 'lobby', 'store'])
+        np.testing.assert_array_equal(membership.sum(axis=0), [15.0, 28.0, 3.0])
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            exposure_matrix(self.site, [], self.stamps, 300.0)
+        with self.assertRaises(ValueError):
+            Surface('bad', 'zone', Angular())
+        with self.assertRaises(ValueError):
+            Surface('bad', 'zone', 180, area=-1)
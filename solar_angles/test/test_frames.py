@@ -0,0 +1,72 @@
+from datetime import datetime
+from unittest import TestCase, skipIf
+
+import numpy as np
+
+from solar_angles import solar
+from solar_angles.solar import Angular, Site
+
+try:
+    import pandas as pd
+    from solar_angles import frames
+except ImportError:  # pragma: no cover
+    pd = None
+
+
+@skipIf(pd is None, "pandas is not installed")
+class TestSolarDataFrame(TestCase):
+
+    def setUp(self):
+        self.site = Site(Angular(degrees=39.75), Angular(degrees=105.2), Angular(degrees=105), 'Golden, CO')
+
+    def test_naive_index_matches_scalar(self):
+        index = pd.date_range('2001-07-21', periods=48, freq='30min')
+        frame = frames.solar_dataframe(index, self.site, [Angular(degrees=90), 270], daylight_savings_on=True)
+        self.assertEqual(list(frame.columns), ['hour_angle', 'altitude', 'azimuth', 'declination', 'equation_of_time',
+                                               'incidence_90', 'incidence_270'])
+        self.assertIs(frame.index, index)
+        for dt, row in zip(index.to_pydatetime(), frame.itertuples()):
+            altitude = solar.altitude_angle(
+                dt, True, self.site.longitude, self.site.standard_meridian, self.site.latitude
+            )
+            self.assertAlmostEqual(row.altitude, altitude.degrees, delta=1e-9)
+            incidence = solar.solar_angle_of_incidence(
+                dt, True, self.site.longitude, self.site.standard_meridian, self.site.latitude, Angular(degrees=270)
+            )
+            if incidence.valued:
+                self.assertAlmostEqual(row.incidence_270, incidence.degrees, delta=1e-9)
+            else:
+                self.assertTrue(np.isnan(row.incidence_270))
+
+    def test_aware_index_uses_standard_time(self):
+        # a summer time in Denver is on daylight savings, which the scalar functions need to be told about
+        index = pd.date_range('2001-07-21 06:00', periods=12, freq='h', tz='America/Denver')
+        frame = frames.solar_dataframe(index, self.site, {'south': Angular(degrees=180)})
+        for dt, row in zip(index.tz_localize(None).to_pydatetime(), frame.itertuples()):
+            altitude = solar.altitude_angle(
+                dt, True, self.site.longitude, self.site.standard_meridian, self.site.latitude
+            )
+            self.assertAlmostEqual(row.altitude, altitude.degrees, delta=1e-9)
+        self.assertIn('incidence_south', frame.columns)
+
+    def test_local_standard_clock(self):
+        index = pd.DatetimeIndex([datetime(2001, 1, 1, 19)]).tz_localize('UTC')
+        clock = frames.local_standard_clock(index, self.site)
+        self.assertEqual(clock[0], np.datetime64('2001-01-01T12:00:00'))
+
+    def test_array_of_surfaces(self):
+        index = pd.date_range('2001-07-21', periods=24, freq='h')
+        expected = frames.solar_dataframe(index, self.site, [90, 180])
+        for surfaces in [np.array([90.0, 180.0]), pd.Series([90.0, 180.0])]:
+            frame = frames.solar_dataframe(index, self.site, surfaces)
+            pd.testing.assert_frame_equal(frame, expected)
+        self.assertEqual(len(frames.solar_dataframe(index, self.site, []).columns), 5)
+
+    def test_duplicate_surface_names(self):
+        index = pd.date_range('2001-07-21', periods=24, freq='h')
+        with self.assertRaises(ValueError):
+            frames.solar_dataframe(index, self.site, [Angular(degrees=90), 90.0])
+        with self.assertRaises(ValueError):
+            frames.solar_dataframe(index, self.site, np.array([90.0, 90.0000001]))
+        frame = frames.solar_dataframe(index, self.site, {'a': 90, 'b': 90.0000001})
+        self.assertEqual(list(frame.columns[-2:]), ['incidence_a', 'incidence_b'])
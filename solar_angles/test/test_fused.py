@@ -0,0 +1,74 @@
+import math
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+from solar_angles import fused, solar
+from solar_angles.solar import Angular
+
+
+def _chained(dt: datetime, dst: bool, longitude: float, standard_meridian: float, latitude: float,
+             surface: float) -> tuple:
+    location = (Angular(degrees=longitude), Angular(degrees=standard_meridian), Angular(degrees=latitude))
+    values = (
+        solar.hour_angle(dt, dst, *location[:2]).radians,
+        solar.altitude_angle(dt, dst, *location).radians,
+        solar.azimuth_angle(dt, dst, *location).radians,
+        solar.solar_angle_of_incidence(dt, dst, *location, Angular(degrees=surface)).radians,
+    )
+    return tuple(math.nan if x is None else x for x in values)
+
+
+class TestFusedKernel(TestCase):
+
+    def _assert_same(self, expected: tuple, actual: tuple):
+        self.assertEqual(len(actual), 4)
+        for e, a in zip(expected, actual):
+            if math.isnan(e):
+                self.assertTrue(math.isnan(a))
+            else:
+                self.assertAlmostEqual(e, a, delta=1e-12)
+
+    def test_matches_chained_functions(self):
+        sites = [(105.2, 105, 39.75), (0, 0, 0), (-18.92, -15, 69.68), (-151.21, -150, -33.87)]
+        stamps = [datetime(2011, 1, 1, 0, 0) + timedelta(minutes=97 * i) for i in range(400)]
+        stamps += [datetime(2012, 2, 29, 13, 5, 30), datetime(2012, 12, 31, 23, 59, 59), datetime(2000, 3, 1, 9)]
+        for site in sites:
+            for surface in [0, 90, 180, 270, 405]:
+                kernel = fused.site_kernel(*site, surface)
+                for dt in stamps:
+                    for dst in [False, True]:
+                        self._assert_same(_chained(dt, dst, *site, surface), kernel(dt, dst))
+
+    def test_returns_floats(self):
+        result = fused.solar_position(datetime(2001, 7, 21, 12, 30), False, 105.2, 105, 39.75, 180)
+        self.assertIsInstance(result, tuple)
+        self.assertTrue(all(type(x) is float for x in result))
+        self.assertFalse(any(math.isnan(x) for x in result))
+
+    def test_without_surface(self):
+        dt = datetime(2001, 7, 21, 12, 30)
+        hour, altitude, azimuth, incidence = fused.solar_position(dt, False, 105.2, 105, 39.75)
+        position = solar.solar_position(dt, False, Angular(degrees=105.2), Angular(degrees=105),
+                                        Angular(degrees=39.75))
+        self.assertAlmostEqual(hour, position.hour_angle_radians, delta=1e-12)
+        self.assertAlmostEqual(altitude, position.altitude_radians, delta=1e-12)
+        self.assertAlmostEqual(azimuth, position.azimuth_radians, delta=1e-12)
+        self.assertTrue(math.isnan(incidence))
+
+    def test_sun_down(self):
+        hour, altitude, azimuth, incidence = fused.solar_position(datetime(2001, 7, 21, 2), False, 105.2, 105, 39.75,
+                                                                  180)
+        self.assertLess(altitude, 0)
+        self.assertTrue(math.isnan(azimuth))
+        self.assertTrue(math.isnan(incidence))
+
+    def test_benchmark(self):
+        results = fused.benchmark(count=200, repeat=1)
+        self.assertEqual(set(results), {'chained', 'solar_position', 'fused', 'site_kernel', 'speedup'})
+        self.assertGreater(results['speedup'], 1)
+
+    def test_does_not_need_numpy(self):
+        script = 'import sys; import solar_angles.fused; sys.exit("numpy" in sys.modules)'
+        self.assertEqual(subprocess.run([sys.executable, '-c', script]).returncode, 0)
@@ -0,0 +1,80 @@
+import tempfile
+from datetime import datetime
+from unittest import TestCase
+
+import numpy as np
+
+from solar_angles import grid, solar
+from solar_angles.solar import Angular
+
+
+class TestSunPositionGrid(TestCase):
+
+    def setUp(self):
+        self.latitudes = np.array([25.0, 32.5, 40.0, 47.5])
+        self.longitudes = np.array([80.0, 90.0, 100.0])
+        self.stamps = [datetime(2001, 7, 21, 10), datetime(2001, 7, 21, 16, 30), datetime(2001, 12, 21, 22)]
+
+    def _check_against_scalar(self, stamps, surface_degrees: float) -> grid.SolarGrid:
+        result = grid.sun_position_grid(stamps, True, self.latitudes, self.longitudes, 90,
+                                        surface_azimuth=surface_degrees)
+        self.assertEqual(result.altitude.shape, (len(stamps), 4, 3))
+        for t, dt in enumerate(stamps):
+            for i, latitude in enumerate(self.latitudes):
+                for j, longitude in enumerate(self.longitudes):
+                    args = (dt, True, Angular(degrees=longitude), Angular(degrees=90), Angular(degrees=latitude))
+                    self.assertAlmostEqual(result.altitude[t, i, j], solar.altitude_angle(*args).radians, delta=1e-9)
+                    azimuth = solar.azimuth_angle(*args)
+                    incidence = solar.solar_angle_of_incidence(*args, Angular(degrees=surface_degrees))
+                    if azimuth.valued:
+                        self.assertAlmostEqual(result.azimuth[t, i, j], azimuth.radians, delta=1e-9)
+                    else:
+                        self.assertTrue(np.isnan(result.azimuth[t, i, j]))
+                    if incidence.valued:
+                        self.assertAlmostEqual(result.incidence[t, i, j], incidence.radians, delta=1e-9)
+                    else:
+                        self.assertTrue(np.isnan(result.incidence[t, i, j]))
+        return result
+
+    def test_matches_scalar(self):
+        self._check_against_scalar(self.stamps, 180)
+
+    def test_north_facing_walls_match_scalar(self):
+        # summer mornings and evenings put the sun either side of north, where the scalar library cuts the wall
+        # azimuth off from the raw difference of the solar and surface azimuth
+        stamps = [datetime(2001, 6, 21, 6), datetime(2001, 6, 21, 8), datetime(2001, 6, 21, 19, 30),
+                  datetime(2001, 6, 21, 20, 15)]
+        north = self._check_against_scalar(stamps, 0)
+        self._check_against_scalar(stamps, 350)
+        # the evening sun is less than 90 degrees around from north, but counts as behind the north wall
+        evening = ~np.isnan(north.azimuth[2]) & (north.azimuth[2] > np.radians(270))
+        self.assertTrue(np.any(evening))
+        self.assertTrue(np.all(np.isnan(north.incidence[2][evening])))
+
+    def test_two_dimensional_inputs_and_single_stamp(self):
+        longitude_grid, latitude_grid = np.meshgrid(self.longitudes, self.latitudes)
+        meshed = grid.sun_position_grid(self.stamps[0], True, latitude_grid, longitude_grid, 90)
+        axes = grid.sun_position_grid(self.stamps[:1], True, self.latitudes, self.longitudes, 90)
+        self.assertEqual(meshed.altitude.shape, (1, 4, 3))
+        self.assertIsNone(meshed.incidence)
+        np.testing.assert_array_equal(meshed.altitude, axes.altitude)
+
+    def test_memory_mapped_outputs(self):
+        with tempfile.TemporaryDirectory() as directory:
+            out = grid.allocate_outputs((3, 4, 3), with_incidence=True, directory=directory)
+            self.assertIsInstance(out.altitude, np.memmap)
+            grid.sun_position_grid(self.stamps, True, self.latitudes, self.longitudes, 90, 180, out=out)
+            expected = grid.sun_position_grid(self.stamps, True, self.latitudes, self.longitudes, 90, 180)
+            np.testing.assert_array_equal(np.load(f"{directory}/altitude.npy"), expected.altitude)
+            np.testing.assert_array_equal(np.load(f"{directory}/incidence.npy"), expected.incidence)
+            del out
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            grid.sun_position_grid(self.stamps, True, self.latitudes, np.zeros((2, 2)), 90)
+        with self.assertRaises(ValueError):
+            grid.sun_position_grid(self.stamps, True, self.latitudes, self.longitudes, 90,
+                                   out=grid.allocate_outputs((1, 4, 3)))
+        with self.assertRaises(ValueError):
+            grid.sun_position_grid(self.stamps, True, self.latitudes, self.longitudes, 90, surface_azimuth=180,
+                                   out=grid.allocate_outputs((3, 4, 3)))
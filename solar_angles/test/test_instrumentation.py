@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+from datetime import datetime
+from unittest import TestCase
+
+from solar_angles import instrumentation, solar
+from solar_angles.solar import Angular
+
+
+class TestProfilingContextManager(TestCase):
+
+    def test_counts_nested_calls(self):
+        dt = datetime(2001, 7, 21, 10, 00, 00)
+        longitude = Angular(degrees=85)
+        standard_meridian = Angular(degrees=90)
+        latitude = Angular(degrees=40)
+        with instrumentation.profiling() as stats:
+            solar.altitude_angle(dt, True, longitude, standard_meridian, latitude)
+        functions = stats.as_dict()['functions']
+        self.assertEqual(functions['altitude_angle']['calls'], 1)
+        self.assertEqual(functions['hour_angle']['calls'], 1)
+        self.assertEqual(functions['declination_angle']['calls'], 1)
+        self.assertEqual(functions['day_of_year']['calls'], 2)
+        self.assertGreaterEqual(functions['altitude_angle']['cumulative_seconds'], 0.0)
+        # declination, hour angle, and the altitude result
+        self.assertEqual(stats.as_dict()['angular_allocations'], 3)
+
+    def test_restores_originals(self):
+        original = solar.azimuth_angle
+        original_init = Angular.__init__
+        original_factory = Angular.__dict__['from_radians']
+        with instrumentation.profiling():
+            self.assertTrue(instrumentation.is_enabled())
+            self.assertIsNot(solar.azimuth_angle, original)
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertIs(solar.azimuth_angle, original)
+        self.assertIs(Angular.__init__, original_init)
+        self.assertIs(Angular.__dict__['from_radians'], original_factory)
+
+    def test_counts_survive_exceptions(self):
+        with instrumentation.profiling() as stats:
+            with self.assertRaises(ValueError):
+                solar.hour_angle(datetime.now(), True, Angular(), Angular())
+        self.assertEqual(stats.as_dict()['functions']['hour_angle']['calls'], 1)
+
+    def test_nothing_recorded_when_disabled(self):
+        instrumentation.counters.reset()
+        solar.declination_angle(datetime(2001, 7, 21))
+        instrumentation.record_cache_access('anything', True)
+        self.assertEqual(instrumentation.counters.as_dict()['functions'], {})
+        self.assertEqual(instrumentation.counters.as_dict()['caches'], {})
+
+
+class TestExport(TestCase):
+
+    def test_cache_hit_rate(self):
+        with instrumentation.profiling() as stats:
+            instrumentation.record_cache_access('declination', True)
+            instrumentation.record_cache_access('declination', True)
+            instrumentation.record_cache_access('declination', False)
+        self.assertAlmostEqual(stats.as_dict()['caches']['declination']['hit_rate'], 2 / 3)
+
+    def test_prometheus(self):
+        with instrumentation.profiling() as stats:
+            solar.declination_angle(datetime(2001, 7, 21))
+            instrumentation.record_cache_access('declination', False)
+        text = stats.to_prometheus()
+        self.assertIn('# TYPE solar_angles_calls_total counter', text)
+        self.assertIn('solar_angles_calls_total{function="declination_angle"} 1', text)
+        self.assertIn('solar_angles_cache_misses_total{cache="declination"} 1', text)
+        self.assertIn('solar_angles_angular_allocations_total 1', text)
+        self.assertTrue(text.endswith('\n'))
+
+
+class TestEnvironmentVariable(TestCase):
+
+    def test_enabled_at_import(self):
+        script = 'from solar_angles import instrumentation, solar; print(instrumentation.is_enabled())'
+        environment = dict(os.environ, **{instrumentation.ENVIRONMENT_VARIABLE: '1'})
+        output = subprocess.check_output([sys.executable, '-c', script], env=environment, text=True)
+        self.assertEqual(output.strip(), 'True')
+        environment[instrumentation.ENVIRONMENT_VARIABLE] = '0'
+        output = subprocess.check_output([sys.executable, '-c', script], env=environment, text=True)
+        self.assertEqual(output.strip(), 'False')
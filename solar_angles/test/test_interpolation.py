@@ -0,0 +1,90 @@
+from datetime import datetime
+from unittest import TestCase
+
+import numpy as np
+
+from solar_angles import batch, interpolation
+from solar_angles.interpolation import interpolated_position_series
+
+
+def _direction(positions: batch.SolarPositionSeries) -> np.ndarray:
+    altitude = positions.altitude.astype(np.float64)
+    azimuth = np.nan_to_num(positions.azimuth.astype(np.float64))
+    return np.stack([np.cos(altitude) * np.sin(azimuth), np.cos(altitude) * np.cos(azimuth), np.sin(altitude)])
+
+
+def _angle_between(first: batch.SolarPositionSeries, second: batch.SolarPositionSeries) -> np.ndarray:
+    a, b = _direction(first), _direction(second)
+    return np.arctan2(np.linalg.norm(np.cross(a, b, axis=0), axis=0), np.sum(a * b, axis=0))
+
+
+class TestInterpolatedPositionSeries(TestCase):
+
+    def setUp(self):
+        # two weeks of 2 minute steps, across a month end and into the next year
+        self.stamps = np.arange(np.datetime64('2011-12-25T00:01:00'), np.datetime64('2012-01-08'),
+                                np.timedelta64(120, 's'))
+
+    def _check(self, latitude: float, coarse_step_seconds: int = 3600, daylight_savings_on=False,
+               dtype=np.float64):
+        exact = batch.solar_position_series(self.stamps, daylight_savings_on, 105.2, 105, latitude)
+        result = interpolated_position_series(self.stamps, daylight_savings_on, 105.2, 105, latitude,
+                                              coarse_step_seconds, dtype)
+        both_up = ~np.isnan(exact.azimuth) & ~np.isnan(result.positions.azimuth)
+        error = _angle_between(exact, result.positions)
+        self.assertTrue(np.all(error[both_up] <= result.error_bound[both_up]))
+        # where the two disagree about the sun being up, the sun is within the error bound of the horizon
+        disagree = np.isnan(exact.azimuth) != np.isnan(result.positions.azimuth)
+        self.assertTrue(np.all(np.abs(exact.altitude[disagree]) <= result.error_bound[disagree]))
+        np.testing.assert_allclose(result.positions.hour_angle, exact.hour_angle, rtol=0, atol=1e-6)
+        np.testing.assert_array_equal(result.positions.declination, exact.declination.astype(dtype))
+        np.testing.assert_array_equal(result.positions.equation_of_time, exact.equation_of_time.astype(dtype))
+        return result, error
+
+    def test_exact_up_to_round_off(self):
+        for latitude in [0, 23.3, 39.75, -33.95, 78.2]:
+            for coarse_step_seconds in [600, 3600, 10800]:
+                result, error = self._check(latitude, coarse_step_seconds)
+                self.assertTrue(np.all(result.error_bound > 0))
+                self.assertLess(np.max(result.error_bound), 1e-7)  # only near the zenith is it above 1e-13
+                self.assertLess(np.max(error), 1e-12)
+
+    def test_float32_within_bound(self):
+        for latitude in [0, 39.75, 78.2]:
+            result, error = self._check(latitude, dtype=np.float32)
+            # the stored rounding dominates the bound, and is what the error comes from
+            self.assertGreater(np.max(error), 1e-8)
+            self.assertLess(np.max(result.error_bound), np.radians(batch.FLOAT32_MAX_ERROR_DEGREES['azimuth']))
+
+    def test_daylight_savings_flags(self):
+        flags = (np.arange(len(self.stamps)) // 500) % 2 == 1
+        self._check(39.75, daylight_savings_on=flags)
+        self._check(39.75, daylight_savings_on=True)
+
+    def test_sparse_time_stamps(self):
+        stamps = [datetime(2001, 3, 21, 10, 7), datetime(2001, 7, 21, 15, 59, 30), datetime(2003, 12, 1, 8, 30)]
+        exact = batch.solar_position_series(stamps, False, 105.2, 105, 39.75)
+        result = interpolated_position_series(stamps, False, 105.2, 105, 39.75)
+        self.assertEqual(len(result), 3)
+        self.assertTrue(np.all(_angle_between(exact, result.positions) <= result.error_bound + 1e-9))
+
+    def test_empty_time_stamps(self):
+        for stamps in [[], np.array([], dtype='datetime64[s]')]:
+            result = interpolated_position_series(stamps, False, 105.2, 105, 39.75, dtype=np.float32)
+            self.assertEqual(len(result), 0)
+            self.assertEqual(result.positions.altitude.dtype, np.float32)
+            self.assertEqual(result.error_bound.shape, (0,))
+
+    def test_float32(self):
+        result = interpolated_position_series(self.stamps, False, 105.2, 105, 39.75, dtype=np.float32)
+        self.assertEqual(result.positions.altitude.dtype, np.float32)
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            interpolated_position_series(self.stamps, False, 105.2, 105, 39.75, coarse_step_seconds=7)
+
+    def test_benchmark(self):
+        # the speedup itself depends on the machine, and is shown by `python -m solar_angles.interpolation`
+        results = interpolation.benchmark(step_seconds=3600, repeat=1)
+        self.assertEqual(set(results), {'batch', 'interpolated', 'speedup'})
+        self.assertGreater(results['speedup'], 0)
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+import numpy as np
+
+from solar_angles import batch, irradiance
+from solar_angles.solar import Angular
+
+
+class TestTransposition(TestCase):
+
+    def setUp(self):
+        stamps = [datetime(2001, 7, 21) + timedelta(hours=i) for i in range(24)]
+        self.positions = batch.solar_position_series(stamps, True, 85, 90, 40)
+        sun_up = self.positions.sun_is_up
+        cos_zenith = np.sin(self.positions.altitude)
+        self.direct_normal = np.where(sun_up, 700.0, 0.0)
+        self.diffuse_horizontal = np.where(sun_up, 120.0, 0.0)
+        self.global_horizontal = np.where(sun_up, self.direct_normal * cos_zenith + self.diffuse_horizontal, 0.0)
+
+    def test_vertical_incidence_matches_batch(self):
+        # including north facing walls, where the raw difference cut-off of the scalar library matters
+        surfaces = [90, 180, 270, 0, 350]
+        cos_theta = irradiance.surface_cos_incidence(self.positions, surfaces)
+        expected = np.nan_to_num(np.cos(batch.solar_angle_of_incidence(self.positions, surfaces)), nan=0.0)
+        np.testing.assert_allclose(cos_theta, expected, atol=1e-12)
+
+    def test_vertical_incidence_angle_matches_batch(self):
+        surfaces = [90, 180, 270, 0, 350]
+        incidence = irradiance.surface_incidence_angle(self.positions, surfaces)
+        expected = batch.solar_angle_of_incidence(self.positions, surfaces)
+        np.testing.assert_array_equal(np.isnan(incidence), np.isnan(expected))
+        np.testing.assert_allclose(incidence, expected, atol=1e-9)
+
+    def test_edge_on_incidence_angle(self):
+        # a surface edge on to the sun has an incidence of 90 degrees, as in the scalar library, not NaN
+        stamp = np.array(['2001-07-21T12:00'], dtype='datetime64[s]')
+        on_horizon = batch.SolarPositionSeries(stamp, *np.array([[0.0], [0.0], [np.pi], [0.3], [0.0]]))
+        for tilt in [0.0, 30.0, 90.0]:
+            incidence = irradiance.surface_incidence_angle(on_horizon, [90.0, 180.0], tilt)
+            self.assertAlmostEqual(incidence[0, 0], np.pi / 2, delta=1e-12)
+        behind = irradiance.surface_incidence_angle(on_horizon, [0.0, 90.0], 30.0)
+        self.assertTrue(np.isnan(behind[0, 0]))
+
+    def test_horizontal_surface_recovers_horizontal_values(self):
+        # on a horizontal surface every sky model collapses to the diffuse horizontal value (away from the horizon)
+        high_sun = self.positions.altitude_degrees > 10
+        for model in irradiance.MODELS:
+            components = irradiance.total_irradiance(
+                self.positions, [Angular(degrees=180)], 0.0, self.global_horizontal, self.direct_normal,
+                self.diffuse_horizontal, model=model
+            )
+            np.testing.assert_allclose(components.sky_diffuse[high_sun, 0], self.diffuse_horizontal[high_sun])
+            np.testing.assert_allclose(components.ground_reflected, 0.0, atol=1e-12)
+            np.testing.assert_allclose(components.total[high_sun, 0], self.global_horizontal[high_sun])
+
+    def test_vertical_components(self):
+        surfaces = [90, 180, 270, 0]
+        isotropic = irradiance.isotropic(self.positions, surfaces, 90, self.diffuse_horizontal)
+        np.testing.assert_allclose(isotropic, np.outer(self.diffuse_horizontal, [0.5] * 4))
+        ground = irradiance.ground_reflected(self.global_horizontal, 90, 0.3)
+        np.testing.assert_allclose(ground[:, 0], self.global_horizontal * 0.15)
+        for model in ['hay_davies', 'perez']:
+            components = irradiance.total_irradiance(
+                self.positions, surfaces, 90, self.global_horizontal, self.direct_normal, self.diffuse_horizontal,
+                model=model
+            )
+            self.assertEqual(components.total.shape, (24, 4))
+            self.assertTrue(np.all(np.isfinite(components.total)))
+            self.assertTrue(np.all(components.sky_diffuse >= 0))
+            # nothing arrives at night
+            night = ~self.positions.sun_is_up
+            np.testing.assert_array_equal(components.total[night], 0.0)
+            np.testing.assert_allclose(components.diffuse, components.sky_diffuse + components.ground_reflected)
+        # anisotropic models brighten the sun-facing side, relative to the isotropic sky, in the morning
+        morning = 9
+        hay = irradiance.hay_davies(self.positions, surfaces, 90, self.diffuse_horizontal, self.direct_normal)
+        self.assertGreater(hay[morning, 0], isotropic[morning, 0])
+        self.assertLess(hay[morning, 2], isotropic[morning, 2])
+
+    def test_air_mass(self):
+        result = irradiance.air_mass(self.positions)
+        up = self.positions.sun_is_up
+        self.assertTrue(np.all(result[up] >= 1.0))
+        self.assertTrue(np.all(np.isnan(result[~up])))
+
+    def test_bad_model(self):
+        with self.assertRaises(ValueError):
+            irradiance.total_irradiance(self.positions, [180], 90, self.global_horizontal, self.direct_normal,
+                                        self.diffuse_horizontal, model='unknown')
@@ -0,0 +1,80 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from math import acos, cos, degrees, isnan, radians
+from unittest import TestCase, skipIf
+
+import numpy as np
+
+from solar_angles import batch, kernels
+
+
+class TestKernels(TestCase):
+
+    def setUp(self):
+        self.original_backend = kernels.get_backend()
+
+    def tearDown(self):
+        kernels.set_backend(self.original_backend)
+
+    # the same expectations as the example 6-2 tests in test_solar.py, run through every available backend
+    def test_example_5_6_2(self):
+        day = datetime(2001, 7, 21).timetuple().tm_yday
+        for backend in kernels.available_backends():
+            with self.subTest(backend=backend):
+                kernels.set_backend(backend)
+                hour, altitude, azimuth, incidence = kernels.solar_position(day, 10, True, 85, 90, 40, 90)
+                self.assertAlmostEqual(degrees(hour), -41.5, delta=0.1)
+                self.assertAlmostEqual(degrees(altitude), 49.7, delta=0.1)
+                self.assertAlmostEqual(degrees(azimuth), 180 - 73.7, delta=0.1)
+                expected_theta = acos(cos(radians(180 - 73.7 - 90)) * cos(radians(49.7)))
+                self.assertAlmostEqual(incidence, expected_theta, delta=0.001)
+
+    def test_sun_down_and_behind_surface(self):
+        for backend in kernels.available_backends():
+            with self.subTest(backend=backend):
+                kernels.set_backend(backend)
+                _, _, azimuth, incidence = kernels.solar_position(80, 22, True, 85, 90, 40, 90)
+                self.assertTrue(isnan(azimuth))
+                self.assertTrue(isnan(incidence))
+                _, _, azimuth, incidence = kernels.solar_position(202, 10, True, 85, 90, 40, 270)
+                self.assertFalse(isnan(azimuth))
+                self.assertTrue(isnan(incidence))
+
+    def test_series_matches_batch(self):
+        stamps = [datetime(2001, 1, 1, 0, 30) + timedelta(hours=7 * i) for i in range(1200)]
+        positions = batch.solar_position_series(stamps, False, 105.2, 105, 39.75)
+        expected_incidence = batch.solar_angle_of_incidence(positions, 200)
+        days = batch.day_of_year(stamps)
+        hours = batch.clock_hours(stamps)
+        for backend in kernels.available_backends():
+            with self.subTest(backend=backend):
+                kernels.set_backend(backend)
+                hour, altitude, azimuth, incidence = kernels.solar_positions(days, hours, False, 105.2, 105, 39.75, 200)
+                np.testing.assert_allclose(hour, positions.hour_angle, rtol=0, atol=1e-9)
+                np.testing.assert_allclose(altitude, positions.altitude, rtol=0, atol=1e-9)
+                np.testing.assert_allclose(azimuth, positions.azimuth, rtol=0, atol=1e-9)
+                np.testing.assert_allclose(incidence, expected_incidence, rtol=0, atol=1e-9)
+
+    def test_threads_agree_with_serial(self):
+        days = np.arange(1, 366)
+        hours = np.full(len(days), 14.25)
+        latitudes = [-60, -30, 0, 30, 60]
+        serial = [kernels.solar_positions(days, hours, False, 90, 90, latitude) for latitude in latitudes]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            threaded = list(executor.map(lambda latitude: kernels.solar_positions(days, hours, False, 90, 90, latitude),
+                                         latitudes))
+        for expected, actual in zip(serial, threaded):
+            for expected_array, actual_array in zip(expected, actual):
+                np.testing.assert_array_equal(actual_array, expected_array)
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            kernels.set_backend('fortran')
+        with self.assertRaises(ValueError):
+            kernels.solar_positions([1, 2], [12.0], False, 90, 90, 40)
+
+    @skipIf(kernels.numba is not None, "Numba is installed")
+    def test_numba_unavailable(self):
+        self.assertEqual(kernels.available_backends(), ('python',))
+        with self.assertRaises(ValueError):
+            kernels.set_backend('numba')
@@ -14,7 +14,9 @@ from solar_angles.solar import (
     solar_angle_of_incidence,
     direct_radiation_on_surface,
     wall_azimuth_angle,
-    Angular
+    solar_position,
+    Angular,
+    Site
 )
 
 
@@ -28,11 +30,40 @@ class TestAngularValueType(TestCase):
         with self.assertRaises(ValueError):
             Angular(degrees=180, radians=2 * 3.14)
 
+    def test_zero_is_valued(self):
+        for angle in [Angular(degrees=0), Angular(radians=0), Angular(degrees=0.0, radians=0.0),
+                      Angular.from_degrees(0), Angular.from_radians(0.0)]:
+            self.assertTrue(angle.valued)
+            self.assertEqual(angle.radians, 0.0)
+            self.assertEqual(angle.degrees, 0.0)
+        with self.assertRaises(ValueError):
+            Angular(degrees=0, radians=1)
+
+    def test_fast_construction(self):
+        a = Angular.from_degrees(180)
+        self.assertTrue(a.valued)
+        self.assertAlmostEqual(a.radians, 3.14159265, delta=1e-8)
+        b = Angular.from_radians(-1.5)
+        self.assertTrue(b.valued)
+        self.assertEqual(b.degrees, Angular(radians=-1.5).degrees)
+
     def test_string(self):
         a = Angular(degrees=1)
         self.assertIsInstance(str(a), str)
 
 
+class TestSite(TestCase):
+
+    def test_construction(self):
+        site = Site(Angular(degrees=39.75), Angular(degrees=105.2), Angular(degrees=105), 'Golden, CO')
+        self.assertEqual(site.latitude.degrees, 39.75)
+        self.assertIsInstance(str(site), str)
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            Site(Angular(), Angular(degrees=105.2), Angular(degrees=105))
+
+
 class TestDayOfYear(TestCase):
 
     def test_first_day_of_year(self):
@@ -210,6 +241,34 @@ class TestAzimuthAngle(TestCase):
         latitude = Angular(degrees=40)
         self.assertFalse(azimuth_angle(dt, dst_on, longitude, standard_meridian, latitude).valued)
 
+    # the old acos formulation divided by cos(latitude), which is zero at the poles
+    def test_at_the_poles(self):
+        dt = datetime(2001, 6, 21, 10, 00, 00)
+        longitude = Angular(degrees=85)
+        standard_meridian = Angular(degrees=90)
+        north_pole = azimuth_angle(dt, False, longitude, standard_meridian, Angular(degrees=90))
+        self.assertTrue(north_pole.valued)
+        # at the north pole every direction is south, so the azimuth just follows the hour angle around
+        hour = hour_angle(dt, False, longitude, standard_meridian).degrees
+        self.assertAlmostEqual(north_pole.degrees, (180 + hour) % 360, delta=1e-9)
+        self.assertFalse(azimuth_angle(dt, False, longitude, standard_meridian, Angular(degrees=-90)).valued)
+
+    # on a midnight sun day east of the standard meridian the hour angle passes 180 degrees before clock midnight;
+    # the old acos formulation took the side from the sign of the hour angle and mirrored the sun to 354.6 degrees
+    def test_midnight_sun_past_north(self):
+        longitude = Angular(degrees=-25)
+        standard_meridian = Angular(degrees=-15)
+        latitude = Angular(degrees=70)
+        dt = datetime(2001, 6, 21, 23, 45, 00)
+        self.assertGreater(hour_angle(dt, False, longitude, standard_meridian).degrees, 180)
+        azimuth = azimuth_angle(dt, False, longitude, standard_meridian, latitude)
+        self.assertAlmostEqual(azimuth.degrees, 5.41, delta=0.01)
+        # the sun keeps moving east through north, as it does after clock midnight
+        before = azimuth_angle(datetime(2001, 6, 21, 23, 15, 00), False, longitude, standard_meridian, latitude)
+        after = azimuth_angle(datetime(2001, 6, 22, 0, 15, 00), False, longitude, standard_meridian, latitude)
+        self.assertAlmostEqual(before.degrees, 358.52, delta=0.01)
+        self.assertAlmostEqual(after.degrees, 12.25, delta=0.01)
+
     def test_bad_arguments(self):
         with self.assertRaises(ValueError):
             azimuth_angle(datetime.now(), True, Angular(), Angular(), Angular())
@@ -301,6 +360,14 @@ class TestSolarAngleOfIncidence(TestCase):
             solar_angle_of_incidence(dt, dst_on, longitude, standard_meridian, latitude, wall_normal).valued
         )
 
+    # the sun just east of north at a midnight sun hour angle past 180 degrees lights a north-northeast wall, which
+    # the old acos azimuth (mirrored to 354.6 degrees) put behind the wall
+    def test_midnight_sun_past_north(self):
+        dt = datetime(2001, 6, 21, 23, 45, 00)
+        angle = solar_angle_of_incidence(dt, False, Angular(degrees=-25), Angular(degrees=-15), Angular(degrees=70),
+                                         Angular(degrees=20))
+        self.assertAlmostEqual(angle.degrees, 15.01, delta=0.01)
+
     def test_bad_arguments(self):
         with self.assertRaises(ValueError):
             solar_angle_of_incidence(datetime.now(), True, Angular(), Angular(), Angular(), Angular())
@@ -326,3 +393,78 @@ class TestRadiationOnSurface(TestCase):
             direct_radiation_on_surface(
                 datetime.now(), True, Angular(), Angular(), Angular(), Angular(), 1000
             )
+
+
+class TestSolarPosition(TestCase):
+
+    # the combined record should match each of the individual functions
+    def test_matches_individual_functions(self):
+        longitude = Angular(degrees=85)
+        standard_meridian = Angular(degrees=90)
+        latitude = Angular(degrees=40)
+        for hour in range(0, 24):
+            for dst_on in [True, False]:
+                dt = datetime(2001, 7, 21, hour, 30, 15)
+                position = solar_position(dt, dst_on, longitude, standard_meridian, latitude)
+                self.assertAlmostEqual(
+                    position.hour_angle_degrees,
+                    hour_angle(dt, dst_on, longitude, standard_meridian).degrees, delta=1e-9)
+                self.assertAlmostEqual(
+                    position.altitude_radians,
+                    altitude_angle(dt, dst_on, longitude, standard_meridian, latitude).radians, delta=1e-9)
+                self.assertAlmostEqual(position.declination_degrees, declination_angle(dt).degrees, delta=1e-9)
+                self.assertAlmostEqual(position.equation_of_time, equation_of_time(dt), delta=1e-9)
+                azimuth = azimuth_angle(dt, dst_on, longitude, standard_meridian, latitude)
+                if azimuth.valued:
+                    self.assertTrue(position.sun_is_up)
+                    self.assertAlmostEqual(position.azimuth_degrees, azimuth.degrees, delta=1e-9)
+                else:
+                    self.assertFalse(position.sun_is_up)
+                    self.assertIsNone(position.azimuth_degrees)
+                    self.assertIsNone(position.azimuth_radians)
+
+    def test_string(self):
+        position = solar_position(
+            datetime(2001, 7, 21, 10), True, Angular(degrees=85), Angular(degrees=90), Angular(degrees=40)
+        )
+        self.assertIsInstance(str(position), str)
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            solar_position(datetime.now(), True, Angular(), Angular(), Angular())
+
+
+class TestZeroValuedInputs(TestCase):
+
+    # the equator, the prime meridian and a north facing surface used to be rejected as unvalued angles
+    def test_zero_location(self):
+        zero = Angular(degrees=0)
+        site = Site(zero, zero, zero)
+        self.assertEqual(site.latitude.degrees, 0)
+        dt = datetime(2001, 3, 21, 10, 00, 00)
+        # only the difference between longitude and meridian enters the hour angle
+        self.assertAlmostEqual(hour_angle(dt, False, zero, zero).degrees,
+                               hour_angle(dt, False, Angular(degrees=15), Angular(degrees=15)).degrees, delta=1e-9)
+        altitude = altitude_angle(dt, False, zero, zero, zero)
+        self.assertTrue(altitude.valued)
+        self.assertAlmostEqual(altitude.degrees,
+                               altitude_angle(dt, False, zero, zero, Angular(degrees=1e-9)).degrees, delta=1e-6)
+        self.assertTrue(azimuth_angle(dt, False, zero, zero, zero).valued)
+        self.assertTrue(solar_position(dt, False, zero, zero, zero).sun_is_up)
+
+    def test_zero_surface_azimuth_is_north(self):
+        longitude = Angular(degrees=85)
+        standard_meridian = Angular(degrees=90)
+        latitude = Angular(degrees=-40)  # the sun is in the north at noon
+        north = Angular(degrees=0)
+        also_north = Angular(degrees=360)
+        for hour in range(0, 24):
+            dt = datetime(2001, 7, 21, hour, 30, 00)
+            for function in [wall_azimuth_angle, solar_angle_of_incidence]:
+                expected = function(dt, False, longitude, standard_meridian, latitude, also_north)
+                actual = function(dt, False, longitude, standard_meridian, latitude, north)
+                self.assertEqual(actual.valued, expected.valued)
+                if expected.valued:
+                    self.assertAlmostEqual(actual.radians, expected.radians, delta=1e-12)
+        morning = datetime(2001, 7, 21, 10, 00, 00)
+        self.assertTrue(solar_angle_of_incidence(morning, False, longitude, standard_meridian, latitude, north).valued)
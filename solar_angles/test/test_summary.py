@@ -0,0 +1,99 @@
+from datetime import date, datetime
+from unittest import TestCase
+
+import numpy as np
+
+from solar_angles import batch, irradiance
+from solar_angles.solar import Angular, Site
+from solar_angles.summary import SummaryAccumulator, annual_summary
+
+
+class TestAnnualSummary(TestCase):
+
+    def setUp(self):
+        self.site = Site(Angular(degrees=39.75), Angular(degrees=105.2), Angular(degrees=105), 'Golden, CO')
+        self.surfaces = [0, 90, 180, 270]
+        self.tilts = [90, 90, 30, 90]
+
+    def test_matches_the_reduced_series(self):
+        step = 600
+        summary = annual_summary(self.site, 2011, self.surfaces, self.tilts, step_seconds=step, chunk_days=3,
+                                 start_date=date(2011, 6, 1), end_date=date(2011, 6, 10))
+        days = np.arange(np.datetime64('2011-06-01'), np.datetime64('2011-06-11')).astype('datetime64[s]')
+        stamps = (days[:, np.newaxis] + np.arange(300, 86400, step).astype('timedelta64[s]')).ravel()
+        positions = batch.solar_position_series(stamps, False, 105.2, 105, 39.75)
+        cos_theta = irradiance.surface_cos_incidence(positions, self.surfaces, self.tilts)
+        np.testing.assert_allclose(summary.sunlit_hours, np.count_nonzero(cos_theta > 0, axis=0) * step / 3600)
+        np.testing.assert_allclose(summary.exposure_hours, cos_theta.sum(axis=0) * step / 3600)
+        daily_altitude = positions.altitude.reshape(10, -1)
+        np.testing.assert_array_equal(summary.max_altitude, daily_altitude.max(axis=1))
+        np.testing.assert_array_equal(summary.min_altitude, daily_altitude.min(axis=1))
+        for day, azimuths in enumerate(positions.azimuth.reshape(10, -1)):
+            valued = azimuths[~np.isnan(azimuths)]
+            self.assertEqual(summary.sunrise_azimuth[day], valued[0])
+            self.assertEqual(summary.sunset_azimuth[day], valued[-1])
+        self.assertEqual(len(summary.dates), 10)
+
+    def test_chunk_size_does_not_matter(self):
+        arguments = (self.site, 2012, self.surfaces, self.tilts)
+        options = {'step_seconds': 900, 'start_date': date(2012, 2, 25), 'end_date': date(2012, 3, 5)}
+        one = annual_summary(*arguments, chunk_days=1, **options)
+        many = annual_summary(*arguments, chunk_days=4, **options)
+        np.testing.assert_allclose(one.exposure_hours, many.exposure_hours, rtol=1e-12)
+        np.testing.assert_array_equal(one.sunlit_hours, many.sunlit_hours)
+        np.testing.assert_array_equal(one.sunrise_azimuth, many.sunrise_azimuth)
+        np.testing.assert_array_equal(one.sunset_azimuth, many.sunset_azimuth)
+        self.assertEqual(len(one.dates), 10)  # 2012 is a leap year
+
+    def test_whole_year(self):
+        summary = annual_summary(self.site, 2011, [180], [0], step_seconds=300)
+        self.assertEqual(len(summary.dates), 365)
+        # a horizontal surface is sunlit whenever the sun is up, about half of the year at any latitude
+        self.assertAlmostEqual(summary.sunlit_hours[0] / 8760, 0.5, delta=0.02)
+        self.assertLess(summary.exposure_hours[0], summary.sunlit_hours[0])
+        # the highest sun of the year is at the summer solstice, 90 - (latitude - 23.45) degrees
+        self.assertAlmostEqual(np.degrees(np.max(summary.max_altitude)), 90 - 39.75 + 23.45, delta=0.1)
+        # sunrise is in the north east in summer and the south east in winter
+        self.assertLess(np.degrees(summary.sunrise_azimuth[171]), 90)
+        self.assertGreater(np.degrees(summary.sunrise_azimuth[354]), 90)
+        self.assertGreater(np.degrees(summary.sunset_azimuth[171]), 270)
+
+    def test_polar_night(self):
+        tromso = Site(Angular(degrees=69.65), Angular(degrees=-18.96), Angular(degrees=-15))
+        summary = annual_summary(tromso, 2011, [180], step_seconds=1800, start_date=date(2011, 12, 20),
+                                 end_date=date(2011, 12, 22))
+        self.assertTrue(np.all(np.isnan(summary.sunrise_azimuth)))
+        self.assertTrue(np.all(summary.max_altitude < 0))
+        self.assertEqual(summary.sunlit_hours[0], 0.0)
+
+    def test_midnight_sun(self):
+        # with the sun up all day, the sunrise and sunset azimuths are just those of the first and last samples
+        tromso = Site(Angular(degrees=69.65), Angular(degrees=-18.96), Angular(degrees=-15))
+        summary = annual_summary(tromso, 2011, [180], step_seconds=1800, start_date=date(2011, 6, 21),
+                                 end_date=date(2011, 6, 21))
+        stamps = [datetime(2011, 6, 21, hour, minute) for hour in range(24) for minute in (15, 45)]
+        positions = batch.solar_position_series(stamps, False, -18.96, -15, 69.65)
+        self.assertTrue(np.all(positions.sun_is_up))
+        self.assertEqual(summary.sunrise_azimuth[0], positions.azimuth[0])
+        self.assertEqual(summary.sunset_azimuth[0], positions.azimuth[-1])
+        self.assertGreater(summary.min_altitude[0], 0)
+
+    def test_accumulator_from_another_source(self):
+        accumulator = SummaryAccumulator(date(2011, 7, 21), date(2011, 7, 21), [180], step_seconds=3600)
+        stamps = [datetime(2011, 7, 21, hour, 30) for hour in range(24)]
+        accumulator.update(batch.solar_position_series(stamps[:12], False, 105.2, 105, 39.75))
+        accumulator.update(batch.solar_position_series(stamps[12:], False, 105.2, 105, 39.75))
+        summary = accumulator.result()
+        positions = batch.solar_position_series(stamps, False, 105.2, 105, 39.75)
+        self.assertEqual(summary.max_altitude[0], np.max(positions.altitude))
+        self.assertEqual(summary.sunset_azimuth[0], positions.azimuth[~np.isnan(positions.azimuth)][-1])
+        with self.assertRaises(ValueError):
+            accumulator.update(batch.solar_position_series([datetime(2011, 7, 22, 1)], False, 105.2, 105, 39.75))
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            annual_summary(self.site, 2011, [180], step_seconds=7)
+        with self.assertRaises(ValueError):
+            annual_summary(self.site, 2011, [180], chunk_days=0)
+        with self.assertRaises(ValueError):
+            SummaryAccumulator(date(2011, 2, 1), date(2011, 1, 1), [180])
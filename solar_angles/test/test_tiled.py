@@ -0,0 +1,73 @@
+import tempfile
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+import numpy as np
+
+from solar_angles import batch, tiled
+from solar_angles.solar import Angular, Site
+
+
+class TestTiledRun(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.sites = [
+            Site(Angular(degrees=latitude), Angular(degrees=longitude), Angular(degrees=90))
+            for latitude, longitude in [(25, 85), (32, 88), (40, 95), (47, 100), (30, 92)]
+        ]
+        self.stamps = [datetime(2001, 7, 21) + timedelta(hours=i) for i in range(30)]
+        self.surfaces = [90, 180, Angular(degrees=270)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _check(self, result):
+        for i, site in enumerate(self.sites):
+            positions = batch.solar_position_series(
+                self.stamps, False, site.longitude, site.standard_meridian, site.latitude
+            )
+            np.testing.assert_allclose(result.altitude[i], positions.altitude, atol=1e-12)
+            np.testing.assert_allclose(result.azimuth[i], positions.azimuth, atol=1e-12)
+            np.testing.assert_allclose(
+                result.incidence[i], batch.solar_angle_of_incidence(positions, self.surfaces), atol=1e-12
+            )
+
+    def test_full_run(self):
+        result = tiled.run_tiled(self.directory.name, self.sites, self.stamps, self.surfaces, site_tile=2, time_tile=7)
+        self.assertTrue(result.complete)
+        self.assertEqual(result.progress.shape, (3, 5))
+        self.assertEqual(result.incidence.shape, (5, 30, 3))
+        self._check(result)
+        self._check(tiled.open_tiled(self.directory.name))
+
+    def test_north_facing_surfaces(self):
+        self.surfaces = [0, 350]
+        result = tiled.run_tiled(self.directory.name, self.sites, self.stamps, self.surfaces, site_tile=2, time_tile=7)
+        self._check(result)
+
+    def test_resume(self):
+        partial = tiled.run_tiled(self.directory.name, self.sites, self.stamps, self.surfaces, site_tile=2,
+                                  time_tile=7, max_tiles=4)
+        self.assertFalse(partial.complete)
+        self.assertEqual(partial.tiles_done, 4)
+        del partial
+        result = tiled.run_tiled(self.directory.name, self.sites, self.stamps, self.surfaces, site_tile=2, time_tile=7)
+        self.assertTrue(result.complete)
+        self._check(result)
+
+    def test_float32_outputs(self):
+        result = tiled.run_tiled(self.directory.name, self.sites, self.stamps, self.surfaces, dtype=np.float32)
+        self.assertEqual(result.altitude.dtype, np.float32)
+        self.assertEqual(result.progress.shape, (1, 1))
+
+    def test_mismatched_inputs(self):
+        tiled.run_tiled(self.directory.name, self.sites, self.stamps, self.surfaces, max_tiles=0)
+        with self.assertRaises(ValueError):
+            tiled.run_tiled(self.directory.name, self.sites, self.stamps, [0, 90])
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            tiled.run_tiled(self.directory.name, self.sites, self.stamps, self.surfaces, site_tile=0)
+        with self.assertRaises(ValueError):
+            tiled.open_tiled(self.directory.name)
@@ -0,0 +1,75 @@
+from unittest import TestCase
+
+import numpy as np
+
+from solar_angles import batch, irradiance
+from solar_angles.trackers import dual_axis, single_axis
+
+
+class TestSingleAxis(TestCase):
+
+    def setUp(self):
+        stamps = np.arange('2001-06-21T00:05', '2001-06-23', 10, dtype='datetime64[m]')
+        self.positions = batch.solar_position_series(stamps, False, 105.2, 105, 39.75)
+        self.up = ~np.isnan(self.positions.azimuth)
+
+    def test_true_tracking(self):
+        tracker = single_axis(self.positions, backtrack=False)
+        self.assertTrue(np.all(np.isnan(tracker.rotation[~self.up])))
+        # facing south along the axis, a morning sun in the east needs a negative rotation and an afternoon one positive
+        morning = self.up & (self.positions.hour_angle < -0.1)
+        afternoon = self.up & (self.positions.hour_angle > 0.1)
+        self.assertTrue(np.all(tracker.rotation[morning] < 0))
+        self.assertTrue(np.all(tracker.rotation[afternoon] > 0))
+        # the panel normal lies in the plane of the sun and the axis, so the incidence is the sun angle to that plane
+        east, north, up = (np.cos(self.positions.altitude) * np.sin(self.positions.azimuth),
+                           np.cos(self.positions.altitude) * np.cos(self.positions.azimuth),
+                           np.sin(self.positions.altitude))
+        np.testing.assert_allclose(np.cos(tracker.incidence[self.up]), np.sqrt(1 - north[self.up] ** 2), atol=1e-12)
+        # the panel orientation gives back the same incidence through the tilted surface formula
+        cos_incidence = np.sin(tracker.surface_tilt) * np.cos(tracker.surface_azimuth) * north + np.sin(
+            tracker.surface_tilt) * np.sin(tracker.surface_azimuth) * east + np.cos(tracker.surface_tilt) * up
+        np.testing.assert_allclose(cos_incidence[self.up], np.cos(tracker.incidence[self.up]), atol=1e-12)
+
+    def test_backtracking(self):
+        ratio = 0.4
+        ideal = single_axis(self.positions, backtrack=False)
+        tracked = single_axis(self.positions, ground_coverage_ratio=ratio)
+        self.assertTrue(np.all(np.abs(tracked.rotation[self.up]) <= np.abs(ideal.rotation[self.up]) + 1e-12))
+        backtracking = self.up & (np.abs(np.cos(ideal.rotation)) < ratio)
+        self.assertTrue(np.any(backtracking))
+        # while backtracking, the row shadow exactly meets the next row
+        np.testing.assert_allclose(ratio * np.cos(tracked.rotation - ideal.rotation)[backtracking],
+                                   np.cos(ideal.rotation)[backtracking], atol=1e-12)
+        np.testing.assert_allclose(tracked.rotation[self.up & ~backtracking], ideal.rotation[self.up & ~backtracking])
+
+    def test_limits_and_tilted_axis(self):
+        limited = single_axis(self.positions, max_angle=45, backtrack=False)
+        self.assertLessEqual(np.nanmax(np.abs(limited.rotation)), np.radians(45) + 1e-12)
+        # at solar noon a south facing tilted axis holds the panel at the axis tilt, facing south
+        tilted = single_axis(self.positions, axis_tilt=20, backtrack=False)
+        noon = np.argmin(np.abs(self.positions.hour_angle))
+        self.assertAlmostEqual(np.degrees(tilted.surface_tilt[noon]), 20, delta=0.5)
+        self.assertAlmostEqual(np.degrees(tilted.surface_azimuth[noon]), 180, delta=3)
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            single_axis(self.positions, ground_coverage_ratio=0)
+
+
+class TestDualAxis(TestCase):
+
+    def test_points_at_the_sun(self):
+        stamps = np.arange('2001-12-21T00:05', '2001-12-22', 10, dtype='datetime64[m]')
+        positions = batch.solar_position_series(stamps, False, 105.2, 105, 39.75)
+        up = ~np.isnan(positions.azimuth)
+        tracker = dual_axis(positions)
+        self.assertIsNone(tracker.rotation)
+        np.testing.assert_allclose(tracker.incidence[up], 0, atol=1e-12)
+        self.assertTrue(np.all(np.isnan(tracker.incidence[~up])))
+        cos_incidence = irradiance.surface_cos_incidence(positions, [180], 0)[:, 0]
+        np.testing.assert_allclose(np.cos(tracker.surface_tilt[up]), cos_incidence[up], atol=1e-12)
+        limited = dual_axis(positions, max_tilt=60)
+        self.assertLessEqual(np.nanmax(limited.surface_tilt), np.radians(60) + 1e-12)
+        zenith = np.pi / 2 - positions.altitude[up]
+        np.testing.assert_allclose(limited.incidence[up], zenith - limited.surface_tilt[up], atol=1e-12)
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+import numpy as np
+
+from solar_angles import batch, irradiance, solar
+from solar_angles.solar import Angular
+from solar_angles.trajectory import track_sun_angles
+
+
+class TestTrackSunAngles(TestCase):
+
+    def setUp(self):
+        # a made up drive heading roughly south-east across Colorado during one summer day, in mountain standard time
+        self.count = 200
+        self.stamps = [datetime(2001, 7, 21, 5) + timedelta(minutes=5 * i) for i in range(self.count)]
+        self.latitudes = np.linspace(40.5, 37.2, self.count)
+        self.longitudes = np.linspace(105.2, 102.3, self.count)
+        self.headings = np.linspace(120.0, 170.0, self.count)
+
+    def test_matches_scalar(self):
+        track = track_sun_angles(self.stamps, False, self.latitudes, self.longitudes, self.headings, 105)
+        for i in range(0, self.count, 7):
+            args = (self.stamps[i], False, Angular(degrees=self.longitudes[i]), Angular(degrees=105),
+                    Angular(degrees=self.latitudes[i]))
+            self.assertAlmostEqual(track.altitude[i], solar.altitude_angle(*args).radians, delta=1e-9)
+            expected_azimuth = solar.azimuth_angle(*args)
+            if expected_azimuth.valued:
+                self.assertAlmostEqual(track.azimuth[i], expected_azimuth.radians, delta=1e-9)
+                relative = (expected_azimuth.degrees - self.headings[i] + 180) % 360 - 180
+                self.assertAlmostEqual(np.degrees(track.relative_azimuth[i]), relative, delta=1e-7)
+            else:
+                self.assertTrue(np.isnan(track.azimuth[i]))
+
+    def test_utc_time_stamps(self):
+        # the same track logged in UTC, seven hours ahead of mountain standard time; only the points before UTC
+        # midnight are compared, since the day of year is taken from the clock date
+        points = 140
+        utc_stamps = [x + timedelta(hours=7) for x in self.stamps[:points]]
+        local = track_sun_angles(self.stamps[:points], False, self.latitudes[:points], self.longitudes[:points],
+                                 self.headings[:points], 105)
+        utc = track_sun_angles(utc_stamps, False, self.latitudes[:points], self.longitudes[:points],
+                               self.headings[:points], 0)
+        self.assertEqual(utc.time_stamps[-1].astype('datetime64[D]'), np.datetime64('2001-07-21'))
+        np.testing.assert_allclose(utc.altitude, local.altitude, rtol=0, atol=1e-12)
+        np.testing.assert_allclose(utc.relative_azimuth, local.relative_azimuth, rtol=0, atol=1e-12)
+
+    def test_stationary_platform_matches_batch(self):
+        stamps = np.arange('2001-03-01T00:15', '2001-03-08', 30, dtype='datetime64[m]')
+        track = track_sun_angles(stamps, False, 39.75, 105.2, 180.0, 105, surface_azimuths=[0, 90], surface_tilts=30)
+        positions = batch.solar_position_series(stamps, False, 105.2, 105, 39.75)
+        np.testing.assert_allclose(track.altitude, positions.altitude, rtol=0, atol=1e-12)
+        np.testing.assert_allclose(track.azimuth, positions.azimuth, rtol=0, atol=1e-12)
+        # facing south, straight ahead is a south surface and the right hand side is a west surface
+        expected = irradiance.surface_cos_incidence(positions, [180, 270], 30)
+        np.testing.assert_allclose(np.nan_to_num(np.cos(track.incidence)), expected, rtol=0, atol=1e-12)
+
+    def test_vertical_surfaces_use_the_full_circle(self):
+        stamps = np.arange('2001-06-21T04:00', '2001-06-21T20:00', 10, dtype='datetime64[m]')
+        track = track_sun_angles(stamps, False, 39.75, 105.2, 0.0, 105, surface_azimuths=[0, 180])
+        positions = batch.solar_position_series(stamps, False, 105.2, 105, 39.75)
+        # away from north the wall cut-off does not matter, and the edge on convention is the shared one
+        south = irradiance.surface_incidence_angle(positions, [180])[:, 0]
+        np.testing.assert_array_equal(np.isnan(track.incidence[:, 1]), np.isnan(south))
+        np.testing.assert_allclose(track.incidence[:, 1], south, rtol=0, atol=1e-12)
+        # a north facing wall is lit by the evening sun west of north too, which the scalar cut-off would drop
+        evening = positions.sun_is_up & (positions.azimuth_degrees > 270)
+        self.assertTrue(np.any(evening))
+        expected = np.arccos(np.cos(positions.altitude) * np.cos(positions.azimuth))
+        np.testing.assert_allclose(track.incidence[evening, 0], expected[evening], rtol=0, atol=1e-12)
+
+    def test_shapes_and_bad_arguments(self):
+        track = track_sun_angles(self.stamps, False, self.latitudes, self.longitudes, self.headings, 105, 90)
+        self.assertEqual(len(track), self.count)
+        self.assertEqual(track.incidence.shape, (self.count, 1))
+        self.assertTrue(np.all(np.abs(track.relative_azimuth[track.sun_is_up]) <= np.pi))
+        with self.assertRaises(ValueError):
+            track_sun_angles(self.stamps, False, self.latitudes[:-1], self.longitudes, self.headings, 105)
@@ -0,0 +1,67 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+import numpy as np
+
+from solar_angles import validation
+
+
+class TestValidation(TestCase):
+
+    def test_shipped_reference(self):
+        reference = validation.load_reference()
+        shape = (len(validation.REFERENCE_SITES), len(validation.reference_time_stamps()))
+        self.assertEqual(reference.altitude.shape, shape)
+        self.assertEqual(reference.incidence.shape[2], len(validation.REFERENCE_SURFACES))
+        np.testing.assert_array_equal(reference.time_stamps, validation.reference_time_stamps())
+        # about half of the time stamps spread over the year are at night
+        self.assertAlmostEqual(np.isnan(reference.azimuth[:, :365]).mean(), 0.5, delta=0.05)
+
+    def test_reference_covers_the_sun_passing_north(self):
+        reference = validation.load_reference()
+        site = [x[0] for x in validation.REFERENCE_SITES].index('Longyearbyen, Svalbard')
+        june = slice(365, None)  # the dense run follows the daily time stamps
+        self.assertEqual(reference.time_stamps[june][0], np.datetime64(validation.MIDNIGHT_SUN_DAYS[0]))
+        azimuth = np.degrees(reference.azimuth[site, june])
+        self.assertFalse(np.any(np.isnan(azimuth)))  # the sun never sets
+        wraps = np.nonzero(np.diff(azimuth) < -180)[0]
+        self.assertGreaterEqual(len(wraps), 2)  # around each midnight inside the run
+        # the north wall loses the sun when its raw azimuth difference jumps past +90 degrees
+        north = list(validation.REFERENCE_SURFACES).index(0)
+        incidence = reference.incidence[site, june, north]
+        self.assertTrue(np.all(np.isnan(incidence[wraps])))
+        self.assertFalse(np.any(np.isnan(incidence[wraps + 1])))
+
+    def test_every_path_matches_reference(self):
+        results = validation.validate()
+        self.assertEqual([x.path for x in results], list(validation.available_paths()))
+        for result in results:
+            with self.subTest(path=result.path):
+                self.assertTrue(result.passed, str(result))
+                self.assertGreater(result.positions_per_second, 0)
+
+    def test_regenerated_reference_matches_shipped(self):
+        with tempfile.TemporaryDirectory() as directory:
+            regenerated = validation.generate_reference(Path(directory) / 'reference.npz')
+            reloaded = validation.load_reference(Path(directory) / 'reference.npz')
+        shipped = validation.load_reference()
+        for name in validation.QUANTITIES:
+            np.testing.assert_allclose(getattr(regenerated, name), getattr(shipped, name), rtol=0, atol=1e-12)
+            np.testing.assert_array_equal(getattr(reloaded, name), getattr(regenerated, name))
+
+    def test_detects_a_broken_path(self):
+        def broken(reference):
+            altitude = reference.altitude.copy()
+            altitude[0, 10] += 1e-6
+            azimuth = reference.azimuth.copy()
+            azimuth[np.isnan(azimuth)] = 1.0
+            return {'hour_angle': reference.hour_angle, 'altitude': altitude, 'azimuth': azimuth, 'incidence': None}
+
+        result, = validation.validate({'broken': broken})
+        self.assertFalse(result.passed)
+        self.assertAlmostEqual(result.max_error['altitude'], 1e-6, delta=1e-12)
+        self.assertEqual(result.max_error['hour_angle'], 0)
+        self.assertGreater(result.mismatches['azimuth'], 0)
+        self.assertNotIn('incidence', result.max_error)
+        self.assertIn('FAIL broken', str(result))
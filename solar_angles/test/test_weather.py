@@ -0,0 +1,159 @@
+import os
+import tempfile
+from datetime import datetime
+from math import cos
+from unittest import TestCase
+
+import numpy as np
+
+from solar_angles import solar, weather
+from solar_angles.solar import Angular
+
+EPW_HEADER = """LOCATION,Golden,CO,USA,TMY3,724666,39.74,-105.18,-7.0,1829.0
+DESIGN CONDITIONS,0
+TYPICAL/EXTREME PERIODS,0
+GROUND TEMPERATURES,0
+HOLIDAYS/DAYLIGHT SAVINGS,No,0,0,0
+COMMENTS 1,synthetic test file
+COMMENTS 2,
+DATA PERIODS,1,1,Data,Sunday, 1/ 1,12/31
+"""
+
+TMY3_HEADER = """724666,"GOLDEN",CO,-7.0,39.74,-105.18,1829
+Date (MM/DD/YYYY),Time (HH:MM),ETR (W/m^2),GHI (W/m^2),DNI (W/m^2),DHI (W/m^2)
+"""
+
+
+def _irradiance(hour: int) -> tuple:
+    # a made-up daily shape, just needs to be distinguishable per row
+    return 10.0 * hour, 20.0 * hour, 5.0 * hour
+
+
+def _epw_row(day: int, hour: int, minute: int, global_horizontal, direct_normal, diffuse_horizontal) -> str:
+    fields = ['2001', '7', str(day), str(hour), str(minute), 'A'] + ['0'] * 7
+    fields += [str(global_horizontal), str(direct_normal), str(diffuse_horizontal)] + ['0'] * 19
+    return ','.join(fields) + '\n'
+
+
+def _write_epw(path: str, days: int, hour_end_minute: int = 60) -> None:
+    with open(path, 'w') as f:
+        f.write(EPW_HEADER)
+        for day in range(1, days + 1):
+            for hour in range(1, 25):
+                f.write(_epw_row(day, hour, hour_end_minute, *_irradiance(hour)))
+
+
+def _write_tmy3(path: str, days: int) -> None:
+    with open(path, 'w') as f:
+        f.write(TMY3_HEADER)
+        for day in range(1, days + 1):
+            for hour in range(1, 25):
+                global_horizontal, direct_normal, diffuse_horizontal = _irradiance(hour)
+                f.write(f"07/{day:02d}/2001,{hour:02d}:00,0,{global_horizontal},{direct_normal},{diffuse_horizontal}\n")
+
+
+class TestWeatherFiles(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.epw = os.path.join(self.directory.name, 'golden.epw')
+        self.tmy3 = os.path.join(self.directory.name, 'golden.csv')
+        _write_epw(self.epw, 3)
+        _write_tmy3(self.tmy3, 3)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_read_site(self):
+        for path, name in [(self.epw, 'Golden'), (self.tmy3, 'GOLDEN')]:
+            site = weather.read_site(path)
+            self.assertEqual(site.name, name)
+            self.assertAlmostEqual(site.latitude.degrees, 39.74)
+            self.assertAlmostEqual(site.longitude.degrees, 105.18)
+            self.assertAlmostEqual(site.standard_meridian.degrees, 105)
+
+    def test_read_chunks(self):
+        for path in [self.epw, self.tmy3]:
+            chunks = list(weather.read_chunks(path, chunk_size=30))
+            self.assertEqual([len(c) for c in chunks], [30, 30, 12])
+            first = chunks[0]
+            self.assertEqual(first.time_stamps[0], np.datetime64('2001-07-01T00:30:00'))
+            self.assertEqual(chunks[-1].time_stamps[-1], np.datetime64('2001-07-03T23:30:00'))
+            self.assertEqual(first.direct_normal[12], 20.0 * 13)
+            self.assertEqual(first.global_horizontal[12], 10.0 * 13)
+            self.assertEqual(first.diffuse_horizontal[12], 5.0 * 13)
+
+    def test_bad_chunk_size(self):
+        with self.assertRaises(ValueError):
+            list(weather.read_chunks(self.epw, chunk_size=0))
+
+    def test_direct_radiation_matches_scalar(self):
+        surfaces = [Angular(degrees=90), Angular(degrees=180), Angular(degrees=270)]
+        site = weather.read_site(self.epw)
+        stamps, radiation = weather.direct_radiation_on_surfaces(self.epw, surfaces, chunk_size=50)
+        self.assertEqual(radiation.shape, (72, 3))
+        for i, stamp in enumerate(stamps):
+            dt = stamp.astype(datetime)
+            direct_normal = 20.0 * (dt.hour + 1)
+            for j, surface in enumerate(surfaces):
+                theta = solar.solar_angle_of_incidence(
+                    dt, False, site.longitude, site.standard_meridian, site.latitude, surface
+                )
+                expected = direct_normal * cos(theta.radians) if theta.valued else 0.0
+                self.assertAlmostEqual(radiation[i, j], expected, delta=1e-9)
+
+    def test_empty_file(self):
+        path = os.path.join(self.directory.name, 'empty.epw')
+        _write_epw(path, 0)
+        stamps, radiation = weather.direct_radiation_on_surfaces(path, [90, 180])
+        self.assertEqual(radiation.shape, (0, 2))
+
+    def test_total_radiation(self):
+        stamps, total = weather.total_radiation_on_surfaces(self.tmy3, [90, 180, 270], 90, model='isotropic')
+        _, direct = weather.direct_radiation_on_surfaces(self.tmy3, [90, 180, 270])
+        self.assertEqual(total.shape, (72, 3))
+        self.assertTrue(np.all(total >= direct - 1e-9))
+        path = os.path.join(self.directory.name, 'empty.epw')
+        _write_epw(path, 0)
+        _, empty = weather.total_radiation_on_surfaces(path, [90])
+        self.assertEqual(empty.shape, (0, 1))
+
+    def test_hour_end_minute_zero(self):
+        path = os.path.join(self.directory.name, 'minute_zero.epw')
+        _write_epw(path, 3, hour_end_minute=0)
+        chunk, = weather.read_chunks(path)
+        expected, = weather.read_chunks(self.epw)
+        np.testing.assert_array_equal(chunk.time_stamps, expected.time_stamps)
+
+    def test_sub_hourly_epw(self):
+        path = os.path.join(self.directory.name, 'quarter_hourly.epw')
+        with open(path, 'w') as f:
+            f.write(EPW_HEADER.replace('DATA PERIODS,1,1,', 'DATA PERIODS,1,4,'))
+            for hour in range(1, 25):
+                for minute in [15, 30, 45, 60]:
+                    f.write(_epw_row(1, hour, minute, *_irradiance(hour)))
+        chunk, = weather.read_chunks(path)
+        self.assertEqual(len(chunk), 96)
+        self.assertEqual(chunk.time_stamps[0], np.datetime64('2001-07-01T00:07:30'))
+        self.assertEqual(chunk.time_stamps[5], np.datetime64('2001-07-01T01:22:30'))
+        self.assertTrue(np.all(np.diff(chunk.time_stamps) == np.timedelta64(15, 'm')))
+
+    def test_missing_values(self):
+        epw = os.path.join(self.directory.name, 'missing.epw')
+        with open(epw, 'w') as f:
+            f.write(EPW_HEADER)
+            f.write(_epw_row(1, 12, 60, 500, 9999, 100))
+            f.write(_epw_row(1, 13, 60, 9999, 800, ''))
+            f.write(_epw_row(1, 14, 60, 400, 700, 90))
+        tmy3 = os.path.join(self.directory.name, 'missing.csv')
+        with open(tmy3, 'w') as f:
+            f.write(TMY3_HEADER)
+            f.write("07/01/2001,12:00,0,500,-9900,100\n07/01/2001,13:00,0,-9900,800,\n07/01/2001,14:00,0,400,700,90\n")
+        for path in [epw, tmy3]:
+            chunk, = weather.read_chunks(path)
+            np.testing.assert_array_equal(chunk.direct_normal, [np.nan, 800, 700])
+            np.testing.assert_array_equal(chunk.global_horizontal, [500, np.nan, 400])
+            np.testing.assert_array_equal(chunk.diffuse_horizontal, [100, np.nan, 90])
+            _, radiation = weather.direct_radiation_on_surfaces(path, [180])
+            self.assertTrue(np.isnan(radiation[0, 0]))
+            self.assertTrue(np.all(radiation[1:, 0] > 0))
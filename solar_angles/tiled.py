@@ -0,0 +1,197 @@
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+
+from solar_angles import batch
+
+# Out-of-core evaluation of very large site x time x surface products.
+# The work is split into tiles of (a block of sites) x (a block of time stamps).  Each tile is evaluated with the
+# vectorized functions from batch.py, broadcasting over the sites in the block, and written straight into
+# memory-mapped .npy files in a run directory, so the full result never has to fit in memory.
+# The run directory also holds a manifest describing the inputs, and a small progress array which records each
+# completed tile after its outputs have been flushed to disk.  Calling run_tiled again on the same directory with the
+# same inputs skips the completed tiles, so an interrupted run picks up where it stopped.
+
+MANIFEST_FILE = 'manifest.json'
+PROGRESS_FILE = 'progress.npy'
+TIME_STAMPS_FILE = 'time_stamps.npy'
+OUTPUT_FILES = {'altitude': 'altitude.npy', 'azimuth': 'azimuth.npy', 'incidence': 'incidence.npy'}
+
+
+class TiledResult:
+    """
+    This class holds the memory-mapped outputs of a tiled run.
+
+    The altitude and azimuth arrays are shaped (sites, time stamps), and the incidence array is shaped
+    (sites, time stamps, surfaces).  Angles are in radians, and NaN where the sun is down or behind the surface,
+    following the conventions of batch.py.  The progress array is shaped (site blocks, time blocks).
+    """
+
+    __slots__ = ('directory', 'altitude', 'azimuth', 'incidence', 'progress')
+
+    def __init__(self, directory: Path, altitude: np.ndarray, azimuth: np.ndarray, incidence: np.ndarray,
+                 progress: np.ndarray):
+        self.directory = directory
+        self.altitude = altitude
+        self.azimuth = azimuth
+        self.incidence = incidence
+        self.progress = progress
+
+    @property
+    def complete(self) -> bool:
+        return bool(np.all(self.progress))
+
+    @property
+    def tiles_done(self) -> int:
+        return int(np.count_nonzero(self.progress))
+
+
+def _site_arrays(sites) -> tuple:
+    latitudes = np.array([site.latitude.degrees for site in sites], dtype=np.float64)
+    longitudes = np.array([site.longitude.degrees for site in sites], dtype=np.float64)
+    meridians = np.array([site.standard_meridian.degrees for site in sites], dtype=np.float64)
+    return latitudes, longitudes, meridians
+
+
+def _fingerprint(stamps: np.ndarray, site_arrays: tuple, surface_degrees: np.ndarray, daylight_savings_on: bool,
+                 site_tile: int, time_tile: int, dtype: np.dtype) -> str:
+    digest = hashlib.sha256()
+    for array in (stamps.astype(np.int64),) + site_arrays + (surface_degrees,):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    digest.update(f"{daylight_savings_on}|{site_tile}|{time_tile}|{dtype.str}".encode())
+    return digest.hexdigest()
+
+
+def _evaluate_tile(stamps: np.ndarray, daylight_savings_on: bool, latitudes: np.ndarray, longitudes: np.ndarray,
+                   meridians: np.ndarray, surface_degrees: np.ndarray) -> tuple:
+    # sites run down axis 0, time stamps across axis 1, surfaces along axis 2
+    days = batch.day_of_year(stamps)
+    eot_minutes = batch.equation_of_time(days)[np.newaxis, :]
+    declination_radians = batch.declination_angle(days)[np.newaxis, :]
+    latitude_radians = np.radians(latitudes)[:, np.newaxis]
+    hour_radians = batch.hour_angle(batch.clock_hours(stamps)[np.newaxis, :], daylight_savings_on, eot_minutes,
+                                    longitudes[:, np.newaxis], meridians[:, np.newaxis])
+    altitude = batch.altitude_angle(hour_radians, declination_radians, latitude_radians)
+    azimuth = batch.azimuth_angle(hour_radians, declination_radians, latitude_radians, altitude)
+    # the wall azimuth cut-off comes from batch, so it is the same as in batch.solar_angle_of_incidence
+    positions = batch.SolarPositionSeries(stamps, hour_radians, altitude, azimuth, declination_radians, eot_minutes)
+    wall_azimuth_radians = batch._wall_azimuth_radians(positions, surface_degrees)
+    incidence = np.arccos(np.cos(altitude)[..., np.newaxis] * np.cos(wall_azimuth_radians))
+    return altitude, azimuth, incidence
+
+
+def _open_outputs(directory: Path, mode: str, shape: tuple, surface_count: int, dtype, progress_shape: tuple):
+    def open_array(name: str, array_shape: tuple, array_dtype):
+        path = directory / name
+        if mode == 'w+':
+            return np.lib.format.open_memmap(path, mode='w+', dtype=array_dtype, shape=array_shape)
+        return np.load(path, mmap_mode=mode)
+
+    return TiledResult(
+        directory,
+        open_array(OUTPUT_FILES['altitude'], shape, dtype),
+        open_array(OUTPUT_FILES['azimuth'], shape, dtype),
+        open_array(OUTPUT_FILES['incidence'], shape + (surface_count,), dtype),
+        open_array(PROGRESS_FILE, progress_shape, np.bool_),
+    )
+
+
+def run_tiled(directory, sites, time_stamps, surface_azimuths, daylight_savings_on: bool = False,
+              site_tile: int = 64, time_tile: int = 8760, dtype=np.float64, max_tiles: int = None) -> TiledResult:
+    """
+    Calculates altitude, azimuth and surface incidence angles for every site, time stamp and surface, tile by tile,
+    writing the results into memory-mapped arrays in a run directory.
+
+    If the directory already holds a run with the same inputs, the completed tiles are skipped, so the call resumes an
+    interrupted run.  If it holds a run with different inputs, a ValueError is raised rather than mixing results.
+
+    :param directory: The run directory, created if it does not exist
+    :param sites: A sequence of Site instances
+    :param time_stamps: A sequence of datetime.datetime instances, or an array of datetime64 values, in local clock
+                        time.  The same time stamps are used for every site.
+    :param surface_azimuths: [CW from North] A sequence of surface azimuths, as Angular instances or in degrees
+    :param daylight_savings_on: A flag if the clock times are daylight savings numbers.
+                                If True, the hour is decremented.
+    :param site_tile: The number of sites evaluated together in one tile
+    :param time_tile: The number of time stamps evaluated together in one tile
+    :param dtype: The floating point type of the output arrays
+    :param max_tiles: If given, stop after computing this many tiles in this call; the run can be resumed later
+
+    :returns: [TiledResult] The memory-mapped outputs and the progress state
+    """
+    if site_tile < 1 or time_tile < 1:
+        raise ValueError("site_tile and time_tile must be at least 1")
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    dtype = np.dtype(dtype)
+    stamps = np.atleast_1d(batch.to_datetime64(time_stamps))
+    site_arrays = _site_arrays(sites)
+    surface_degrees = np.atleast_1d(batch.to_degrees(list(surface_azimuths), 'surface_azimuths')) % 360
+    shape = (len(sites), len(stamps))
+    progress_shape = (-(-len(sites) // site_tile), -(-len(stamps) // time_tile))
+    fingerprint = _fingerprint(stamps, site_arrays, surface_degrees, daylight_savings_on, site_tile, time_tile, dtype)
+
+    manifest_path = directory / MANIFEST_FILE
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text())
+        if manifest['fingerprint'] != fingerprint:
+            raise ValueError(f"The run directory {directory} holds a run with different inputs")
+        result = _open_outputs(directory, 'r+', shape, len(surface_degrees), dtype, progress_shape)
+    else:
+        result = _open_outputs(directory, 'w+', shape, len(surface_degrees), dtype, progress_shape)
+        result.progress[:] = False
+        result.progress.flush()
+        np.save(directory / TIME_STAMPS_FILE, stamps)
+        manifest = {
+            'fingerprint': fingerprint,
+            'sites': len(sites),
+            'time_stamps': len(stamps),
+            'surfaces': len(surface_degrees),
+            'site_tile': site_tile,
+            'time_tile': time_tile,
+            'dtype': dtype.str,
+        }
+        # the manifest is written last, so a directory is only ever resumed once all of its files exist
+        manifest_path.write_text(json.dumps(manifest, indent=2))
+
+    latitudes, longitudes, meridians = site_arrays
+    tiles_computed = 0
+    for site_block, time_block in zip(*np.nonzero(~result.progress)):
+        if max_tiles is not None and tiles_computed >= max_tiles:
+            break
+        site_slice = slice(site_block * site_tile, (site_block + 1) * site_tile)
+        time_slice = slice(time_block * time_tile, (time_block + 1) * time_tile)
+        altitude, azimuth, incidence = _evaluate_tile(
+            stamps[time_slice], daylight_savings_on, latitudes[site_slice], longitudes[site_slice],
+            meridians[site_slice], surface_degrees
+        )
+        result.altitude[site_slice, time_slice] = altitude
+        result.azimuth[site_slice, time_slice] = azimuth
+        result.incidence[site_slice, time_slice] = incidence
+        for array in (result.altitude, result.azimuth, result.incidence):
+            array.flush()
+        result.progress[site_block, time_block] = True
+        result.progress.flush()
+        tiles_computed += 1
+    return result
+
+
+def open_tiled(directory) -> TiledResult:
+    """
+    Opens the outputs of a previous tiled run, read-only.
+
+    :param directory: The run directory given to :func:`run_tiled`
+    :returns: [TiledResult] The memory-mapped outputs and the progress state
+    """
+    directory = Path(directory)
+    if not (directory / MANIFEST_FILE).exists():
+        raise ValueError(f"No tiled run found in {directory}")
+    return TiledResult(
+        directory,
+        np.load(directory / OUTPUT_FILES['altitude'], mmap_mode='r'),
+        np.load(directory / OUTPUT_FILES['azimuth'], mmap_mode='r'),
+        np.load(directory / OUTPUT_FILES['incidence'], mmap_mode='r'),
+        np.load(directory / PROGRESS_FILE, mmap_mode='r'),
+    )
@@ -0,0 +1,107 @@
+import numpy as np
+
+from solar_angles import batch
+from solar_angles.batch import SolarPositionSeries
+
+# Tracker geometry for PV arrays, built on a sun position series from batch.py, so the sun position is calculated
+# once and shared with everything else that needs it for the same time stamps.
+# The single-axis tracker follows the usual formulation (Lorenzo et al. 2011, Anderson & Mikofski 2020): the sun
+# vector is rotated into the frame of the tracker axis, the ideal rotation is the angle that points the panel normal
+# into the plane containing the sun and the axis, and backtracking reduces the rotation in the morning and evening
+# so neighbouring rows do not shade each other.  The dual-axis tracker points the panel normal at the sun, within an
+# optional tilt limit.
+# Angles are in radians, and NaN while the sun is down.  The tracker rotation is zero with the panel horizontal (for a
+# horizontal axis), and positive when the panel is tipped towards the axis azimuth + 90 degrees, so for the common
+# north-south axis pointing south (axis azimuth 180) a positive rotation faces the panel west.
+
+DEFAULT_GROUND_COVERAGE_RATIO = 2.0 / 7.0
+
+
+class TrackerAngles:
+    """
+    This class holds the tracker orientation and the resulting angle of incidence for a series of time stamps.
+
+    The rotation member is the single-axis tracker rotation, or None for a dual-axis tracker.
+    The surface tilt (from horizontal) and surface azimuth (clockwise from north) describe the panel normal, so they
+    can be passed to the surface irradiance models one time stamp at a time.
+    """
+
+    __slots__ = ('rotation', 'incidence', 'surface_tilt', 'surface_azimuth')
+
+    def __init__(self, rotation, incidence: np.ndarray, surface_tilt: np.ndarray, surface_azimuth: np.ndarray):
+        self.rotation = rotation
+        self.incidence = incidence
+        self.surface_tilt = surface_tilt
+        self.surface_azimuth = surface_azimuth
+
+
+def _sun_vector(positions: SolarPositionSeries) -> tuple:
+    # east, north and up components of the unit vector towards the sun
+    cos_altitude = np.cos(positions.altitude)
+    return (cos_altitude * np.sin(positions.azimuth), cos_altitude * np.cos(positions.azimuth),
+            np.sin(positions.altitude))
+
+
+def single_axis(positions: SolarPositionSeries, axis_tilt=0.0, axis_azimuth=180.0, max_angle=90.0,
+                backtrack: bool = True,
+                ground_coverage_ratio: float = DEFAULT_GROUND_COVERAGE_RATIO) -> TrackerAngles:
+    """
+    Calculates the rotation of a single-axis tracker and the resulting angle of incidence on the panels.
+
+    :param positions: The sun positions, as returned from :func:`solar_angles.batch.solar_position_series`
+    :param axis_tilt: [from horizontal] The tilt of the tracker axis, as an Angular or in degrees
+    :param axis_azimuth: [CW from North] The direction the tilted end of the axis points to, as an Angular or in
+                         degrees.  For a horizontal north-south axis either 0 or 180 can be used.
+    :param max_angle: [from flat] The mechanical rotation limit either side of flat, as an Angular or in degrees
+    :param backtrack: If True, the rotation is reduced to avoid row to row shading
+    :param ground_coverage_ratio: [dimensionless] The panel width across the axis divided by the row spacing
+
+    :returns: [TrackerAngles] The rotation, incidence and panel orientation, in radians
+    """
+    if not 0 < ground_coverage_ratio <= 1:
+        raise ValueError("ground_coverage_ratio must be greater than 0 and at most 1")
+    axis_tilt_radians = np.radians(batch.to_degrees(axis_tilt, 'axis_tilt'))
+    axis_azimuth_radians = np.radians(batch.to_degrees(axis_azimuth, 'axis_azimuth'))
+    max_radians = np.radians(batch.to_degrees(max_angle, 'max_angle'))
+    east, north, up = _sun_vector(positions)
+
+    # the sun vector in the tracker frame: x across the axis, y along it, z normal to both
+    sin_azimuth, cos_azimuth = np.sin(axis_azimuth_radians), np.cos(axis_azimuth_radians)
+    sin_tilt, cos_tilt = np.sin(axis_tilt_radians), np.cos(axis_tilt_radians)
+    across = east * cos_azimuth - north * sin_azimuth
+    normal = east * sin_tilt * sin_azimuth + north * sin_tilt * cos_azimuth + up * cos_tilt
+    rotation = np.arctan2(across, normal)
+
+    if backtrack:
+        # the rows shade each other when the shadow of one row is longer than the row spacing
+        shadow_ratio = np.abs(np.cos(rotation) / ground_coverage_ratio)
+        with np.errstate(invalid='ignore'):
+            correction = -np.sign(rotation) * np.arccos(np.minimum(shadow_ratio, 1.0))
+        rotation = np.where(shadow_ratio < 1, rotation + correction, rotation)
+    rotation = np.clip(rotation, -max_radians, max_radians)
+
+    cos_incidence = across * np.sin(rotation) + normal * np.cos(rotation)
+    incidence = np.arccos(np.clip(cos_incidence, -1.0, 1.0))
+    panel_east = np.sin(rotation) * cos_azimuth + np.cos(rotation) * sin_tilt * sin_azimuth
+    panel_north = -np.sin(rotation) * sin_azimuth + np.cos(rotation) * sin_tilt * cos_azimuth
+    panel_up = np.cos(rotation) * cos_tilt
+    surface_tilt = np.arccos(np.clip(panel_up, -1.0, 1.0))
+    surface_azimuth = np.arctan2(panel_east, panel_north) % (2 * np.pi)
+    return TrackerAngles(rotation, incidence, surface_tilt, surface_azimuth)
+
+
+def dual_axis(positions: SolarPositionSeries, max_tilt=90.0) -> TrackerAngles:
+    """
+    Calculates the orientation of a dual-axis tracker, which points the panel normal at the sun, and the resulting
+    angle of incidence, which is zero unless the tilt limit is reached.
+
+    :param positions: The sun positions, as returned from :func:`solar_angles.batch.solar_position_series`
+    :param max_tilt: [from horizontal] The largest panel tilt the tracker can reach, as an Angular or in degrees
+
+    :returns: [TrackerAngles] The incidence and panel orientation, in radians, with no single-axis rotation
+    """
+    max_radians = np.radians(batch.to_degrees(max_tilt, 'max_tilt'))
+    zenith = np.where(np.isnan(positions.azimuth), np.nan, np.pi / 2 - positions.altitude)
+    surface_tilt = np.minimum(zenith, max_radians)
+    incidence = zenith - surface_tilt
+    return TrackerAngles(None, incidence, surface_tilt, positions.azimuth.copy())
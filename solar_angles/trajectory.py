@@ -0,0 +1,105 @@
+import numpy as np
+
+from solar_angles import batch, irradiance
+
+# Sun angles along the track of a moving platform, such as a vehicle, vessel or aircraft.
+# Each point of the track has its own time stamp, location and heading, so the site angles which are fixed for a
+# batch.solar_position_series are arrays here, matching the time stamps, and everything is evaluated in one
+# vectorized pass over the whole track.  The declination and equation of time still come from the day of year tables.
+# The longitude follows the rest of the package, and is measured west of the prime meridian, so GPS longitudes, which
+# are positive east, need their sign flipped.  GPS logs are usually stamped in UTC, which is a standard meridian of 0.
+# Surfaces are fixed to the platform: their azimuths are measured clockwise from the heading (0 is straight ahead,
+# 90 is to starboard / the right), and they turn with the platform.
+# The angle of incidence uses the same formula and the same edge on convention as irradiance.surface_incidence_angle,
+# but vertical surfaces take the azimuth difference around the full circle, like tilted ones, rather than the scalar
+# library's wall cut-off from the raw difference of the solar and surface azimuth.  That cut-off depends on where the
+# absolute surface azimuth wraps past north, so on a turning platform a wall would go dark and lit again as the
+# heading crossed it, with the sun in the same place relative to the wall.
+# As in batch.py, angles are in radians, and values that are undefined (sun down, or behind a surface) are NaN.
+
+
+class TrackAngles:
+    """
+    This class holds the sun angles for every point of a track.
+
+    The altitude and azimuth are the usual sun position, with the azimuth clockwise from north.  The relative azimuth
+    is the azimuth of the sun measured clockwise from the platform heading, in the range [-pi, pi).  The incidence
+    member is shaped (points, surfaces), or None if no surfaces were given.
+    """
+
+    __slots__ = ('time_stamps', 'altitude', 'azimuth', 'relative_azimuth', 'incidence')
+
+    def __init__(self, time_stamps: np.ndarray, altitude: np.ndarray, azimuth: np.ndarray,
+                 relative_azimuth: np.ndarray, incidence: np.ndarray = None):
+        self.time_stamps = time_stamps
+        self.altitude = altitude
+        self.azimuth = azimuth
+        self.relative_azimuth = relative_azimuth
+        self.incidence = incidence
+
+    def __len__(self) -> int:
+        return len(self.altitude)
+
+    @property
+    def sun_is_up(self) -> np.ndarray:
+        return self.altitude >= 0
+
+
+def _track_degrees(values, name: str, length: int) -> np.ndarray:
+    degrees = batch.to_degrees(values, name)
+    if degrees.ndim == 0:
+        return np.full(length, degrees)
+    if degrees.shape != (length,):
+        raise ValueError(f"{name} must be a single value or one value per time stamp")
+    return degrees
+
+
+def track_sun_angles(time_stamps, daylight_savings_on, latitudes, longitudes, headings, standard_meridian,
+                     surface_azimuths=None, surface_tilts=90.0) -> TrackAngles:
+    """
+    Calculates the sun position relative to a moving platform for every point of a track, and optionally the angle
+    of incidence on surfaces fixed to the platform.
+
+    :param time_stamps: A sequence of datetime.datetime instances, or an array of datetime64 values, in clock time for
+                        the standard meridian
+    :param daylight_savings_on: A flag, or an array of flags matching the time stamps, if the clock time is a daylight
+                                savings number.  If True, the hour is decremented.
+    :param latitudes: [north] The latitude of each point, in degrees
+    :param longitudes: [west] The longitude of each point west of the prime meridian, in degrees
+    :param headings: [CW from North] The heading of the platform at each point, or one fixed heading, in degrees
+    :param standard_meridian: [west] The standard meridian of the clock time, as an Angular or in degrees, or one per
+                              point.  Use 0 for time stamps in UTC.
+    :param surface_azimuths: [CW from heading] If given, a single surface azimuth or a sequence of them, relative to the
+                             platform heading, as Angular instances or in degrees
+    :param surface_tilts: [from horizontal] The tilt(s) of those surfaces, as Angular instances or in degrees;
+                          90 is vertical, 0 is a flat roof or deck.  Vertical surfaces are lit whenever the sun is less
+                          than 90 degrees either side of their normal, without the wall azimuth cut-off of
+                          :func:`solar_angles.solar.solar_angle_of_incidence`, and a surface edge on to the sun has an
+                          incidence of 90 degrees.
+
+    :returns: [TrackAngles] The sun angles along the track, in radians
+    """
+    stamps = np.atleast_1d(batch.to_datetime64(time_stamps))
+    if stamps.ndim != 1:
+        raise ValueError("time_stamps must be a 1-D sequence")
+    latitude_radians = np.radians(_track_degrees(latitudes, 'latitudes', len(stamps)))
+    longitude_degrees = _track_degrees(longitudes, 'longitudes', len(stamps))
+    heading_radians = np.radians(_track_degrees(headings, 'headings', len(stamps)))
+    standard_meridian_degrees = _track_degrees(standard_meridian, 'standard_meridian', len(stamps))
+
+    days = batch.day_of_year(stamps)
+    declination_radians = batch.declination_angle(days)
+    hour_radians = batch.hour_angle(batch.clock_hours(stamps), daylight_savings_on, batch.equation_of_time(days),
+                                    longitude_degrees, standard_meridian_degrees)
+    altitude = batch.altitude_angle(hour_radians, declination_radians, latitude_radians)
+    azimuth = batch.azimuth_angle(hour_radians, declination_radians, latitude_radians, altitude)
+    relative_azimuth = (azimuth - heading_radians + np.pi) % (2 * np.pi) - np.pi
+    if surface_azimuths is None:
+        return TrackAngles(stamps, altitude, azimuth, relative_azimuth)
+
+    surface_radians = np.radians(np.atleast_1d(batch.to_degrees(surface_azimuths, 'surface_azimuths')))
+    tilt_radians = np.radians(batch.to_degrees(surface_tilts, 'surface_tilts'))
+    cos_theta = irradiance._cos_incidence(altitude[:, np.newaxis], relative_azimuth[:, np.newaxis] - surface_radians,
+                                          tilt_radians)
+    incidence = irradiance._incidence_radians(cos_theta)
+    return TrackAngles(stamps, altitude, azimuth, relative_azimuth, incidence)
@@ -0,0 +1,344 @@
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from solar_angles import batch, daylight, fused, kernels, solar
+from solar_angles.solar import Angular
+
+# Regression harness for the calculation paths in this package.
+# The reference arrays are produced by the scalar functions in solar.py, which are the validated implementation
+# (see test_solar.py, and the EnergyPlus comparisons in the demos folder), for a set of sites spread over both
+# hemispheres and up to high latitudes, and a set of wall orientations.  They are stored in the package, so every
+# faster path (batch, daylight-only, the accelerated kernels, ...) can be checked against them offline and quickly.
+# Each path reports the maximum and mean absolute error of each quantity, the number of time stamps where the path
+# disagrees about the value being undefined (sun down or behind the wall), and its throughput.
+# Run `python -m solar_angles.validation` for a report; the exit code is non-zero if any path fails.
+# Whenever the reference formulation in solar.py changes on purpose, regenerate the file with generate_reference.
+
+REFERENCE_FILE = Path(__file__).parent / 'data' / 'reference_angles.npz'
+QUANTITIES = ('hour_angle', 'altitude', 'azimuth', 'incidence')
+DEFAULT_TOLERANCE_RADIANS = 1e-9
+
+# name, latitude [north], longitude [west], standard meridian [west]
+REFERENCE_SITES = (
+    ('Golden, CO', 39.75, 105.2, 105),
+    ('Miami, FL', 25.79, 80.29, 75),
+    ('Anchorage, AK', 61.17, 150.02, 135),
+    ('Tromso, Norway', 69.68, -18.92, -15),
+    ('Quito, Ecuador', -0.13, 78.48, 75),
+    ('Singapore', 1.35, -103.99, -120),
+    ('Sydney, Australia', -33.95, -151.18, -150),
+    ('Ushuaia, Argentina', -54.84, 68.3, 45),
+    ('Longyearbyen, Svalbard', 78.22, -15.65, -15),
+)
+REFERENCE_SURFACES = (0, 45, 90, 135, 180, 225, 270, 315)
+REFERENCE_YEAR = 2011
+# a dense run around the June solstice, when the sun stays up at the high latitude sites and passes north at night
+MIDNIGHT_SUN_DAYS = ('2011-06-20', '2011-06-23')
+MIDNIGHT_SUN_STEP_SECONDS = 600
+
+
+def reference_time_stamps() -> np.ndarray:
+    """
+    Builds the reference time stamps: one per day of the year, stepping through the clock hours and minutes so that
+    every hour of the day is sampled in every season, followed by every 10 minutes over a few days of midnight sun.
+
+    :returns: A datetime64[s] array of local clock times
+    """
+    start = np.datetime64(f'{REFERENCE_YEAR}-01-01T00:00:00', 's')
+    days = np.arange(365)
+    offsets = days * 86400 + (days * 26377) % 86400
+    midnight_sun = np.arange(np.datetime64(MIDNIGHT_SUN_DAYS[0], 's'), np.datetime64(MIDNIGHT_SUN_DAYS[1], 's'),
+                             np.timedelta64(MIDNIGHT_SUN_STEP_SECONDS, 's'))
+    return np.concatenate([start + offsets.astype('timedelta64[s]'), midnight_sun])
+
+
+class ReferenceData:
+    """
+    This class holds the stored reference arrays.
+
+    The site angle arrays are in degrees, one value per site.  The hour angle, altitude and azimuth arrays are shaped
+    (sites, time stamps), and the incidence array (sites, time stamps, surfaces), all in radians and NaN where the
+    scalar functions return an unvalued Angular.
+    """
+
+    __slots__ = ('time_stamps', 'latitudes', 'longitudes', 'standard_meridians', 'surfaces', 'hour_angle', 'altitude',
+                 'azimuth', 'incidence')
+
+    def __init__(self, arrays: dict):
+        for name in self.__slots__:
+            setattr(self, name, arrays[name])
+
+    @property
+    def positions(self) -> int:
+        return self.altitude.size
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def load_reference(path=REFERENCE_FILE) -> ReferenceData:
+    """
+    Loads the stored reference arrays.
+
+    :param path: The reference file, by default the one shipped in the package
+    :returns: [ReferenceData] The reference arrays
+    """
+    with np.load(path) as arrays:
+        return ReferenceData({name: arrays[name] for name in ReferenceData.__slots__})
+
+
+def _radians_or_nan(angle: Angular) -> float:
+    return angle.radians if angle.valued else np.nan
+
+
+def generate_reference(path=REFERENCE_FILE) -> ReferenceData:
+    """
+    Evaluates the scalar functions for every reference site, time stamp and surface, and stores the results.
+
+    :param path: The file to write
+    :returns: [ReferenceData] The new reference arrays
+    """
+    stamps = reference_time_stamps()
+    shape = (len(REFERENCE_SITES), len(stamps))
+    arrays = {
+        'time_stamps': stamps,
+        'latitudes': np.array([site[1] for site in REFERENCE_SITES], dtype=np.float64),
+        'longitudes': np.array([site[2] for site in REFERENCE_SITES], dtype=np.float64),
+        'standard_meridians': np.array([site[3] for site in REFERENCE_SITES], dtype=np.float64),
+        'surfaces': np.array(REFERENCE_SURFACES, dtype=np.float64),
+        'hour_angle': np.empty(shape),
+        'altitude': np.empty(shape),
+        'azimuth': np.empty(shape),
+        'incidence': np.empty(shape + (len(REFERENCE_SURFACES),)),
+    }
+    surfaces = [Angular(degrees=x) for x in REFERENCE_SURFACES]
+    for site_index, (_, latitude, longitude, standard_meridian) in enumerate(REFERENCE_SITES):
+        location = (Angular(degrees=longitude), Angular(degrees=standard_meridian), Angular(degrees=latitude))
+        for time_index, stamp in enumerate(stamps.astype(datetime)):
+            arrays['hour_angle'][site_index, time_index] = solar.hour_angle(stamp, False, *location[:2]).radians
+            arrays['altitude'][site_index, time_index] = solar.altitude_angle(stamp, False, *location).radians
+            arrays['azimuth'][site_index, time_index] = _radians_or_nan(solar.azimuth_angle(stamp, False, *location))
+            for surface_index, surface in enumerate(surfaces):
+                arrays['incidence'][site_index, time_index, surface_index] = _radians_or_nan(
+                    solar.solar_angle_of_incidence(stamp, False, *location, surface))
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(path, **arrays)
+    return ReferenceData(arrays)
+
+
+def _solar_position_path(reference: ReferenceData) -> dict:
+    # the single-record scalar path; the individual angle functions are the reference itself
+    results = {name: np.empty(reference.hour_angle.shape) for name in QUANTITIES[:3]}
+    stamps = reference.time_stamps.astype(datetime)
+    for site_index in range(len(reference.latitudes)):
+        location = (Angular(degrees=reference.longitudes[site_index]),
+                    Angular(degrees=reference.standard_meridians[site_index]),
+                    Angular(degrees=reference.latitudes[site_index]))
+        for time_index, stamp in enumerate(stamps):
+            position = solar.solar_position(stamp, False, *location)
+            results['hour_angle'][site_index, time_index] = position.hour_angle_radians
+            results['altitude'][site_index, time_index] = position.altitude_radians
+            results['azimuth'][site_index, time_index] = np.nan if position.azimuth_radians is None else \
+                position.azimuth_radians
+    results['incidence'] = None
+    return results
+
+
+def _fused_path(reference: ReferenceData) -> dict:
+    # the pure-Python fused kernel, one site kernel per site and surface
+    results = {name: np.empty(reference.hour_angle.shape) for name in QUANTITIES[:3]}
+    results['incidence'] = np.empty(reference.incidence.shape)
+    stamps = reference.time_stamps.astype(datetime)
+    for site_index in range(len(reference.latitudes)):
+        location = (reference.longitudes[site_index], reference.standard_meridians[site_index],
+                    reference.latitudes[site_index])
+        for surface_index, surface in enumerate(reference.surfaces):
+            position = fused.site_kernel(*location, surface)
+            values = np.array([position(stamp, False) for stamp in stamps])
+            results['incidence'][site_index, :, surface_index] = values[:, 3]
+        results['hour_angle'][site_index] = values[:, 0]
+        results['altitude'][site_index] = values[:, 1]
+        results['azimuth'][site_index] = values[:, 2]
+    return results
+
+
+def _batch_path(reference: ReferenceData) -> dict:
+    results = {name: [] for name in QUANTITIES}
+    for site_index in range(len(reference.latitudes)):
+        positions = batch.solar_position_series(
+            reference.time_stamps, False, reference.longitudes[site_index], reference.standard_meridians[site_index],
+            reference.latitudes[site_index]
+        )
+        results['hour_angle'].append(positions.hour_angle)
+        results['altitude'].append(positions.altitude)
+        results['azimuth'].append(positions.azimuth)
+        results['incidence'].append(batch.solar_angle_of_incidence(positions, reference.surfaces))
+    return {name: np.stack(arrays) for name, arrays in results.items()}
+
+
+def _daylight_path(reference: ReferenceData) -> dict:
+    # only the daylight values are computed, so the night values are taken as undefined
+    results = {name: [] for name in QUANTITIES}
+    for site_index in range(len(reference.latitudes)):
+        series = daylight.daylight_position_series(
+            reference.time_stamps, False, reference.longitudes[site_index], reference.standard_meridians[site_index],
+            reference.latitudes[site_index], reference.surfaces
+        )
+        results['azimuth'].append(series.dense(series.positions.azimuth))
+        results['incidence'].append(series.dense(series.incidence))
+    return {
+        'hour_angle': None,
+        'altitude': None,
+        'azimuth': np.stack(results['azimuth']),
+        'incidence': np.stack(results['incidence']),
+    }
+
+
+def _kernel_path(backend: str):
+    def evaluate(reference: ReferenceData) -> dict:
+        kernels.set_backend(backend)
+        days = batch.day_of_year(reference.time_stamps)
+        hours = batch.clock_hours(reference.time_stamps)
+        results = {name: np.empty(reference.hour_angle.shape) for name in QUANTITIES[:3]}
+        results['incidence'] = np.empty(reference.incidence.shape)
+        for site_index in range(len(reference.latitudes)):
+            for surface_index, surface in enumerate(reference.surfaces):
+                hour, altitude, azimuth, incidence = kernels.solar_positions(
+                    days, hours, False, reference.longitudes[site_index], reference.standard_meridians[site_index],
+                    reference.latitudes[site_index], surface
+                )
+                results['incidence'][site_index, :, surface_index] = incidence
+            results['hour_angle'][site_index] = hour
+            results['altitude'][site_index] = altitude
+            results['azimuth'][site_index] = azimuth
+        return results
+    return evaluate
+
+
+def available_paths() -> dict:
+    """
+    Lists the calculation paths which can be validated in this environment.
+
+    :returns: A dictionary of path name to a callable taking the ReferenceData and returning a dictionary of arrays,
+              keyed by quantity, shaped like the reference arrays; a quantity the path does not produce is None
+    """
+    paths = {
+        'solar_position': _solar_position_path,
+        'fused': _fused_path,
+        'batch': _batch_path,
+        'daylight': _daylight_path,
+    }
+    for backend in kernels.available_backends():
+        paths[f'kernels-{backend}'] = _kernel_path(backend)
+    return paths
+
+
+class ValidationResult:
+    """
+    This class holds the outcome of validating one calculation path against the reference arrays.
+
+    The errors are absolute errors in radians, per quantity, over the values defined in both the reference and the
+    path.  The mismatches are counts of values defined in one but not the other.
+    """
+
+    __slots__ = ('path', 'max_error', 'mean_error', 'mismatches', 'seconds', 'positions', 'tolerance')
+
+    def __init__(self, path: str, max_error: dict, mean_error: dict, mismatches: dict, seconds: float, positions: int,
+                 tolerance: float):
+        self.path = path
+        self.max_error = max_error
+        self.mean_error = mean_error
+        self.mismatches = mismatches
+        self.seconds = seconds
+        self.positions = positions
+        self.tolerance = tolerance
+
+    @property
+    def passed(self) -> bool:
+        return all(x <= self.tolerance for x in self.max_error.values()) and not any(self.mismatches.values())
+
+    @property
+    def positions_per_second(self) -> float:
+        return self.positions / self.seconds if self.seconds > 0 else float('inf')
+
+    def __str__(self) -> str:
+        errors = ', '.join(f"{name} max {self.max_error[name]:.2e} mean {self.mean_error[name]:.2e}"
+                           for name in self.max_error)
+        status = 'PASS' if self.passed else 'FAIL'
+        return f"{status} {self.path}: {errors}; {self.positions_per_second:,.0f} positions/s"
+
+
+def compare(path: str, results: dict, reference: ReferenceData, seconds: float,
+            tolerance: float = DEFAULT_TOLERANCE_RADIANS) -> ValidationResult:
+    """
+    Compares the arrays produced by one calculation path with the reference arrays.
+
+    :param path: The name of the path, for reporting
+    :param results: A dictionary of arrays keyed by quantity, as returned by the callables of :func:`available_paths`
+    :param reference: The reference arrays
+    :param seconds: [seconds] The time the path took
+    :param tolerance: [radians] The largest acceptable absolute error
+    :returns: [ValidationResult] The errors and throughput of the path
+    """
+    max_error, mean_error, mismatches = {}, {}, {}
+    for name in QUANTITIES:
+        if results.get(name) is None:
+            continue
+        expected = getattr(reference, name)
+        actual = np.asarray(results[name], dtype=np.float64)
+        if actual.shape != expected.shape:
+            raise ValueError(f"The {name} results of {path} are shaped {actual.shape}, expected {expected.shape}")
+        both = ~np.isnan(expected) & ~np.isnan(actual)
+        mismatches[name] = int(np.count_nonzero(np.isnan(expected) != np.isnan(actual)))
+        errors = np.abs(actual[both] - expected[both])
+        max_error[name] = float(errors.max()) if errors.size else 0.0
+        mean_error[name] = float(errors.mean()) if errors.size else 0.0
+    return ValidationResult(path, max_error, mean_error, mismatches, seconds, reference.positions, tolerance)
+
+
+def validate(paths=None, reference: ReferenceData = None, tolerance: float = DEFAULT_TOLERANCE_RADIANS,
+             repeat: int = 1) -> list:
+    """
+    Runs calculation paths over the reference sites, time stamps and surfaces, and compares them with the reference.
+
+    :param paths: A sequence of path names from :func:`available_paths`, or a dictionary of name to callable;
+                  by default every available path
+    :param reference: The reference arrays; by default the ones shipped in the package
+    :param tolerance: [radians] The largest acceptable absolute error
+    :param repeat: Each path is run this many times and the fastest run is reported, so with more than one run the
+                   one-off costs, such as compiling the Numba kernels, are left out of the throughput
+    :returns: A list of ValidationResult instances, one per path
+    """
+    if reference is None:
+        reference = load_reference()
+    if not isinstance(paths, dict):
+        available = available_paths()
+        paths = available if paths is None else {name: available[name] for name in paths}
+    backend = kernels.get_backend()
+    results = []
+    try:
+        for name, evaluate in paths.items():
+            seconds = float('inf')
+            for _ in range(max(repeat, 1)):
+                start = time.perf_counter()
+                arrays = evaluate(reference)
+                seconds = min(seconds, time.perf_counter() - start)
+            results.append(compare(name, arrays, reference, seconds, tolerance))
+    finally:
+        kernels.set_backend(backend)
+    return results
+
+
+def main() -> int:  # pragma: no cover - exercised from the command line
+    results = validate(repeat=2)
+    for result in results:
+        print(result)
+    return 0 if all(result.passed for result in results) else 1
+
+
+if __name__ == '__main__':  # pragma: no cover
+    raise SystemExit(main())
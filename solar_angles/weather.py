@@ -0,0 +1,241 @@
+import csv
+from pathlib import Path
+from typing import Iterator, Tuple
+
+import numpy as np
+
+from solar_angles import batch, irradiance
+from solar_angles.solar import Angular, Site
+
+# Readers for the two common typical-year weather file formats, EnergyPlus EPW and NREL TMY3 CSV.
+# Only the location header and the solar irradiance columns are parsed.  The data rows are read in chunks into NumPy
+# arrays, so a whole annual file can be pushed through the vectorized calculations in batch.py without ever building
+# a datetime or Angular per row: the date fields are collected as they are read, and the datetime64 time stamps of a
+# whole chunk are assembled from them in one vectorized step.
+# Both formats are in local standard time, and each row is the value for the interval ending at the listed time.
+# Time stamps are placed at the middle of that interval, so an hourly EPW hour of 13 becomes 12:30, matching the
+# half-hour convention in the EnergyPlus comparison demos.  EPW files may be sub-hourly: the interval length comes
+# from the records per hour in the DATA PERIODS header, and the minute field marks the end of the interval within the
+# hour (an hourly file may give either 0 or 60 for the end of the hour).  TMY3 files are always hourly.
+# Since the files are in standard time, daylight savings is always off.
+# Missing irradiance values (9999 in EPW, -9900 in TMY3, or an empty field) are read as NaN.
+
+DEFAULT_CHUNK_SIZE = 744  # one 31 day month of hourly rows
+
+# zero-based column positions in the EPW data rows
+EPW_HEADER_ROWS = 8
+EPW_DATA_PERIODS_ROW = 7
+EPW_MINUTE = 4
+EPW_GLOBAL_HORIZONTAL = 13
+EPW_DIRECT_NORMAL = 14
+EPW_DIFFUSE_HORIZONTAL = 15
+
+# column names in the second header row of a TMY3 file
+TMY3_GLOBAL_HORIZONTAL = 'GHI (W/m^2)'
+TMY3_DIRECT_NORMAL = 'DNI (W/m^2)'
+TMY3_DIFFUSE_HORIZONTAL = 'DHI (W/m^2)'
+
+# missing value markers in the irradiance columns
+EPW_MISSING_IRRADIANCE = 9999.0
+TMY3_MISSING_IRRADIANCE = -9900.0
+
+
+class WeatherChunk:
+    """
+    This class holds a block of consecutive weather file rows as arrays.
+
+    The time stamps are datetime64 values in local standard time, at the middle of each interval.
+    The irradiance arrays are in the units of the file, W/m2 for both EPW and TMY3, and NaN where the file marks the
+    value as missing.
+    """
+
+    __slots__ = ('time_stamps', 'global_horizontal', 'direct_normal', 'diffuse_horizontal')
+
+    def __init__(self, time_stamps: np.ndarray, global_horizontal: np.ndarray, direct_normal: np.ndarray,
+                 diffuse_horizontal: np.ndarray):
+        self.time_stamps = time_stamps
+        self.global_horizontal = global_horizontal
+        self.direct_normal = direct_normal
+        self.diffuse_horizontal = diffuse_horizontal
+
+    def __len__(self) -> int:
+        return len(self.time_stamps)
+
+
+def _is_epw(path: Path) -> bool:
+    with open(path, newline='') as weather_file:
+        return weather_file.readline().upper().startswith('LOCATION')
+
+
+def _site_from_header(name: str, latitude: str, longitude: str, time_zone: str) -> Site:
+    # the files give longitude positive east and the time zone as hours from UTC, also positive east
+    return Site(
+        Angular(degrees=float(latitude)), Angular(degrees=-float(longitude)), Angular(degrees=-15.0 * float(time_zone)),
+        name
+    )
+
+
+def read_site(path) -> Site:
+    """
+    Parses the location header of an EPW or TMY3 weather file.
+
+    :param path: The path to the weather file
+    :returns: [Site] The location, with longitude and standard meridian converted to degrees west
+    """
+    path = Path(path)
+    with open(path, newline='') as weather_file:
+        header = next(csv.reader(weather_file))
+    if _is_epw(path):
+        # LOCATION,City,State,Country,Source,WMO,Latitude,Longitude,TimeZone,Elevation
+        return _site_from_header(header[1], header[6], header[7], header[8])
+    # USAF,Name,State,TZ,latitude,longitude,elevation
+    return _site_from_header(header[1], header[4], header[5], header[3])
+
+
+def _irradiance_array(values: list, missing: float) -> np.ndarray:
+    array = np.array([value if value.strip() else 'nan' for value in values], dtype=np.float64)
+    array[array == missing] = np.nan
+    return array
+
+
+def _build_chunk(columns: tuple, missing: float) -> WeatherChunk:
+    years, months, days, seconds, global_horizontal, direct_normal, diffuse_horizontal = columns
+    month_starts = (np.array(years, dtype=np.int64) - 1970) * 12 + np.array(months, dtype=np.int64) - 1
+    dates = month_starts.astype('datetime64[M]').astype('datetime64[D]') + np.array(days, dtype=np.int64) - 1
+    return WeatherChunk(
+        dates.astype('datetime64[s]') + np.array(seconds, dtype=np.int64).astype('timedelta64[s]'),
+        _irradiance_array(global_horizontal, missing),
+        _irradiance_array(direct_normal, missing),
+        _irradiance_array(diffuse_horizontal, missing),
+    )
+
+
+def _epw_rows(weather_file) -> Iterator[tuple]:
+    for row_index in range(EPW_HEADER_ROWS):
+        line = next(weather_file)
+        if row_index == EPW_DATA_PERIODS_ROW:
+            # DATA PERIODS,number of periods,records per hour,...
+            interval_seconds = 3600 // int(next(csv.reader([line]))[2])
+    for row in csv.reader(weather_file):
+        if not row:
+            continue
+        # hours run 1-24 and, with the minutes, mark the end of the interval; the middle is half an interval before
+        minute = int(row[EPW_MINUTE]) or 60
+        seconds = (int(row[3]) - 1) * 3600 + minute * 60 - interval_seconds // 2
+        yield (row[0], row[1], row[2], seconds,
+               row[EPW_GLOBAL_HORIZONTAL], row[EPW_DIRECT_NORMAL], row[EPW_DIFFUSE_HORIZONTAL])
+
+
+def _tmy3_rows(weather_file) -> Iterator[tuple]:
+    next(weather_file)
+    reader = csv.reader(weather_file)
+    columns = next(reader)
+    global_column = columns.index(TMY3_GLOBAL_HORIZONTAL)
+    direct_column = columns.index(TMY3_DIRECT_NORMAL)
+    diffuse_column = columns.index(TMY3_DIFFUSE_HORIZONTAL)
+    for row in reader:
+        if not row:
+            continue
+        month, day, year = row[0].split('/')
+        seconds = int(row[1].split(':')[0]) * 3600 - 1800
+        yield year, month, day, seconds, row[global_column], row[direct_column], row[diffuse_column]
+
+
+def read_chunks(path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[WeatherChunk]:
+    """
+    Streams the irradiance data of an EPW or TMY3 weather file as a series of array chunks.
+    Only one chunk of rows is held in memory at a time.
+
+    :param path: The path to the weather file
+    :param chunk_size: The maximum number of rows in each chunk
+    :returns: An iterator of WeatherChunk instances, in file order
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    path = Path(path)
+    if _is_epw(path):
+        rows_function, missing = _epw_rows, EPW_MISSING_IRRADIANCE
+    else:
+        rows_function, missing = _tmy3_rows, TMY3_MISSING_IRRADIANCE
+    with open(path, newline='') as weather_file:
+        rows = []
+        for row in rows_function(weather_file):
+            rows.append(row)
+            if len(rows) == chunk_size:
+                yield _build_chunk(tuple(zip(*rows)), missing)
+                rows = []
+        if rows:
+            yield _build_chunk(tuple(zip(*rows)), missing)
+
+
+def direct_radiation_on_surfaces(path, surface_azimuths, site: Site = None,
+                                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculates the incident direct radiation on a set of surfaces for every row of an EPW or TMY3 weather file.
+    This is the bulk equivalent of calling :func:`solar_angles.solar.direct_radiation_on_surface` for every row and
+    every surface, but the file is read chunk by chunk and each chunk is evaluated with one vectorized pass over all
+    surfaces.
+
+    The irradiation passed to the calculation is the direct normal irradiation column of the file, since that is the
+    beam value which is projected onto the surface by the cosine of the angle of incidence.
+
+    :param path: The path to the weather file
+    :param surface_azimuths: [CW from North] A sequence of surface azimuths, as Angular instances or in degrees
+    :param site: The location to use; if None, the location is read from the weather file header
+    :param chunk_size: The maximum number of rows evaluated at once
+
+    :returns: A tuple of the time stamp array, and an array of incident direct radiation shaped (rows, surfaces),
+              in the units of the file.  Rows where the sun is down or behind a surface are zero, and rows with a
+              missing direct normal value are NaN.
+    """
+    if site is None:
+        site = read_site(path)
+    stamp_chunks = []
+    radiation_chunks = []
+    for chunk in read_chunks(path, chunk_size):
+        positions = batch.solar_position_series(
+            chunk.time_stamps, False, site.longitude, site.standard_meridian, site.latitude
+        )
+        stamp_chunks.append(chunk.time_stamps)
+        radiation = batch.direct_radiation_on_surface(positions, list(surface_azimuths), chunk.direct_normal)
+        radiation[np.isnan(chunk.direct_normal)] = np.nan
+        radiation_chunks.append(radiation)
+    if not stamp_chunks:
+        return np.empty(0, dtype='datetime64[s]'), np.empty((0, len(surface_azimuths)))
+    return np.concatenate(stamp_chunks), np.concatenate(radiation_chunks)
+
+
+def total_radiation_on_surfaces(path, surface_azimuths, surface_tilts=90.0, site: Site = None,
+                                albedo=irradiance.DEFAULT_ALBEDO, model: str = 'perez',
+                                chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculates the total (direct, sky diffuse and ground reflected) irradiance on a set of tilted surfaces for every
+    row of an EPW or TMY3 weather file, using one sun position pass per chunk for all the components.
+
+    :param path: The path to the weather file
+    :param surface_azimuths: [CW from North] A sequence of surface azimuths, as Angular instances or in degrees
+    :param surface_tilts: [from horizontal] The surface tilt(s), as Angular instances or in degrees; 90 is vertical
+    :param site: The location to use; if None, the location is read from the weather file header
+    :param albedo: [dimensionless] The ground reflectance
+    :param model: The sky diffuse model, one of 'isotropic', 'hay_davies' or 'perez'
+    :param chunk_size: The maximum number of rows evaluated at once
+
+    :returns: A tuple of the time stamp array, and an array of total incident irradiance shaped (rows, surfaces)
+    """
+    if site is None:
+        site = read_site(path)
+    stamp_chunks = []
+    radiation_chunks = []
+    for chunk in read_chunks(path, chunk_size):
+        positions = batch.solar_position_series(
+            chunk.time_stamps, False, site.longitude, site.standard_meridian, site.latitude
+        )
+        components = irradiance.total_irradiance(
+            positions, list(surface_azimuths), surface_tilts, chunk.global_horizontal, chunk.direct_normal,
+            chunk.diffuse_horizontal, albedo, model
+        )
+        stamp_chunks.append(chunk.time_stamps)
+        radiation_chunks.append(components.total)
+    if not stamp_chunks:
+        return np.empty(0, dtype='datetime64[s]'), np.empty((0, len(surface_azimuths)))
+    return np.concatenate(stamp_chunks), np.concatenate(radiation_chunks)